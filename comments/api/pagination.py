@@ -0,0 +1,24 @@
+from django.conf import settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from comments.models import Comment
+from common.api.pagination import KeysetPagination
+
+
+class CommentsPagination(KeysetPagination):
+    """Paginate comments and link to continuation of their truncated branches."""
+
+    page_size = settings.COMMENTS_PAGE_SIZE
+    parent_query_param = "parent"
+
+    def get_continuation_link(self, parent: Comment, values: list | None) -> str:
+        """Return link to children of the comment, after the one with given values."""
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param
+        )
+        url = replace_query_param(url, self.parent_query_param, parent.uuid)
+        if values is None:
+            return url
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(values)
+        )
@@ -2,17 +2,37 @@ from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
 from comments.models import Comment, CommentVote
-from comments.selectors import can_edit_comment, get_children_comments
-from posts.models import Post
-from users.api.serializers import UserPublicMinimalSerializer
-
-
-class CommentSerializer(serializers.ModelSerializer):
-    """Serializer to represent comment."""
+from comments.selectors import (
+    can_edit_comment,
+    comment_resolver,
+    filter_visible_comments,
+    get_children_comments,
+    get_comment_authors_relations_in_trees,
+    get_comment_authors_with_notes_in_trees,
+    get_comment_votes_values_in_trees,
+)
+from common.api.fields import ResolvedUUIDRelatedField
+from common.api.fieldsets import SparseFieldsetSerializerMixin
+from common.api.viewer_context import ViewerContextListSerializer, get_viewer_context
+from posts.selectors import post_resolver
+from users.api.serializers import AuthorViewerContextMixin, UserPublicMinimalSerializer
+
+# fields replies of the comment are looked up by, in any tree storage
+COMMENT_TREE_FIELDS = (
+    "parent",
+    "tree_id",
+    "level",
+    "lft",
+    "rght",
+    "path",
+    "children_count",
+)
+
+
+class CommentContentSerializer(serializers.ModelSerializer):
+    """Serializer to represent comment the same way for every viewer."""
 
     author = UserPublicMinimalSerializer(source="user")
-    children = serializers.SerializerMethodField()
-    can_edit = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
@@ -25,35 +45,106 @@ class CommentSerializer(serializers.ModelSerializer):
             "votes_down_count",
             "created_at",
             "level",
+        )
+        read_only_fields = fields
+
+
+class CommentSerializer(
+    SparseFieldsetSerializerMixin, AuthorViewerContextMixin, CommentContentSerializer
+):
+    """Serializer to represent comment with its replies and viewer's context.
+
+    Client may ask for some fields only, replies aren't loaded without ``children``
+    and ``continuation`` fields.
+    """
+
+    children = serializers.SerializerMethodField()
+    continuation = serializers.SerializerMethodField()
+    can_edit = serializers.SerializerMethodField()
+    viewer = serializers.SerializerMethodField()
+
+    viewer_context_prefix = "comment"
+
+    class Meta:
+        model = Comment
+        fields = CommentContentSerializer.Meta.fields + (
             "children",
+            "continuation",
             "can_edit",
+            "viewer",
         )
         read_only_fields = fields
+        list_serializer_class = ViewerContextListSerializer
+        sparse_field_sources = {
+            "children": COMMENT_TREE_FIELDS,
+            "continuation": COMMENT_TREE_FIELDS,
+            "can_edit": ("user", "created_at", "votes_up_count", "votes_down_count"),
+            "viewer": ("user", "tree_id"),
+        }
+
+    def to_representation(self, instance: Comment):
+        """Represent comment, reusing its cached content when view provides it."""
+        content = self.context.get("comments_contents", {}).get(instance.pk)
+        if content is None:
+            return super().to_representation(instance)
+        return {
+            name: content[name]
+            if name in content
+            else field.to_representation(field.get_attribute(instance))
+            for name, field in self.fields.items()
+        }
 
     def get_children(self, obj: Comment):
-        return CommentSerializer(
-            get_children_comments(obj, max_level=self.context.get("max_level")),
-            many=True,
-            context=self.context,
-        ).data
+        """Get nested comments, from preloaded subtrees when view provides them."""
+        if (comments_children := self.context.get("comments_children")) is not None:
+            children = comments_children.get(obj.pk, [])
+        else:
+            children = filter_visible_comments(
+                get_children_comments(obj, max_level=self.context.get("max_level")),
+                self.context.get("viewer_filters"),
+            )
+        return CommentSerializer(children, many=True, context=self.context).data
+
+    def get_continuation(self, obj: Comment) -> str | None:
+        """Get link to the rest of the replies, if they didn't fit into response."""
+        return self.context.get("comments_continuations", {}).get(obj.pk)
 
     def get_can_edit(self, obj: Comment):
         request = self.context.get("request")
         user = request and request.user
         return can_edit_comment(user, obj)
 
+    def load_viewer_context(self, comments: list[Comment]):
+        """Load viewer's votes and relations to authors for whole comment trees at once.
+
+        Data is loaded per tree, so nested children don't trigger more queries.
+        """
+        viewer_context = get_viewer_context(self.context)
+        tree_ids = {comment.tree_id for comment in comments}
+        viewer_context.load("comment_votes", tree_ids, get_comment_votes_values_in_trees)
+        viewer_context.load(
+            "comment_author_relations", tree_ids, get_comment_authors_relations_in_trees
+        )
+        viewer_context.load(
+            "comment_author_notes", tree_ids, get_comment_authors_with_notes_in_trees
+        )
+
+    def get_viewer(self, obj: Comment) -> dict:
+        """Get viewer's vote for the comment and relation to its author."""
+        self.load_viewer_context([obj])
+        return {
+            "vote": get_viewer_context(self.context).get("comment_votes", obj.pk),
+            **self.get_author_viewer_context(obj),
+        }
+
 
 class CommentCreateSerializer(serializers.ModelSerializer):
     """Serializer to create comment."""
 
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
     author = UserPublicMinimalSerializer(source="user", read_only=True)
-    post = serializers.SlugRelatedField(
-        slug_field="uuid", queryset=Post.objects.only("pk")
-    )
-    parent = serializers.SlugRelatedField(
-        slug_field="uuid", queryset=Comment.objects.only("pk"), required=False
-    )
+    post = ResolvedUUIDRelatedField(post_resolver)
+    parent = ResolvedUUIDRelatedField(comment_resolver, required=False)
 
     class Meta:
         model = Comment
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from comments.api.serializers import CommentContentSerializer
+from comments.models import Comment
+from comments.selectors import (
+    fetch_comment_trees_descendants,
+    get_comment_tree_version_key,
+)
+from comments.tree_storage import get_comment_tree_storage
+from common.cache import get_cache_versions
+
+CachedTree = tuple[list[Comment], dict[int, dict]]
+
+
+def get_cached_comment_trees(
+    roots: list[Comment], max_level: int, max_nodes: int, request=None
+) -> CachedTree:
+    """Get replies of root comments with their representation, from cache if possible.
+
+    Every tree is cached separately under its version, so new comment or vote only
+    invalidates its own tree. Cached representation doesn't depend on the viewer,
+    viewer's context is added on top of it. Only first ``max_nodes`` replies of each
+    tree are cached, as no response can show more of them.
+
+    Returns
+    -------
+    CachedTree
+        Replies of all roots in tree order and their representations by primary key.
+    """
+    storage = get_comment_tree_storage()
+    tree_ids = [root.tree_id for root in roots]
+    versions = get_cache_versions([get_comment_tree_version_key(i) for i in tree_ids])
+    cache_keys = {
+        tree_id: (
+            f"comments:tree:{storage.name}:{tree_id}:{max_level}:{max_nodes}:{version}"
+        )
+        for tree_id, version in zip(tree_ids, versions, strict=True)
+    }
+    trees = cache.get_many(cache_keys.values())
+    if missing_tree_ids := [i for i in tree_ids if cache_keys[i] not in trees]:
+        fresh_trees = _load_trees(missing_tree_ids, max_level, max_nodes, request)
+        fresh_trees = {cache_keys[i]: tree for i, tree in fresh_trees.items()}
+        cache.set_many(fresh_trees, settings.COMMENTS_TREE_CACHE_SECONDS)
+        trees.update(fresh_trees)
+
+    descendants, contents = [], {}
+    for tree_id in tree_ids:
+        tree_descendants, tree_contents = trees[cache_keys[tree_id]]
+        descendants.extend(tree_descendants)
+        contents.update(tree_contents)
+    return descendants, contents
+
+
+def _load_trees(
+    tree_ids: list[int], max_level: int, max_nodes: int, request
+) -> dict[int, CachedTree]:
+    descendants = list(fetch_comment_trees_descendants(tree_ids, max_level, max_nodes))
+    contents = CommentContentSerializer(
+        descendants, many=True, context={"request": request}
+    ).data
+    trees = {tree_id: ([], {}) for tree_id in tree_ids}
+    for comment, content in zip(descendants, contents, strict=True):
+        tree_descendants, tree_contents = trees[comment.tree_id]
+        tree_descendants.append(comment)
+        tree_contents[comment.pk] = dict(content)
+    return trees
@@ -1,9 +1,16 @@
+import contextlib
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.functional import cached_property
 from drf_spectacular.utils import extend_schema
 from rest_framework import mixins, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from comments.api.pagination import CommentsPagination
 from comments.api.policies import CommentAccessPolicy
 from comments.api.serializers import (
     CommentCreateSerializer,
@@ -12,19 +19,31 @@ from comments.api.serializers import (
     CommentUpdateSerializer,
     CommentVoteCreateSerializer,
 )
+from comments.api.tree_cache import get_cached_comment_trees
 from comments.exceptions import CommentEditException
 from comments.filters import CommentFilter
-from comments.models import Comment
-from comments.selectors import get_comments_root_nodes_qs, get_user_default_comments_level
+from comments.selectors import (
+    comment_resolver,
+    get_comments_forest,
+    get_comments_root_nodes_qs,
+    get_user_default_comments_level,
+    is_comment_visible,
+)
 from comments.services import (
+    invalidate_comment_tree,
     record_vote_for_comment,
     update_author_comments_count,
     update_post_comments_count,
 )
+from common.api.fieldsets import SparseFieldsetViewMixin
 from common.api.parameters import PARENT_COMMENT_UUID, POST_UUID
+from common.counters import counter_buffer
+from posts.events import publish_post_event_on_commit
+from users.selectors import ViewerFilters, get_viewer_filters
 
 
 class CommentViewSet(
+    SparseFieldsetViewMixin,
     GenericViewSet,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
@@ -36,8 +55,10 @@ class CommentViewSet(
     permission_classes = (CommentAccessPolicy,)
     lookup_field = "uuid"
     http_method_names = ["post", "get", "patch", "delete"]
-    pagination_class = None
+    pagination_class = CommentsPagination
     filterset_class = CommentFilter
+    # read by the list itself, to hide comments and tell root comments apart
+    sparse_fieldset_required_fields = ("user", "parent", "tree_id")
 
     def get_serializer_class(self):
         if self.action in ["create"]:
@@ -48,26 +69,77 @@ class CommentViewSet(
 
     def get_serializer_context(self):
         # FIXME: This need to move to selectors
-        current_level = 0
-        if comment := Comment.objects.filter(
-            uuid=self.request.query_params.get("parent")
-        ).first():
-            current_level = comment.level
+        parent = None
+        if parent_uuid := self.request.query_params.get("parent"):
+            with contextlib.suppress(ValueError):
+                parent = comment_resolver.resolve(parent_uuid)
+        current_level = parent.level if parent else 0
 
         context = super().get_serializer_context()
         context["max_level"] = current_level + get_user_default_comments_level(
             self.request.user
         )
+        context["viewer_filters"] = self.viewer_filters
         return context
 
+    @cached_property
+    def viewer_filters(self) -> ViewerFilters:
+        """Authors hidden by the viewer, loaded once per request."""
+        return get_viewer_filters(self.request.user)
+
+    def get_page_item_filter(self):
+        """Return filter of comments hidden by the viewer, used by pagination."""
+        if not self.viewer_filters.blocked_user_ids:
+            return None
+        return partial(is_comment_visible, viewer_filters=self.viewer_filters)
+
     @extend_schema(parameters=[POST_UUID, PARENT_COMMENT_UUID])
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        """Return page of comments with their replies, within nodes budget.
+
+        Branches cut by the budget or depth limit have ``continuation`` link, which
+        returns the rest of the branch. Replies of root comments are read from cache,
+        they aren't loaded at all when client asks for other fields only.
+        """
+        comments = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        context = self.get_serializer_context()
+        serializer = self.get_serializer(comments, many=True, context=context)
+        if {"children", "continuation"} & serializer.child.fields.keys():
+            self._load_replies(comments, context)
+        return self.get_paginated_response(serializer.data)
+
+    def _load_replies(self, comments: list, context: dict):
+        max_nodes = settings.COMMENTS_TREE_MAX_NODES
+        descendants = None
+        if all(comment.is_root_node() for comment in comments):
+            descendants, context["comments_contents"] = get_cached_comment_trees(
+                comments, context["max_level"], max_nodes, self.request
+            )
+        forest = get_comments_forest(
+            comments,
+            context["max_level"],
+            self.viewer_filters,
+            max_nodes=max_nodes,
+            descendants=descendants,
+        )
+        context["comments_children"] = forest.children
+        context["comments_continuations"] = {
+            comment.pk: self.paginator.get_continuation_link(comment, values)
+            for comment, values in forest.continuations.items()
+        }
 
     def perform_create(self, serializer):
         super().perform_create(serializer)
-        update_author_comments_count(serializer.instance)
-        update_post_comments_count(serializer.instance)
+        comment = serializer.instance
+        update_author_comments_count(comment)
+        update_post_comments_count(comment)
+        # only ids are sent, viewers fetch the comment itself, as notifications of
+        # pub/sub backends are limited in size
+        publish_post_event_on_commit(
+            comment.post_id,
+            "comment",
+            {"uuid": comment.uuid, "parent": comment.parent and comment.parent.uuid},
+        )
 
     def perform_update(self, serializer):
         instance = serializer.instance
@@ -76,6 +148,7 @@ class CommentViewSet(
                 "Нельзя редактировать т.к. за этот комментарий уже проголосовали"
             )
         serializer.save()
+        transaction.on_commit(partial(invalidate_comment_tree, serializer.instance))
 
     @action(
         methods=["POST"],
@@ -88,7 +161,7 @@ class CommentViewSet(
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         record_vote_for_comment(comment, request.user, serializer.data["value"])
-        comment.refresh_from_db()
+        counter_buffer.apply_pending(comment)
         return Response(
             CommentRatingOnlySerializer(comment).data, status=status.HTTP_201_CREATED
         )
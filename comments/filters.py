@@ -1,7 +1,7 @@
 from django_filters import rest_framework as filters
 
-from comments.models import Comment
-from posts.models import Post
+from comments.selectors import comment_resolver, get_children_comments
+from posts.selectors import post_resolver
 
 
 class CommentFilter(filters.FilterSet):
@@ -21,17 +21,13 @@ class CommentFilter(filters.FilterSet):
         super().__init__(data, *args, **kwargs)
 
     def filter_by_post_uuid(self, queryset, name, value):
-        """Find post by provided uuid and then filter by post id."""
-        try:
-            post = Post.objects.get(uuid=value)
-        except Post.DoesNotExist:
+        """Resolve post id by provided uuid and then filter by it."""
+        if (post := post_resolver.resolve(value)) is None:
             return queryset.none()
         return queryset.filter(post_id=post.pk)
 
     def filter_by_parent(self, queryset, name, value):
-        try:
-            parent = Comment.objects.get(uuid=value)
-        except Comment.DoesNotExist:
+        if (parent := comment_resolver.get_instance(value)) is None:
             return queryset.none()
 
-        return parent.get_children()
+        return get_children_comments(parent)
@@ -0,0 +1,129 @@
+import json
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from comments.models import Comment
+from comments.selectors import get_comments_descendants
+from comments.tree_storage import COMMENT_TREE_STORAGES
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure insert throughput and subtree read latency of comment tree storages. "
+        "For every storage a tree of given size is grown by replying to random "
+        "comments of it, one transaction per reply, then subtrees of random comments "
+        "are read. The tree is deleted afterwards. Numbers only make sense on database "
+        "of realistic size, like a fresh copy of production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--storage",
+            choices=COMMENT_TREE_STORAGES,
+            action="append",
+            help="Storage to benchmark, all of them by default.",
+        )
+        parser.add_argument("--nodes", type=int, default=10000, help="Size of the tree.")
+        parser.add_argument(
+            "--reads", type=int, default=200, help="Number of subtrees to read."
+        )
+        parser.add_argument(
+            "--post",
+            type=int,
+            help="Primary key of the post to comment, the latest one by default.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--format", choices=("text", "json"), default="text")
+
+    def handle(self, *args, **options):
+        post = self._get_post(options["post"])
+        report = []
+        for storage in options["storage"] or COMMENT_TREE_STORAGES:
+            root = Comment(post=post, user=post.user, content="root")
+            try:
+                with override_settings(COMMENTS_TREE_STORAGE=storage):
+                    root.save()
+                    report.append(
+                        {
+                            "storage": storage,
+                            **self._benchmark(
+                                root,
+                                options["nodes"],
+                                options["reads"],
+                                random.Random(options["seed"]),
+                            ),
+                        }
+                    )
+            finally:
+                if root.pk:
+                    Comment.objects.filter(tree_id=root.tree_id).delete()
+
+        if options["format"] == "json":
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        for entry in report:
+            self.stdout.write(
+                f"{entry['storage']}: {entry['inserts_per_second']:.0f} inserts/s, "
+                f"subtree of {entry['mean_subtree_size']:.0f} comments read in "
+                f"{entry['read_p50_ms']:.2f}ms p50, {entry['read_p95_ms']:.2f}ms p95, "
+                f"whole tree in {entry['tree_read_ms']:.2f}ms"
+            )
+
+    def _benchmark(
+        self, root: Comment, nodes: int, reads: int, rng: random.Random
+    ) -> dict:
+        comments = [root]
+        started = time.perf_counter()
+        for i in range(nodes - 1):
+            comments.append(
+                Comment.objects.create(
+                    post=root.post,
+                    user=root.user,
+                    parent=rng.choice(comments),
+                    content=str(i),
+                )
+            )
+        insert_seconds = time.perf_counter() - started
+
+        # nested sets of the loaded comments are stale after the following inserts
+        fresh = Comment.objects.in_bulk([comment.pk for comment in comments])
+        read_times = []
+        subtree_sizes = []
+        for comment in rng.sample(comments[1:], min(reads, len(comments) - 1)):
+            started = time.perf_counter()
+            subtree_sizes.append(len(list(get_comments_descendants([fresh[comment.pk]]))))
+            read_times.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        list(get_comments_descendants([fresh[root.pk]]))
+        tree_read_ms = (time.perf_counter() - started) * 1000
+
+        return {
+            "nodes": nodes,
+            "inserts_per_second": (nodes - 1) / insert_seconds,
+            "mean_subtree_size": statistics.fmean(subtree_sizes or [0]),
+            "read_p50_ms": _percentile(read_times, 50),
+            "read_p95_ms": _percentile(read_times, 95),
+            "tree_read_ms": tree_read_ms,
+        }
+
+    def _get_post(self, post_id: int | None) -> Post:
+        if post_id:
+            try:
+                return Post.objects.get(pk=post_id)
+            except Post.DoesNotExist as e:
+                raise CommandError(str(e)) from None
+        if post := Post.objects.order_by("-id").first():
+            return post
+        raise CommandError("There are no posts to comment")
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from comments.models import Comment
+from comments.tree_storage import COMMENT_TREE_STORAGES, get_comment_tree_storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Restore fields of comment tree storage from parent links. Run it right after "
+        "COMMENTS_TREE_STORAGE is switched back to mptt, to renumber nested sets of "
+        "trees replied to while materialized paths were used. Paths are kept by both "
+        "storages, rebuilding them is only needed to repair data changed bypassing "
+        "the storage."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--storage",
+            choices=COMMENT_TREE_STORAGES,
+            default=settings.COMMENTS_TREE_STORAGE,
+            help="Storage to rebuild, configured one by default.",
+        )
+
+    def handle(self, *args, storage, **options):
+        rebuilt = get_comment_tree_storage(storage).rebuild(Comment)
+        self.stdout.write(f"Rebuilt {storage} storage, {rebuilt} fixed")
@@ -0,0 +1,16 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("comments", "0003_alter_comment_user"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["tree_id", "lft"], name="comment_tree_lft_idx"),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.4 on 2026-10-18 10:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("comments", "0004_comment_tree_lft_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="children_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.TextField(db_collation="C", default="", editable=False),
+        ),
+        migrations.RunSQL(
+            """
+            WITH RECURSIVE paths (id, path) AS (
+                SELECT id, lpad(id::text, 10, '0')
+                FROM comments_comment
+                WHERE parent_id IS NULL
+                UNION ALL
+                SELECT c.id, paths.path || lpad(c.id::text, 10, '0')
+                FROM comments_comment AS c
+                JOIN paths ON c.parent_id = paths.id
+            ),
+            children AS (
+                SELECT parent_id AS id, count(*) AS children_count
+                FROM comments_comment
+                WHERE parent_id IS NOT NULL
+                GROUP BY parent_id
+            )
+            UPDATE comments_comment AS c
+            SET path = paths.path, children_count = coalesce(children.children_count, 0)
+            FROM paths
+            LEFT JOIN children ON children.id = paths.id
+            WHERE c.id = paths.id
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["tree_id", "path"], name="comment_tree_path_idx"),
+        ),
+    ]
@@ -1,4 +1,5 @@
 import uuid
+from functools import partial
 
 from django.db import models
 from django.db.models import UniqueConstraint
@@ -6,6 +7,7 @@ from mptt.fields import TreeForeignKey
 from mptt.models import MPTTModel
 
 from comments.choices import Vote
+from comments.tree_storage import get_comment_tree_storage
 from common.models import Timestamped
 
 
@@ -28,14 +30,29 @@ class Comment(MPTTModel, Timestamped):
     votes_up_count = models.IntegerField(default=0)
     votes_down_count = models.IntegerField(default=0)
     rating = models.IntegerField(default=0)
+    # primary keys of all ancestors and the comment itself, see comments.tree_storage
+    path = models.TextField(default="", editable=False, db_collation="C")
+    children_count = models.IntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
+        indexes = [
+            models.Index(fields=("tree_id", "lft"), name="comment_tree_lft_idx"),
+            models.Index(fields=("tree_id", "path"), name="comment_tree_path_idx"),
+        ]
 
     def __str__(self):
         return f"<{self.pk}: {self.user.username} -> {self.post.title}>"
 
+    def save(self, *args, **kwargs):
+        """Save the comment, new one is placed into its tree by configured storage."""
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        # primary key is set by the storage, so there is nothing to update
+        kwargs["force_insert"] = True
+        get_comment_tree_storage().insert(self, partial(super().save, *args, **kwargs))
+
 
 class CommentVote(Timestamped):
     """Model to store comment votes."""
@@ -1,35 +1,237 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import NamedTuple
+
 from django.conf import settings
+from django.db.models import Count, F, Q, QuerySet, Sum, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 from mptt.querysets import TreeQuerySet
 
+from comments.choices import Vote
 from comments.models import Comment, CommentVote
+from comments.tree_storage import get_comment_tree_storage
+from common.reconciliation import CounterSource
+from common.resolvers import UUIDResolver
 from users.models import UserPublic
+from users.selectors import (
+    ViewerFilters,
+    get_user_relations_statuses,
+    get_users_with_notes,
+)
+
+COMMENT_COUNTER_FIELDS = ("votes_up_count", "votes_down_count", "rating")
+
+# Rows each of ``COMMENT_COUNTER_FIELDS`` is calculated from
+COMMENT_COUNTER_SOURCES = [
+    CounterSource(
+        CommentVote.objects.all(),
+        "comment",
+        {
+            "votes_up_count": Count("pk", filter=Q(value=Vote.UPVOTE)),
+            "votes_down_count": Count("pk", filter=Q(value=Vote.DOWNVOTE)),
+            "rating": Sum("value"),
+        },
+    ),
+]
+
+
+class CommentRef(NamedTuple):
+    """Fields of the comment which don't change once it's posted, resolved by UUID."""
+
+    pk: int
+    post_id: int
+    tree_id: int
+    level: int
+    path: str
+
+
+comment_resolver = UUIDResolver(Comment, CommentRef)
 
 
 def get_children_comments(
     comment: Comment, max_level: int = None
 ) -> TreeQuerySet[Comment]:
-    children_qs = comment.get_children().select_related("user", "post")
+    children_qs = (
+        Comment.objects.filter(parent=comment)
+        .select_related("user", "post")
+        .order_by(get_comment_tree_storage().order_field, "id")
+    )
     if max_level is not None:
         children_qs = children_qs.filter(level__lte=max_level)
     return children_qs
 
 
+def filter_visible_comments(
+    comments: Iterable[Comment], viewer_filters: ViewerFilters | None
+) -> Iterable[Comment]:
+    """Drop comments of authors blocked by the viewer, along with their replies."""
+    if not viewer_filters or not viewer_filters.blocked_user_ids:
+        return comments
+    return [
+        comment for comment in comments if is_comment_visible(comment, viewer_filters)
+    ]
+
+
+def is_comment_visible(comment: Comment, viewer_filters: ViewerFilters) -> bool:
+    """Check if comment author isn't blocked by the viewer."""
+    return comment.user_id not in viewer_filters.blocked_user_ids
+
+
+def get_comment_tree_version_key(tree_id: int) -> str:
+    return f"comments:tree-version:{tree_id}"
+
+
+def fetch_comment_trees_descendants(
+    tree_ids: list[int], max_level: int, max_nodes: int
+) -> QuerySet[Comment]:
+    """Fetch replies of root comments, up to ``max_nodes`` first ones per tree."""
+    order_field = get_comment_tree_storage().order_field
+    return (
+        Comment.objects.filter(tree_id__in=tree_ids, level__gt=0, level__lte=max_level)
+        .annotate(
+            tree_position=Window(
+                RowNumber(), partition_by=F("tree_id"), order_by=F(order_field).asc()
+            )
+        )
+        .filter(tree_position__lte=max_nodes)
+        .select_related("user")
+        .order_by("tree_id", order_field)
+    )
+
+
+def get_comments_descendants(
+    comments: Iterable[Comment], max_level: int = None
+) -> QuerySet[Comment]:
+    """Fetch descendants of all given comments with one query, in tree order.
+
+    Whole trees are fetched by ``tree_id`` for root comments, and by range of the
+    tree storage for the nested ones.
+    """
+    storage = get_comment_tree_storage()
+    condition = Q()
+    root_tree_ids = set()
+    for comment in comments:
+        if comment.level == 0:
+            root_tree_ids.add(comment.tree_id)
+        else:
+            condition |= storage.get_descendants_filter(comment)
+    if root_tree_ids:
+        condition |= Q(tree_id__in=root_tree_ids, level__gt=0)
+    if not condition:
+        return Comment.objects.none()
+
+    descendants = Comment.objects.filter(condition)
+    if max_level is not None:
+        descendants = descendants.filter(level__lte=max_level)
+    return descendants.select_related("user").order_by("tree_id", storage.order_field)
+
+
+class CommentsForest(NamedTuple):
+    """Comments subtrees loaded within nodes budget.
+
+    ``continuations`` has comments whose children are loaded partially, because of
+    the budget or depth limit, mapped to ordering values of the last loaded child, or
+    to ``None`` if none of the children are loaded.
+    """
+
+    children: dict[int, list[Comment]]
+    continuations: dict[Comment, list | None]
+
+
+def get_comments_forest(
+    comments: list[Comment],
+    max_level: int = None,
+    viewer_filters: ViewerFilters | None = None,
+    max_nodes: int = None,
+    descendants: list[Comment] | None = None,
+) -> CommentsForest:
+    """Load subtrees of the comments and group visible children by parent id.
+
+    Descendants come in tree order, so every parent is linked before its children,
+    and replies to hidden comments are dropped along with them. When nodes budget is
+    given, only that many descendants are loaded, leaving the rest of the branches
+    to be continued with ``CommentsForest.continuations``. Already loaded descendants,
+    e.g. cached ones, can be given in tree order instead of being fetched.
+    """
+    if descendants is None:
+        descendants = get_comments_descendants(comments, max_level)
+    if max_nodes is not None:
+        descendants = descendants[: max(max_nodes - len(comments), 0)]
+    descendants = list(descendants)
+
+    linked_ids = {comment.pk for comment in comments}
+    children = defaultdict(list)
+    for comment in filter_visible_comments(descendants, viewer_filters):
+        if comment.parent_id in linked_ids:
+            children[comment.parent_id].append(comment)
+            linked_ids.add(comment.pk)
+    return CommentsForest(
+        children=children, continuations=_get_continuations(comments, descendants)
+    )
+
+
+def _get_continuations(
+    comments: list[Comment], descendants: list[Comment]
+) -> dict[Comment, list | None]:
+    storage = get_comment_tree_storage()
+    loaded_children = defaultdict(list)
+    for comment in descendants:
+        loaded_children[comment.parent_id].append(comment)
+    continuations = {}
+    for comment in (*comments, *descendants):
+        children = loaded_children.get(comment.pk, [])
+        if storage.has_unloaded_children(comment, children):
+            continuations[comment] = (
+                storage.get_tree_values(children[-1]) if children else None
+            )
+    return continuations
+
+
 def get_user_default_comments_level(user: UserPublic) -> int:
     # TODO: implement this based on user settings
     return settings.COMMENTS_TREE_DEFAULT_LEVEL
 
 
 def get_comments_root_nodes_qs() -> TreeQuerySet[Comment]:
-    """Return comments root nodes queryset."""
+    """Return comments root nodes queryset, in order they were added.
+
+    Every root comment gets the next ``tree_id``, so it follows the creation order.
+    """
     return (
         Comment.objects.root_nodes()
         .select_related("user", "post")
-        .prefetch_related("votes")
-        .order_by("created_at")
+        .order_by("tree_id", "id")
     )
 
 
+def get_comment_votes_values_in_trees(
+    user: UserPublic, tree_ids: set[int]
+) -> dict[int, int]:
+    """Get values of user's votes for all comments in the comment trees."""
+    return dict(
+        CommentVote.objects.filter(user=user, comment__tree_id__in=tree_ids).values_list(
+            "comment_id", "value"
+        )
+    )
+
+
+def get_comment_authors_relations_in_trees(
+    user: UserPublic, tree_ids: set[int]
+) -> dict[int, str]:
+    """Get user's relations with authors of all comments in the comment trees."""
+    author_ids = Comment.objects.filter(tree_id__in=tree_ids).values("user_id")
+    return get_user_relations_statuses(user, author_ids)
+
+
+def get_comment_authors_with_notes_in_trees(
+    user: UserPublic, tree_ids: set[int]
+) -> dict[int, bool]:
+    """Get which of authors of comments in the comment trees user wrote notes about."""
+    author_ids = Comment.objects.filter(tree_id__in=tree_ids).values("user_id")
+    return get_users_with_notes(user, author_ids)
+
+
 def get_comment_editable_window_minutes() -> int:
     """Return for how many minutes since posting comment can be edited."""
     return settings.COMMENTS_EDITABLE_WINDOW_MINUTES
@@ -43,7 +245,7 @@ def get_comment_vote_value_for_author(
 
 
 def can_edit_comment(user: UserPublic, comment: Comment) -> bool:
-    if user and user != comment.user:
+    if user and user.pk != comment.user_id:
         return False
     now = timezone.now()
     comment_age_seconds = (now - comment.created_at).total_seconds()
@@ -1,23 +1,60 @@
 import operator
+from functools import partial
 
+from django.conf import settings
 from django.db import transaction
-from django.db.models import F
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
 
 from comments.choices import Vote
 from comments.models import Comment, CommentVote
-from comments.selectors import get_comment_vote_value_for_author
+from comments.selectors import (
+    get_comment_tree_version_key,
+    get_comment_vote_value_for_author,
+)
+from common.cache import bump_cache_version
+from common.counters import counter_buffer, is_counters_write_behind_enabled
+from posts.events import publish_post_event_on_commit
+from posts.selectors import get_decayed_comments_velocity
+from posts.services import invalidate_post_cache
 from users.models import UserPublic
+from votes.engine import VoteChange, VoteRequest, toggle_votes
+
+
+def invalidate_comment_tree(comment: Comment):
+    """Drop cached replies of the root comment, the comment belongs to."""
+    bump_cache_version(
+        get_comment_tree_version_key(comment.tree_id),
+        settings.COMMENTS_TREE_CACHE_SECONDS,
+    )
 
 
 def update_post_comments_count(comment: Comment, added: bool = True):
-    """Update comments count fot the post comment posted on."""
+    """Update comments count fot the post comment posted on.
+
+    New comment also bumps last comment time and comments velocity of the post.
+    """
     post = comment.post
     operation = {
         True: operator.add,
         False: operator.sub,
     }[added]
     post.comments_count = operation(F("comments_count"), 1)
-    post.save(update_fields=["comments_count"])
+    update_fields = ["comments_count"]
+    if added:
+        post.comments_velocity = get_decayed_comments_velocity(comment.created_at) + 1
+        post.last_comment_at = Greatest(F("last_comment_at"), Value(comment.created_at))
+        post.comments_velocity_updated_at = Greatest(
+            F("comments_velocity_updated_at"), Value(comment.created_at)
+        )
+        update_fields += [
+            "comments_velocity",
+            "last_comment_at",
+            "comments_velocity_updated_at",
+        ]
+    post.save(update_fields=update_fields)
+    transaction.on_commit(partial(invalidate_post_cache, post))
+    transaction.on_commit(partial(invalidate_comment_tree, comment))
 
 
 def update_author_comments_count(comment: Comment, added: bool = True):
@@ -31,69 +68,72 @@ def update_author_comments_count(comment: Comment, added: bool = True):
 
 
 @transaction.atomic
-def record_vote_for_comment(comment: Comment, actor: UserPublic, vote: Vote):
-    """Record vote for a comment and trigger updates of comment and comment's author."""
-
-    comment_vote = CommentVote.objects.filter(comment=comment, user=actor).first()
-    vote_cancelled = False
-    if comment_vote:
-        # Здесь если при наличии голоса, пользователь проголосовал еще раз,
-        # отменяем рейтинг и удаляем CommentVote
-        vote_cancelled = True
-        comment_vote.delete()
-    else:
-        comment_vote = CommentVote.objects.create(comment=comment, user=actor, value=vote)
-
-    update_comment_rating_on_vote(comment_vote, vote_cancelled)
-    update_author_rating_on_comment_vote(comment_vote, vote_cancelled)
-    update_voter_votes_count_on_comment_vote(comment_vote, vote_cancelled)
-
-
-def update_author_rating_on_comment_vote(
-    comment_vote: CommentVote, vote_cancelled: bool = False
-):
-    """Update author rating when their comment gets vote."""
-    operation = {
-        True: operator.sub,
-        False: operator.add,
-    }[vote_cancelled]
-
-    author = comment_vote.comment.user
-    author.rating = operation(
-        F("rating"), get_comment_vote_value_for_author(author, comment_vote)
+def record_votes_for_comments(
+    actor: UserPublic, votes: list[tuple[Comment, Vote]]
+) -> dict[int, VoteChange | None]:
+    """Record actor's votes for several comments at once.
+
+    See ``record_vote_for_comment`` for details.
+    """
+    write_behind = is_counters_write_behind_enabled()
+    vote_requests = [
+        VoteRequest(
+            comment,
+            vote,
+            author_rating_per_vote=get_comment_vote_value_for_author(
+                comment.user, CommentVote(comment=comment, user=actor, value=Vote.UPVOTE)
+            ),
+        )
+        for comment, vote in votes
+    ]
+    changes = toggle_votes(
+        CommentVote, actor, vote_requests, update_counters=not write_behind
     )
-    author.save(update_fields=["rating"])
-
-
-def update_voter_votes_count_on_comment_vote(
-    comment_vote: CommentVote, vote_cancelled: bool = False
-):
-    """Update votes counts for voter."""
-    voter: UserPublic = comment_vote.user
-    operation = {
-        True: operator.sub,
-        False: operator.add,
-    }[vote_cancelled]
-    if comment_vote.value == Vote.UPVOTE:
-        voter.votes_up_count = operation(F("votes_up_count"), 1)
-    else:
-        voter.votes_down_count = operation(F("votes_down_count"), 1)
-    voter.save()
-
-
-def update_comment_rating_on_vote(
+    for comment, _ in votes:
+        if change := changes.get(comment.pk):
+            transaction.on_commit(partial(invalidate_comment_tree, comment))
+            publish_post_event_on_commit(
+                comment.post_id,
+                "comment_rating",
+                {"uuid": comment.uuid, **change.get_counters_delta()},
+            )
+    if write_behind:
+        for comment, _ in votes:
+            if change := changes.get(comment.pk):
+                buffer_counters_on_comment_vote(
+                    CommentVote(comment=comment, user=actor, value=change.value),
+                    vote_cancelled=change.cancelled,
+                )
+    return changes
+
+
+def record_vote_for_comment(
+    comment: Comment, actor: UserPublic, vote: Vote
+) -> VoteChange | None:
+    """Record vote for a comment and trigger updates of comment and comment's author.
+
+    Comment counters are updated in place, so comment doesn't need to be refreshed.
+    """
+    return record_votes_for_comments(actor, [(comment, vote)]).get(comment.pk)
+
+
+def buffer_counters_on_comment_vote(
     comment_vote: CommentVote, vote_cancelled: bool = False
 ):
-    """Update comment rating when it gets vote."""
-    operation = {
-        True: operator.sub,
-        False: operator.add,
-    }[vote_cancelled]
-
+    """Buffer comment, author and voter counters changes to be flushed later."""
+    sign = -1 if vote_cancelled else 1
+    votes_count_field = (
+        "votes_up_count" if comment_vote.value == Vote.UPVOTE else "votes_down_count"
+    )
     comment: Comment = comment_vote.comment
-    comment.rating = operation(F("rating"), comment_vote.value)
-    if comment_vote.value == Vote.UPVOTE:
-        comment.votes_up_count = operation(F("votes_up_count"), 1)
-    else:
-        comment.votes_down_count = operation(F("votes_down_count"), 1)
-    comment.save()
+    counter_buffer.add_on_commit(
+        Comment, comment.pk, rating=sign * comment_vote.value, **{votes_count_field: sign}
+    )
+    counter_buffer.add_on_commit(
+        UserPublic,
+        comment.user_id,
+        rating=sign * get_comment_vote_value_for_author(comment.user, comment_vote),
+    )
+    counter_buffer.add_on_commit(
+        UserPublic, comment_vote.user_id, **{votes_count_field: sign}
+    )
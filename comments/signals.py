@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from comments.models import Comment
+from comments.tree_storage import get_comment_tree_storage
+
+
+@receiver(post_delete, sender=Comment)
+def remove_comment_from_tree(sender, instance, **kwargs):
+    """Keep children count of the parent in sync when a reply is deleted.
+
+    Also runs for replies deleted by cascade from their post or ancestors.
+    """
+    get_comment_tree_storage().remove(instance)
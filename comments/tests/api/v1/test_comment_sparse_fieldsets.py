@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import urlencode
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from comments.tests.factories import CommentFactory
+from posts.tests.factories import PostFactory
+from users.tests.factories import UserPublicFactory
+
+
+@pytest.mark.django_db
+class TestCommentSparseFieldsets:
+    def setup(self):
+        self.post = PostFactory()
+        self.user = UserPublicFactory()
+        self.root = CommentFactory(post=self.post, user=self.user)
+        self.reply = CommentFactory(post=self.post, user=self.user, parent=self.root)
+
+    def test_replies_arent_loaded_without_children(self, anon_api_client):
+        client = anon_api_client()
+        self._get_comments(client, fields="uuid")
+
+        with CaptureQueriesContext(connection) as queries:
+            result = self._get_comments(client, fields="uuid,content")
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        assert result.data["results"] == [
+            {"uuid": str(self.root.uuid), "content": self.root.content}
+        ]
+        # page of root comments only
+        assert len(queries) == 1
+
+    def test_replies_have_the_same_fields(self, anon_api_client):
+        result = self._get_comments(anon_api_client(), exclude="author,viewer,can_edit")
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        [root] = result.data["results"]
+        [reply] = root["children"]
+        assert reply["uuid"] == str(self.reply.uuid)
+        assert reply.keys() == root.keys()
+        assert not {"author", "viewer", "can_edit"} & root.keys()
+
+    def test_cached_replies_have_the_same_fields(self, anon_api_client):
+        client = anon_api_client()
+        self._get_comments(client)
+
+        result = self._get_comments(client, fields="uuid,rating,children")
+
+        [root] = result.data["results"]
+        assert root["children"] == [
+            {"uuid": str(self.reply.uuid), "rating": 0, "children": []}
+        ]
+
+    def _get_comments(self, client, **params):
+        url = reverse("v1:comments:comments-list")
+        return client.get(f"{url}?{urlencode({'post': self.post.uuid, **params})}")
@@ -0,0 +1,127 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import urlencode
+from funcy import first
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from comments.choices import Vote
+from comments.services import record_vote_for_comment
+from comments.tests.factories import CommentFactory
+from posts.tests.factories import PostFactory
+from users.tests.factories import UserPublicFactory
+
+
+@pytest.mark.django_db
+class TestCommentTreeCache:
+    def setup(self):
+        self.post = PostFactory()
+        self.user = UserPublicFactory()
+        self.root = CommentFactory(post=self.post, user=self.user)
+        self.reply = CommentFactory(post=self.post, parent=self.root, user=self.user)
+
+    def test_replies_are_read_from_cache(self, anon_api_client):
+        client = anon_api_client()
+        with CaptureQueriesContext(connection) as first_queries:
+            first_result = self._get_comments(client)
+        with CaptureQueriesContext(connection) as second_queries:
+            second_result = self._get_comments(client)
+
+        assert second_result.status_code == status.HTTP_200_OK
+        assert second_result.data["results"] == first_result.data["results"]
+        # replies and primary key of the post are read from cache
+        assert len(second_queries) == len(first_queries) - 2
+
+    def test_new_reply_invalidates_its_tree(
+        self, authed_api_client, django_capture_on_commit_callbacks
+    ):
+        client = authed_api_client(self.user)
+        self._get_comments(client)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            result = client.post(
+                reverse("v1:comments:comments-list"),
+                data={
+                    "post": self.post.uuid,
+                    "parent": self.reply.uuid,
+                    "content": "new",
+                },
+            )
+        assert result.status_code == status.HTTP_201_CREATED, result.content.decode()
+
+        reply_data = first(self._root_data(client)["children"])
+        assert [child["uuid"] for child in reply_data["children"]] == [
+            result.data["uuid"]
+        ]
+
+    def test_edit_invalidates_tree(
+        self, authed_api_client, django_capture_on_commit_callbacks
+    ):
+        client = authed_api_client(self.user)
+        self._get_comments(client)
+        with CaptureQueriesContext(connection) as cached_queries:
+            self._get_comments(client)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            result = client.patch(
+                reverse("v1:comments:comments-detail", kwargs={"uuid": self.root.uuid}),
+                data={"content": "edited"},
+            )
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        with CaptureQueriesContext(connection) as queries:
+            self._get_comments(client)
+
+        assert len(queries) == len(cached_queries) + 1
+
+    def test_vote_invalidates_tree(
+        self, anon_api_client, django_capture_on_commit_callbacks
+    ):
+        client = anon_api_client()
+        self._get_comments(client)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            record_vote_for_comment(self.reply, UserPublicFactory(), Vote.UPVOTE)
+
+        reply_data = first(self._root_data(client)["children"])
+        assert reply_data["votes_up_count"] == self.reply.votes_up_count
+        assert reply_data["rating"] == self.reply.rating
+
+    def test_other_trees_stay_cached(
+        self, authed_api_client, django_capture_on_commit_callbacks
+    ):
+        other_root = CommentFactory(post=self.post, user=self.user)
+        CommentFactory(post=self.post, parent=other_root, user=self.user)
+        client = authed_api_client(self.user)
+        self._get_comments(client)
+        with CaptureQueriesContext(connection) as cached_queries:
+            self._get_comments(client)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            record_vote_for_comment(self.reply, UserPublicFactory(), Vote.UPVOTE)
+        with CaptureQueriesContext(connection) as queries:
+            result = self._get_comments(client)
+
+        # only the changed tree is loaded again, other one is still cached
+        assert len(queries) == len(cached_queries) + 1
+        assert first(first(result.data["results"])["children"])["votes_up_count"] == (
+            self.reply.votes_up_count
+        )
+
+    def test_viewer_context_is_not_cached(self, anon_api_client, authed_api_client):
+        anon_reply_data = first(self._root_data(anon_api_client())["children"])
+        author_reply_data = first(
+            self._root_data(authed_api_client(self.user))["children"]
+        )
+
+        assert not anon_reply_data["can_edit"]
+        assert author_reply_data["can_edit"]
+
+    def _root_data(self, client):
+        result = self._get_comments(client)
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        return first(result.data["results"])
+
+    def _get_comments(self, client):
+        url = reverse("v1:comments:comments-list")
+        return client.get(f"{url}?{urlencode({'post': self.post.uuid})}")
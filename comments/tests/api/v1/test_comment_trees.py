@@ -0,0 +1,145 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import urlencode
+from funcy import first
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from comments.api.pagination import CommentsPagination
+from comments.tests.factories import CommentFactory
+from comments.tree_storage import COMMENT_TREE_STORAGES
+from posts.tests.factories import PostFactory
+from users.tests.factories import UserPublicFactory
+
+
+@pytest.mark.django_db
+class TestCommentTrees:
+    @pytest.fixture(autouse=True, params=COMMENT_TREE_STORAGES)
+    def storage(self, request, settings):
+        settings.COMMENTS_TREE_STORAGE = request.param
+
+    def setup(self):
+        self.post = PostFactory()
+        self.user = UserPublicFactory()
+
+    def test_tree_is_assembled_in_order(self, anon_api_client):
+        first_root = CommentFactory(post=self.post)
+        reply = CommentFactory(post=self.post, parent=first_root)
+        nested_reply = CommentFactory(post=self.post, parent=reply)
+        second_reply = CommentFactory(post=self.post, parent=first_root)
+        second_root = CommentFactory(post=self.post)
+        CommentFactory(parent=CommentFactory())
+
+        result = self._get_comments(anon_api_client())
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        assert self._tree(result.data["results"]) == [
+            (
+                str(first_root.uuid),
+                [
+                    (str(reply.uuid), [(str(nested_reply.uuid), [])]),
+                    (str(second_reply.uuid), []),
+                ],
+            ),
+            (str(second_root.uuid), []),
+        ]
+
+    def test_queries_dont_depend_on_tree_size(self, anon_api_client):
+        self._create_thread(roots=1, depth=2)
+        # primary key of the post is resolved by the first request only, trees are
+        # read from database by both measured requests
+        self._get_comments(anon_api_client())
+        cache.clear()
+        with CaptureQueriesContext(connection) as small_tree_queries:
+            self._get_comments(anon_api_client())
+
+        self._create_thread(roots=5, depth=4)
+        cache.clear()
+        with CaptureQueriesContext(connection) as big_tree_queries:
+            result = self._get_comments(anon_api_client())
+
+        assert result.status_code == status.HTTP_200_OK
+        assert len(big_tree_queries) == len(small_tree_queries)
+
+    def test_roots_are_paginated(self, anon_api_client, monkeypatch):
+        monkeypatch.setattr(CommentsPagination, "page_size", 2)
+        roots = CommentFactory.create_batch(3, post=self.post, user=self.user)
+        client = anon_api_client()
+
+        first_page = self._get_comments(client)
+        second_page = client.get(first_page.data["next"])
+
+        assert [comment["uuid"] for comment in first_page.data["results"]] == [
+            str(roots[0].uuid),
+            str(roots[1].uuid),
+        ]
+        assert [comment["uuid"] for comment in second_page.data["results"]] == [
+            str(roots[2].uuid)
+        ]
+        assert not second_page.data["has_more"]
+
+    def test_truncated_branches_are_continued(self, anon_api_client, settings):
+        settings.COMMENTS_TREE_MAX_NODES = 4
+        root = CommentFactory(post=self.post, user=self.user)
+        replies = [
+            CommentFactory(post=self.post, parent=root, user=self.user) for _ in range(3)
+        ]
+        nested_replies = [
+            CommentFactory(post=self.post, parent=replies[1], user=self.user)
+            for _ in range(2)
+        ]
+        client = anon_api_client()
+
+        result = self._get_comments(client)
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        root_data = first(result.data["results"])
+        assert self._tree([root_data]) == [
+            (
+                str(root.uuid),
+                [
+                    (str(replies[0].uuid), []),
+                    (str(replies[1].uuid), [(str(nested_replies[0].uuid), [])]),
+                ],
+            )
+        ]
+        reply_data = root_data["children"][1]
+        assert root_data["children"][0]["continuation"] is None
+
+        rest_of_replies = client.get(root_data["continuation"])
+        rest_of_nested = client.get(reply_data["continuation"])
+
+        assert self._tree(rest_of_replies.data["results"]) == [(str(replies[2].uuid), [])]
+        assert self._tree(rest_of_nested.data["results"]) == [
+            (str(nested_replies[1].uuid), [])
+        ]
+
+    def test_branches_below_depth_limit_are_continued(self, anon_api_client, settings):
+        settings.COMMENTS_TREE_DEFAULT_LEVEL = 1
+        comment = None
+        for _ in range(3):
+            comment = CommentFactory(post=self.post, parent=comment, user=self.user)
+        client = anon_api_client()
+
+        reply_data = first(first(self._get_comments(client).data["results"])["children"])
+        result = client.get(reply_data["continuation"])
+
+        assert self._tree(result.data["results"]) == [(str(comment.uuid), [])]
+
+    def _create_thread(self, roots, depth):
+        for _ in range(roots):
+            parent = CommentFactory(post=self.post, user=self.user)
+            for _ in range(depth):
+                CommentFactory(post=self.post, parent=parent, user=self.user)
+                parent = CommentFactory(post=self.post, parent=parent, user=self.user)
+
+    def _tree(self, comments):
+        return [
+            (comment["uuid"], self._tree(comment["children"])) for comment in comments
+        ]
+
+    def _get_comments(self, client):
+        url = reverse("v1:comments:comments-list")
+        return client.get(f"{url}?{urlencode({'post': self.post.uuid})}")
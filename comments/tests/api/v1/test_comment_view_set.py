@@ -147,7 +147,7 @@ class TestCommentViewSet:
         CommentFactory(post=self.post)
         result = self._get_comments(client)
         assert result.status_code == status.HTTP_200_OK, result.content.decode()
-        assert len(result.data) == 0
+        assert len(result.data["results"]) == 0
 
     @pytest.mark.parametrize("logged_in", (True, False))
     def test_can_fetch_children_comments_for_specific_comment(
@@ -162,8 +162,7 @@ class TestCommentViewSet:
         )
 
         assert result.status_code == status.HTTP_200_OK, result.content.decode()
-        data = result.data
-        comment_from_api = first(data)
+        comment_from_api = first(result.data["results"])
 
         assert comment_from_api["uuid"] == str(child_comment.uuid)
 
@@ -177,7 +176,7 @@ class TestCommentViewSet:
             client, post_uuid=self.post.uuid, parent_uuid=uuid.uuid4()
         )
         assert result.status_code == status.HTTP_200_OK, result.content.decode()
-        assert len(result.data) == 0
+        assert len(result.data["results"]) == 0
 
     @pytest.mark.parametrize("logged_in", (True, False))
     @pytest.mark.parametrize("expected_levels", (3, 5))
@@ -196,7 +195,7 @@ class TestCommentViewSet:
             result = self._get_comments(client, post_uuid=self.post.uuid)
 
         assert result.status_code == status.HTTP_200_OK, result.content.decode()
-        children = first(result.data)
+        children = first(result.data["results"])
         levels = 0
         while children:
             children = first(children["children"])
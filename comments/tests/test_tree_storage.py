@@ -0,0 +1,184 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from comments.models import Comment
+from comments.selectors import get_comments_descendants, get_comments_forest
+from comments.tests.factories import CommentFactory
+from comments.tree_storage import (
+    COMMENT_TREE_STORAGES,
+    get_comment_tree_storage,
+    get_path_step,
+)
+from posts.tests.factories import PostFactory
+from users.tests.factories import UserPublicFactory
+
+
+@pytest.mark.django_db
+class TestCommentTreeStorage:
+    @pytest.fixture(autouse=True, params=COMMENT_TREE_STORAGES)
+    def storage(self, request, settings):
+        settings.COMMENTS_TREE_STORAGE = request.param
+        self.post = PostFactory()
+        self.user = UserPublicFactory()
+
+    def test_tree_fields_are_kept(self):
+        root = self._reply()
+        reply = self._reply(root)
+        nested_reply = self._reply(reply)
+
+        root.refresh_from_db()
+        reply.refresh_from_db()
+        assert nested_reply.path == "".join(
+            map(get_path_step, (root.pk, reply.pk, nested_reply.pk))
+        )
+        assert (nested_reply.level, reply.tree_id) == (2, root.tree_id)
+        assert (root.children_count, reply.children_count) == (1, 1)
+
+    def test_deleted_reply_is_taken_off_children_count(self):
+        root = self._reply()
+        reply = self._reply(root)
+        nested_reply = self._reply(reply)
+        other_reply = self._reply(root)
+
+        other_reply.delete()
+        root.refresh_from_db()
+        assert root.children_count == 1
+
+        reply.delete()
+        root.refresh_from_db()
+        assert root.children_count == 0
+        assert not Comment.objects.filter(pk=nested_reply.pk).exists()
+        assert not get_comment_tree_storage().has_unloaded_children(root, [])
+
+    def test_descendants_are_read_in_tree_order(self):
+        root = self._reply()
+        first_reply = self._reply(root)
+        second_reply = self._reply(root)
+        nested_replies = [self._reply(first_reply) for _ in range(2)]
+        self._reply()
+        first_reply.refresh_from_db()
+
+        assert list(get_comments_descendants([root])) == [
+            first_reply,
+            *nested_replies,
+            second_reply,
+        ]
+        assert list(get_comments_descendants([first_reply])) == nested_replies
+
+    def test_truncated_branches_are_continued(self):
+        root = self._reply()
+        replies = [self._reply(root) for _ in range(2)]
+        nested_replies = [self._reply(replies[0]) for _ in range(2)]
+        for comment in (root, *replies):
+            comment.refresh_from_db()
+
+        forest = get_comments_forest([root], max_nodes=3)
+
+        storage = get_comment_tree_storage()
+        assert forest.continuations == {
+            root: storage.get_tree_values(replies[0]),
+            replies[0]: storage.get_tree_values(nested_replies[0]),
+        }
+
+    def _reply(self, parent=None):
+        return CommentFactory(post=self.post, user=self.user, parent=parent)
+
+
+@pytest.mark.django_db
+class TestMaterializedPathStorage:
+    def setup(self):
+        self.post = PostFactory()
+        self.user = UserPublicFactory()
+
+    def test_reply_doesnt_shift_other_comments(self, settings):
+        root = self._reply()
+        reply = self._reply(root)
+        root.refresh_from_db()
+        settings.COMMENTS_TREE_STORAGE = "path"
+
+        with CaptureQueriesContext(connection) as queries:
+            self._reply(root)
+
+        # primary key, the reply itself and children counter of the parent
+        assert len(queries) == 3
+        assert Comment.objects.values_list("lft", "rght").get(pk=root.pk) == (
+            root.lft,
+            root.rght,
+        )
+        assert Comment.objects.get(pk=reply.pk).lft == reply.lft
+
+    def test_reply_keeps_nested_sets_updates_of_other_threads(
+        self, settings, monkeypatch
+    ):
+        settings.COMMENTS_TREE_STORAGE = "path"
+        switches = []
+        monkeypatch.setattr(
+            Comment,
+            "_set_mptt_updates_enabled",
+            classmethod(lambda cls, value: switches.append(value)),
+        )
+
+        reply = self._reply(self._reply())
+        reply.content = "edited"
+        reply.save()
+
+        assert switches == []
+        assert Comment.objects.values_list("path", "lft", "content").get(pk=reply.pk) == (
+            reply.path,
+            0,
+            "edited",
+        )
+
+    def test_nested_sets_are_rebuilt(self, settings):
+        settings.COMMENTS_TREE_STORAGE = "path"
+        root = self._reply()
+        replies = [self._reply(root) for _ in range(2)]
+        self._reply(replies[0])
+        self._reply(replies[1])
+        self._reply()
+        settings.COMMENTS_TREE_STORAGE = "mptt"
+        self._reply(replies[0])
+
+        call_command("rebuild_comment_trees", stdout=StringIO())
+
+        tree = Comment.objects.filter(tree_id=root.tree_id)
+        assert list(tree.order_by("lft")) == list(tree.order_by("path"))
+        for comment in tree:
+            assert comment.get_descendant_count() == (
+                tree.filter(path__startswith=comment.path).count() - 1
+            )
+        assert get_comment_tree_storage().rebuild(Comment) == 0
+
+    def test_paths_are_rebuilt(self):
+        root = self._reply()
+        reply = self._reply(root)
+        Comment.objects.update(path="", children_count=0)
+
+        call_command("rebuild_comment_trees", "--storage=path", stdout=StringIO())
+
+        root.refresh_from_db()
+        assert Comment.objects.get(pk=reply.pk).path == reply.path
+        assert root.children_count == 1
+
+    def _reply(self, parent=None):
+        return CommentFactory(post=self.post, user=self.user, parent=parent)
+
+
+@pytest.mark.django_db
+def test_benchmark_comment_trees_command():
+    PostFactory()
+    out = StringIO()
+
+    call_command(
+        "benchmark_comment_trees", "--nodes=20", "--reads=5", "--format=json", stdout=out
+    )
+
+    report = json.loads(out.getvalue())
+    assert [entry["storage"] for entry in report] == list(COMMENT_TREE_STORAGES)
+    assert all(entry["inserts_per_second"] > 0 for entry in report)
+    assert not Comment.objects.exists()
@@ -0,0 +1,237 @@
+import abc
+import itertools
+from collections.abc import Callable
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, models, transaction
+from django.db.models import Count, F, Max, Min, Q
+
+# width of one step of materialized path, the zero padded primary key of the comment
+PATH_STEP_WIDTH = 10
+
+REBUILD_PATHS_SQL = """
+    WITH RECURSIVE paths (id, path) AS (
+        SELECT id, lpad(id::text, %(width)s::integer, '0')
+        FROM {table}
+        WHERE parent_id IS NULL
+        UNION ALL
+        SELECT c.id, paths.path || lpad(c.id::text, %(width)s::integer, '0')
+        FROM {table} AS c
+        JOIN paths ON c.parent_id = paths.id
+    ),
+    children AS (
+        SELECT parent_id AS id, count(*) AS children_count
+        FROM {table}
+        WHERE parent_id IS NOT NULL
+        GROUP BY parent_id
+    )
+    UPDATE {table} AS c
+    SET path = paths.path, children_count = coalesce(children.children_count, 0)
+    FROM paths
+    LEFT JOIN children ON children.id = paths.id
+    WHERE c.id = paths.id
+        AND (c.path <> paths.path
+            OR c.children_count <> coalesce(children.children_count, 0))
+"""
+
+
+def get_path_step(pk: int) -> str:
+    """Return step of materialized path for the comment with given primary key."""
+    return str(pk).zfill(PATH_STEP_WIDTH)
+
+
+class CommentTreeStorage(abc.ABC):
+    """Way comments are placed into their trees and subtrees are looked up.
+
+    Every storage keeps ``tree_id``, ``level``, ``path`` and ``children_count`` of
+    the comments up to date as they are inserted and deleted, so storages can be
+    switched without rebuilding the trees first. Reads depend on the storage: nodes
+    of the tree are ordered by its ``order_field``, depth-first with siblings in
+    order they were added.
+    """
+
+    name: str
+    order_field: str
+
+    def insert(self, comment: models.Model, save: Callable[[], None]):
+        """Place new comment into its tree, ``save`` does the actual insert."""
+        model = type(comment)
+        if comment.pk is None:
+            comment.pk = _get_next_pk(model)
+        parent = comment.parent
+        comment.path = (parent.path if parent else "") + get_path_step(comment.pk)
+        self.save_placed(comment, parent, save)
+        if parent:
+            model.objects.filter(pk=parent.pk).update(
+                children_count=F("children_count") + 1
+            )
+
+    def remove(self, comment: models.Model):
+        """Take deleted comment off children of its parent."""
+        if comment.parent_id:
+            type(comment).objects.filter(pk=comment.parent_id).update(
+                children_count=F("children_count") - 1
+            )
+
+    @abc.abstractmethod
+    def save_placed(
+        self, comment: models.Model, parent: models.Model | None, save: Callable[[], None]
+    ):
+        """Insert comment after its path is set."""
+
+    @abc.abstractmethod
+    def get_descendants_filter(self, comment: models.Model) -> Q:
+        """Return filter of all replies to the comment, at any depth."""
+
+    @abc.abstractmethod
+    def has_unloaded_children(
+        self, comment: models.Model, loaded_children: list[models.Model]
+    ) -> bool:
+        """Check if some children of the comment aren't among loaded ones.
+
+        ``loaded_children`` must be the first children of the comment in tree order.
+        """
+
+    def get_tree_values(self, comment: models.Model) -> list:
+        """Return values of the comment children are ordered by."""
+        return [getattr(comment, self.order_field), comment.pk]
+
+    @abc.abstractmethod
+    def rebuild(self, model: type[models.Model]) -> int:
+        """Restore fields of the storage from parent links, return number of fixes."""
+
+
+class MPTTCommentTreeStorage(CommentTreeStorage):
+    """Nested sets of django-mptt.
+
+    Subtree is a range of ``lft``, but every insert shifts ``lft`` and ``rght`` of
+    all the following nodes of the tree, so busy threads lock many rows per reply.
+    """
+
+    name = "mptt"
+    order_field = "lft"
+
+    def save_placed(self, comment, parent, save):
+        save()
+
+    def get_descendants_filter(self, comment):
+        return Q(tree_id=comment.tree_id, lft__gt=comment.lft, rght__lt=comment.rght)
+
+    def has_unloaded_children(self, comment, loaded_children):
+        if comment.rght - comment.lft == 1:
+            return False
+        return not loaded_children or loaded_children[-1].rght != comment.rght - 1
+
+    def rebuild(self, model):
+        """Renumber nested sets of broken trees in order of materialized paths.
+
+        Trees having replies inserted by another storage don't start at ``lft`` 1,
+        don't end at ``rght`` two times size of the tree, or have repeated ``lft``.
+        """
+        broken_tree_ids = (
+            model.objects.order_by()
+            .values("tree_id")
+            .annotate(
+                nodes=Count("id"),
+                min_lft=Min("lft"),
+                max_rght=Max("rght"),
+                distinct_lfts=Count("lft", distinct=True),
+            )
+            .exclude(min_lft=1, max_rght=2 * F("nodes"), distinct_lfts=F("nodes"))
+            .values_list("tree_id", flat=True)
+        )
+        broken_tree_ids = list(broken_tree_ids)
+        for tree_id in broken_tree_ids:
+            with transaction.atomic():
+                self._rebuild_tree(model, tree_id)
+        return len(broken_tree_ids)
+
+    def _rebuild_tree(self, model: type[models.Model], tree_id: int):
+        nodes = list(
+            model.objects.select_for_update()
+            .filter(tree_id=tree_id)
+            .only("id", "path", "lft", "rght")
+            .order_by("path")
+        )
+        # walk the tree depth-first, numbering every node when it's entered and left
+        numbers = itertools.count(1)
+        open_nodes = []
+        for node in nodes:
+            while open_nodes and not node.path.startswith(open_nodes[-1].path):
+                open_nodes.pop().rght = next(numbers)
+            node.lft = next(numbers)
+            open_nodes.append(node)
+        while open_nodes:
+            open_nodes.pop().rght = next(numbers)
+        model.objects.bulk_update(nodes, ["lft", "rght"], batch_size=1000)
+
+
+class MaterializedPathCommentTreeStorage(CommentTreeStorage):
+    """Materialized paths of ancestors' primary keys.
+
+    Insert touches only the new row and children counter of its parent, subtree is a
+    range of paths starting with the path of its root. Nested sets aren't kept up to
+    date, ``rebuild_comment_trees --storage mptt`` restores them.
+    """
+
+    name = "path"
+    order_field = "path"
+
+    def save_placed(self, comment, parent, save):
+        comment.level = parent.level + 1 if parent else 0
+        # primary key is taken before insert, and it's always greater than any tree
+        # id given by mptt, as there are no more trees than comments
+        comment.tree_id = parent.tree_id if parent else comment.pk
+        comment.lft = comment.rght = 0
+        # inserted past save() of mptt, as its switch of nested sets updates is shared
+        # by all threads
+        type(comment).objects.bulk_create([comment])
+        comment._mptt_meta.update_mptt_cached_fields(comment)
+
+    def get_descendants_filter(self, comment):
+        return Q(
+            tree_id=comment.tree_id,
+            path__startswith=comment.path,
+            level__gt=comment.level,
+        )
+
+    def has_unloaded_children(self, comment, loaded_children):
+        return len(loaded_children) < comment.children_count
+
+    def rebuild(self, model):
+        """Restore paths and children counters of all comments, in single statement."""
+        sql = REBUILD_PATHS_SQL.format(
+            table=connection.ops.quote_name(model._meta.db_table)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, {"width": PATH_STEP_WIDTH})
+            return cursor.rowcount
+
+
+COMMENT_TREE_STORAGES: dict[str, CommentTreeStorage] = {
+    storage.name: storage
+    for storage in (MPTTCommentTreeStorage(), MaterializedPathCommentTreeStorage())
+}
+
+
+def get_comment_tree_storage(name: str | None = None) -> CommentTreeStorage:
+    """Return storage of comment trees, configured one by default."""
+    name = name or settings.COMMENTS_TREE_STORAGE
+    try:
+        return COMMENT_TREE_STORAGES[name]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Unknown comments tree storage {name!r}, "
+            f"choose one of {', '.join(COMMENT_TREE_STORAGES)}"
+        ) from None
+
+
+def _get_next_pk(model: type[models.Model]) -> int:
+    # primary key is needed for the path before insert, so it's taken from sequence
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s))",
+            [model._meta.db_table, model._meta.pk.column],
+        )
+        return cursor.fetchone()[0]
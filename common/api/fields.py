@@ -1,5 +1,8 @@
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 
+from common.resolvers import UUIDResolver
+
 
 class WritableSlugRelatedField(serializers.SlugRelatedField):
     """Extending SlugRelatedField to make it writable."""
@@ -11,3 +14,25 @@ class WritableSlugRelatedField(serializers.SlugRelatedField):
             return instance
         except (TypeError, ValueError):
             self.fail("invalid")
+
+
+class ResolvedUUIDRelatedField(serializers.SlugRelatedField):
+    """Related field looking objects up by UUID with resolver, mostly without queries.
+
+    Only resolved fields of the instance are loaded, the rest of them are deferred.
+    """
+
+    def __init__(self, resolver: UUIDResolver, **kwargs):  # noqa: D107
+        self.resolver = resolver
+        kwargs.setdefault("queryset", resolver.model.objects.all())
+        super().__init__(slug_field="uuid", **kwargs)
+
+    def to_internal_value(self, data):
+        """Convert UUID to the instance."""
+        try:
+            instance = self.resolver.get_instance(data)
+        except (TypeError, ValueError):
+            self.fail("invalid")
+        if instance is None:
+            self.fail("does_not_exist", slug_name=self.slug_field, value=smart_str(data))
+        return instance
@@ -0,0 +1,131 @@
+from collections.abc import Iterable
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_QUERY_PARAM = "fields"
+EXCLUDE_QUERY_PARAM = "exclude"
+
+
+def get_sparse_field_names(request, field_names: Iterable[str]) -> list[str] | None:
+    """Return names of fields selected with ``fields`` and ``exclude`` query parameters.
+
+    Both parameters are comma separated lists of field names. Returns ``None`` when
+    all fields are needed, fieldsets only apply to reads.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    requested = _split_names(request.query_params.get(FIELDS_QUERY_PARAM))
+    excluded = _split_names(request.query_params.get(EXCLUDE_QUERY_PARAM))
+    if not requested and not excluded:
+        return None
+
+    field_names = list(field_names)
+    if unknown := (requested | excluded) - set(field_names):
+        raise ValidationError(
+            {FIELDS_QUERY_PARAM: f"Unknown fields: {', '.join(sorted(unknown))}"}
+        )
+    return [
+        name
+        for name in field_names
+        if (not requested or name in requested) and name not in excluded
+    ]
+
+
+class SparseFieldsetSerializerMixin:
+    """Mixin for model serializers to represent only fields asked by the client.
+
+    Fields which read the instance in other ways than through their ``source``, like
+    method fields, must list model fields they read in ``Meta.sparse_field_sources``,
+    so the view can load only the needed columns, see ``SparseFieldsetViewMixin``.
+    """
+
+    def get_fields(self):
+        """Return fields selected by query parameters of the request."""
+        fields = super().get_fields()
+        self.sparse_field_names = get_sparse_field_names(
+            self.context.get("request"), fields
+        )
+        if self.sparse_field_names is None:
+            return fields
+        return {name: fields[name] for name in self.sparse_field_names}
+
+    def get_sparse_model_fields(self) -> list[str] | None:
+        """Return lookups of model fields read by selected fields, ``None`` for all."""
+        fields = self.fields
+        if self.sparse_field_names is None:
+            return None
+        sources = getattr(self.Meta, "sparse_field_sources", {})
+        lookups = []
+        for name, field in fields.items():
+            field_lookups = (
+                sources[name] if name in sources else _get_field_lookups(field)
+            )
+            if field_lookups is None:
+                return None
+            lookups.extend(field_lookups)
+        return list(dict.fromkeys(lookups))
+
+
+class SparseFieldsetViewMixin:
+    """Mixin for views to load only model fields needed by selected serializer fields.
+
+    Fields read by the view itself, like ones used to hide items on the page, must be
+    listed in ``sparse_fieldset_required_fields``. Ordering fields are always loaded.
+    """
+
+    sparse_fieldset_required_fields: tuple[str, ...] = ()
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        """Filter queryset, then skip loading fields which won't be represented."""
+        queryset = super().filter_queryset(queryset)
+        serializer = self.get_serializer()
+        if not isinstance(serializer, SparseFieldsetSerializerMixin):
+            return queryset
+        if (lookups := serializer.get_sparse_model_fields()) is None:
+            return queryset
+        return only_sparse_fields(
+            queryset, [*lookups, *self.sparse_fieldset_required_fields]
+        )
+
+
+def only_sparse_fields(queryset: QuerySet, lookups: list[str]) -> QuerySet:
+    """Load only given fields of the queryset, and only related objects among them."""
+    ordering_fields = []
+    for field_name in queryset.query.order_by:
+        if not isinstance(field_name, str):
+            continue
+        field_name = field_name.lstrip("-")
+        try:
+            queryset.model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            # annotations are loaded anyway
+            continue
+        ordering_fields.append(field_name)
+    lookups = [*lookups, *ordering_fields]
+    related = {lookup.rsplit("__", 1)[0] for lookup in lookups if "__" in lookup}
+    queryset = queryset.select_related(None)
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*lookups)
+
+
+def _split_names(value: str | None) -> set[str]:
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+
+def _get_field_lookups(field: serializers.Field) -> list[str] | None:
+    if isinstance(field, serializers.ListSerializer):
+        return None
+    if isinstance(field, serializers.BaseSerializer):
+        return [
+            f"{field.source}__{nested_field.source}"
+            for nested_field in field.fields.values()
+        ]
+    if field.source == "*" or isinstance(field, serializers.SerializerMethodField):
+        # field reads the whole instance, there is no way to know what it needs
+        return None
+    return [field.source.replace(".", "__")]
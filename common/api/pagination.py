@@ -0,0 +1,215 @@
+import base64
+import datetime
+import json
+import math
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Paginate by the ordering key of the last item instead of page number.
+
+    Queryset ordering must end with unique field, like ``("-created_at", "-id")``,
+    every ordering field must be an attribute of the model instance (field or
+    annotation). Next page continues right after the last item, so it's fetched with
+    the same index range scan as the first page. Instead of counting all items, one
+    extra item is fetched to find out if there are more pages.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = "Invalid cursor"
+    # how many more items to fetch when some of them are filtered out in memory
+    overfetch_ratio = 1.25
+    max_fetches = 5
+
+    def paginate_queryset(
+        self, queryset: QuerySet | list[QuerySet], request, view=None
+    ) -> list:
+        """Return single page of the queryset after the cursor.
+
+        When the view provides item filter (see ``get_item_filter``), items are
+        over-fetched and filtered in memory until the page is full, so pages don't
+        come back short. Scan stops after ``max_fetches`` queries, then page may be
+        shorter, but next page continues right after the last scanned item.
+
+        List of querysets ordered the same way is paginated as a single one, see
+        ``fetch_after``.
+        """
+        self.request = request
+        querysets = [queryset] if isinstance(queryset, QuerySet) else queryset
+        self.ordering = self.get_ordering(querysets[0])
+        values = None
+        if cursor := request.query_params.get(self.cursor_query_param):
+            values = self.decode_cursor(cursor)
+
+        item_filter = self.get_item_filter(view)
+        fetch_size = self.page_size + 1
+        if item_filter:
+            fetch_size = math.ceil(fetch_size * self.overfetch_ratio)
+
+        items = []
+        for _ in range(self.max_fetches):
+            batch = list(self.fetch_after(querysets, values, fetch_size))
+            items.extend(filter(item_filter, batch) if item_filter else batch)
+            if len(items) > self.page_size or len(batch) < fetch_size:
+                self.has_more = len(items) > self.page_size
+                self.page = items[: self.page_size]
+                self.next_values = self.page and self.get_item_values(self.page[-1])
+                return self.page
+            values = self.get_item_values(batch[-1])
+
+        self.has_more = True
+        self.page = items
+        self.next_values = values
+        return self.page
+
+    def get_item_filter(self, view) -> Callable[[Any], bool] | None:
+        """Return predicate for items to be kept on the page, if view provides it."""
+        if view is None or not hasattr(view, "get_page_item_filter"):
+            return None
+        return view.get_page_item_filter()
+
+    def get_item_values(self, item) -> list:
+        """Return values of ordering fields of the item."""
+        return [getattr(item, field_name) for field_name, _ in self.ordering]
+
+    def filter_after(self, queryset: QuerySet, values: list | None) -> QuerySet:
+        """Filter queryset items going after the item with given ordering values."""
+        if values is None:
+            return queryset
+        try:
+            return queryset.filter(self.get_after_filter(values))
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message) from None
+
+    def fetch_after(
+        self, querysets: list[QuerySet], values: list | None, size: int
+    ) -> QuerySet:
+        """Fetch up to ``size`` items of querysets going after given ordering values.
+
+        Several querysets are read after the cursor one by one and merged with
+        ``UNION ALL``, so each of them is still read by its own index range scan, and
+        they must not have common items.
+        """
+        first, *others = [
+            self.filter_after(queryset, values)[:size] for queryset in querysets
+        ]
+        if not others:
+            return first
+        return first.union(*others, all=True).order_by(*querysets[0].query.order_by)[
+            :size
+        ]
+
+    def get_paginated_response(self, data) -> Response:
+        """Return page with link to the next one."""
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("has_more", self.has_more),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        """Return OpenAPI schema of the page."""
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "has_more": {"type": "boolean"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        """Return OpenAPI parameters of the pagination."""
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor of the page, taken from the link to next page.",
+                "schema": {"type": "string"},
+            }
+        ]
+
+    def get_next_link(self) -> str | None:
+        """Return link to the page after the last item of the current page."""
+        if not self.has_more:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            remove_query_param(url, self.cursor_query_param),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_values),
+        )
+
+    def get_ordering(self, queryset: QuerySet) -> list[tuple[str, bool]]:
+        """Return ordering of the queryset as list of field names and descending flags."""
+        ordering = []
+        for field_name in queryset.query.order_by:
+            if not isinstance(field_name, str):
+                raise ImproperlyConfigured(
+                    "KeysetPagination supports ordering by field names only"
+                )
+            descending = field_name.startswith("-")
+            field_name = field_name.removeprefix("-")
+            ordering.append(("pk" if field_name == "id" else field_name, descending))
+        if not ordering or ordering[-1][0] != "pk":
+            raise ImproperlyConfigured(
+                "KeysetPagination requires queryset ordered by primary key at last"
+            )
+        return ordering
+
+    def get_after_filter(self, values: list) -> Q:
+        """Return filter of items going after the item with given ordering values.
+
+        For ``(a DESC, b DESC)`` ordering it's ``a <= x AND (a < x OR b < y)``, the
+        leading condition lets database start index scan right at the cursor.
+        """
+        if len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        after_filter = Q()
+        equal_filter = Q()
+        for (field_name, descending), value in zip(self.ordering, values, strict=True):
+            lookup = "lt" if descending else "gt"
+            after_filter |= equal_filter & Q(**{f"{field_name}__{lookup}": value})
+            equal_filter &= Q(**{field_name: value})
+
+        first_field_name, first_descending = self.ordering[0]
+        first_lookup = "lte" if first_descending else "gte"
+        return Q(**{f"{first_field_name}__{first_lookup}": values[0]}) & after_filter
+
+    def encode_cursor(self, values: list) -> str:
+        """Encode ordering values of the item into opaque cursor."""
+        data = json.dumps(
+            [
+                value.isoformat() if isinstance(value, datetime.datetime) else value
+                for value in values
+            ],
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> list:
+        """Decode ordering values from the cursor."""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message) from None
+        if not isinstance(values, list):
+            raise NotFound(self.invalid_cursor_message)
+        return values
@@ -27,3 +27,33 @@ PARENT_COMMENT_UUID = OpenApiParameter(
     location=OpenApiParameter.QUERY,
     description="UUID of the comment to fetch all children comments.",
 )
+TOP_POSTS_WINDOW = OpenApiParameter(
+    name="window",
+    type=str,
+    required=False,
+    location=OpenApiParameter.QUERY,
+    enum=["day", "week", "month", "all"],
+    description="Time window to fetch top posts for, day by default.",
+)
+COMMUNITY_FEED_SORT = OpenApiParameter(
+    name="sort",
+    type=str,
+    required=False,
+    location=OpenApiParameter.QUERY,
+    enum=["new", "top"],
+    description="Order of community posts, newest first by default.",
+)
+SPARSE_FIELDS = OpenApiParameter(
+    name="fields",
+    type=str,
+    required=False,
+    location=OpenApiParameter.QUERY,
+    description="Comma separated fields to return, all of them by default.",
+)
+EXCLUDE_FIELDS = OpenApiParameter(
+    name="exclude",
+    type=str,
+    required=False,
+    location=OpenApiParameter.QUERY,
+    description="Comma separated fields to leave out of response.",
+)
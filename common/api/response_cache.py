@@ -0,0 +1,67 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from common.cache import get_cache_versions
+
+
+class AnonymousResponseCacheMixin:
+    """Cache rendered responses of safe actions for anonymous requests.
+
+    Requests with ``Authorization`` header always bypass the cache, since their
+    responses depend on the viewer. Cache key includes the path, query parameters
+    and versions from ``get_cache_version_keys``, so bumping a version invalidates
+    all responses built with it.
+    """
+
+    anonymous_cache_actions: tuple[str, ...] = ("list", "retrieve")
+    anonymous_cache_prefix = "anonymous-response"
+
+    def dispatch(self, request, *args, **kwargs):
+        """Return cached response if there is one, cache fresh one otherwise."""
+        if not self.is_anonymous_response_cacheable(request):
+            response = super().dispatch(request, *args, **kwargs)
+            patch_vary_headers(response, ("Authorization",))
+            return response
+
+        cache_key = self.get_anonymous_cache_key(request, **kwargs)
+        if cached := cache.get(cache_key):
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+        else:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code == 200:
+                response.render()
+                cache.set(
+                    cache_key,
+                    (response.content, response["Content-Type"]),
+                    settings.ANONYMOUS_CACHE_SECONDS,
+                )
+        patch_vary_headers(response, ("Authorization",))
+        return response
+
+    def is_anonymous_response_cacheable(self, request) -> bool:
+        """Check if response to the request can be cached."""
+        return (
+            settings.ANONYMOUS_CACHE_SECONDS > 0
+            and request.method == "GET"
+            and self.action_map.get("get") in self.anonymous_cache_actions
+            and "HTTP_AUTHORIZATION" not in request.META
+        )
+
+    def get_cache_version_keys(self, **kwargs) -> list[str]:
+        """Return keys of versions of the data the response is built from."""
+        return []
+
+    def get_anonymous_cache_key(self, request, **kwargs) -> str:
+        """Return cache key of the response to the request."""
+        versions = get_cache_versions(self.get_cache_version_keys(**kwargs))
+        query = urlencode(sorted(request.GET.lists()), doseq=True)
+        request_key = hashlib.md5(
+            f"{request.path}?{query}:{request.META.get('HTTP_ACCEPT', '')}".encode()
+        ).hexdigest()
+        return f"{self.anonymous_cache_prefix}:{':'.join(versions)}:{request_key}"
@@ -0,0 +1,15 @@
+from drf_spectacular import openapi
+
+from common.api.fieldsets import SparseFieldsetViewMixin
+from common.api.parameters import EXCLUDE_FIELDS, SPARSE_FIELDS
+
+
+class AutoSchema(openapi.AutoSchema):
+    """Schema of the API with parameters views get from shared mixins."""
+
+    def get_override_parameters(self):
+        """Add sparse fieldset parameters to reads of views supporting them."""
+        parameters = super().get_override_parameters()
+        if self.method == "GET" and isinstance(self.view, SparseFieldsetViewMixin):
+            return [SPARSE_FIELDS, EXCLUDE_FIELDS, *parameters]
+        return parameters
@@ -0,0 +1,60 @@
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from django.db import models
+from rest_framework import serializers
+
+ViewerContextLoader = Callable[[Any, set], dict]
+
+
+class ViewerContext:
+    """Data about viewer's relation to objects on the page, e.g. their votes.
+
+    Every kind of data is loaded by its loader once for all keys on the page,
+    repeated loads only fetch keys which haven't been loaded yet. Nothing is loaded
+    for anonymous viewers.
+    """
+
+    def __init__(self, viewer):  # noqa: D107
+        self.viewer = viewer if viewer and viewer.is_authenticated else None
+        self._data: dict[str, dict] = defaultdict(dict)
+        self._loaded_keys: dict[str, set] = defaultdict(set)
+
+    def load(self, name: str, keys: Iterable, loader: ViewerContextLoader):
+        """Load data for keys which haven't been loaded yet."""
+        missing_keys = set(keys) - self._loaded_keys[name]
+        if not missing_keys:
+            return
+        if self.viewer:
+            self._data[name].update(loader(self.viewer, missing_keys))
+        self._loaded_keys[name] |= missing_keys
+
+    def get(self, name: str, key, default=None):
+        """Get loaded data for the key."""
+        return self._data[name].get(key, default)
+
+
+def get_viewer_context(serializer_context: dict) -> ViewerContext:
+    """Get viewer context shared by all serializers rendering the same request."""
+    if "viewer_context" not in serializer_context:
+        request = serializer_context.get("request")
+        serializer_context["viewer_context"] = ViewerContext(request and request.user)
+    return serializer_context["viewer_context"]
+
+
+class ViewerContextListSerializer(serializers.ListSerializer):
+    """List serializer which preloads viewer context for the whole page at once.
+
+    Child serializer must implement ``load_viewer_context(instances)``. Nothing is
+    loaded when client didn't ask for ``viewer`` field.
+    """
+
+    def to_representation(self, data):
+        """Load viewer context for all instances, then represent them."""
+        if isinstance(data, models.manager.BaseManager):
+            data = data.all()
+        instances = list(data)
+        if "viewer" in self.child.fields:
+            self.child.load_viewer_context(instances)
+        return super().to_representation(instances)
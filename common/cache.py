@@ -0,0 +1,38 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+DEFAULT_CACHE_VERSION = "0"
+
+
+def get_cache_versions(version_keys: list[str]) -> list[str]:
+    """Get current versions of cached data, stored under given keys."""
+    versions = cache.get_many(version_keys)
+    return [versions.get(key, DEFAULT_CACHE_VERSION) for key in version_keys]
+
+
+def bump_cache_version(version_key: str, data_timeout: int | None = None):
+    """Make all data cached under the previous version unreachable.
+
+    Version outlives the data cached with it for ``data_timeout`` seconds (anonymous
+    responses cache timeout by default), so expired version can't bring stale data
+    back.
+    """
+    data_timeout = data_timeout or settings.ANONYMOUS_CACHE_SECONDS
+    cache.set(version_key, uuid.uuid4().hex, data_timeout * 2)
+
+
+def check_cache_is_shared(processes: int):
+    """Refuse to run several processes with cache living in memory of each of them.
+
+    Cache versions, invalidations and shared tiers of caches would only take effect
+    in the process which made them, others would keep serving stale data.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if processes > 1 and backend == "django.core.cache.backends.locmem.LocMemCache":
+        raise ImproperlyConfigured(
+            f"Cache {backend} isn't shared by {processes} processes, "
+            "set CACHE_URL to shared cache, like redis://"
+        )
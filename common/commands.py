@@ -0,0 +1,39 @@
+import abc
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicCommand(BaseCommand, abc.ABC):
+    """Base class for management commands which also run as scheduled jobs.
+
+    Command runs ``handle_once`` a single time, or repeatedly with a pause when
+    ``--every`` is given, so it can be started from cron or as a long living worker.
+    """
+
+    def add_arguments(self, parser):
+        """Add common arguments for periodic commands."""
+        parser.add_argument(
+            "--every",
+            type=float,
+            default=0,
+            help="Repeat every N seconds instead of running once.",
+        )
+
+    def handle(self, *args, **options):
+        """Run the job once or repeatedly."""
+        every = options["every"]
+        while True:
+            self.handle_once(*args, **options)
+            if every <= 0:
+                return
+            close_old_connections()
+            time.sleep(every)
+
+    @abc.abstractmethod
+    def handle_once(self, *args, **options):
+        """Run the job a single time."""
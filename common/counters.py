@@ -0,0 +1,193 @@
+import contextlib
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections, connection, models, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def _empty_pending() -> defaultdict:
+    return defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+
+
+class CounterBuffer:
+    """In-process write-behind buffer for denormalized counters.
+
+    Counter increments are collected per model row and written to the database in
+    batches, one ``UPDATE ... FROM (VALUES ...)`` statement per table, so hot rows
+    (like popular author's ``UserPublic``) are not locked on every single vote.
+
+    >>> counter_buffer.add(Post, post.pk, rating=1, votes_up_count=1)
+    >>> counter_buffer.apply_pending(post)  # post.rating now includes pending delta
+    >>> counter_buffer.flush()
+    """
+
+    def __init__(self):  # noqa: D107
+        self._lock = threading.Lock()
+        self._pending = _empty_pending()
+        self._failed_attempts: dict[tuple[type[models.Model], int], int] = {}
+        self._flusher: threading.Thread | None = None
+
+    def add(self, model: type[models.Model], pk: int, **deltas: float):
+        """Add counter deltas for the row with given primary key."""
+        with self._lock:
+            row = self._pending[model][pk]
+            for field_name, delta in deltas.items():
+                row[field_name] += delta
+        self._ensure_flusher()
+
+    def add_on_commit(self, model: type[models.Model], pk: int, **deltas: float):
+        """Add counter deltas once current transaction is committed."""
+        transaction.on_commit(lambda: self.add(model, pk, **deltas))
+
+    def get_pending(self, model: type[models.Model], pk: int) -> dict[str, float]:
+        """Return not yet flushed deltas for the row."""
+        with self._lock:
+            rows = self._pending.get(model)
+            if not rows or pk not in rows:
+                return {}
+            return dict(rows[pk])
+
+    def apply_pending(self, instance: models.Model) -> models.Model:
+        """Add not yet flushed deltas to counters of already loaded instance."""
+        for field_name, delta in self.get_pending(type(instance), instance.pk).items():
+            setattr(instance, field_name, getattr(instance, field_name) + delta)
+        return instance
+
+    def flush(self) -> int:
+        """Write all pending deltas to the database, return number of updated rows.
+
+        Deltas are written in a single transaction, if it fails they are written row
+        by row, so a row which can't be updated doesn't hold back the others. Deltas of
+        such row are kept for next flushes and dropped after
+        ``COUNTERS_FLUSH_MAX_ATTEMPTS`` failures, ``reconcile_counters`` fixes its
+        counters then.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, _empty_pending()
+
+        try:
+            updated = 0
+            with transaction.atomic():
+                # Tables are always updated in the same order, so concurrent
+                # flushes from different processes don't deadlock each other.
+                for model in sorted(pending, key=lambda m: m._meta.db_table):
+                    updated += apply_counter_deltas(model, pending[model])
+        except Exception:
+            logger.warning("Failed to flush counters, flushing row by row", exc_info=True)
+            return self._flush_rows(pending)
+        self._forget_failures(pending)
+        return updated
+
+    def _flush_rows(self, pending: dict) -> int:
+        updated = 0
+        for model in sorted(pending, key=lambda m: m._meta.db_table):
+            for pk, deltas in pending[model].items():
+                try:
+                    with transaction.atomic():
+                        updated += apply_counter_deltas(model, {pk: deltas})
+                except Exception:
+                    self._retry_or_drop(model, pk, deltas)
+                else:
+                    self._forget_failures({model: [pk]})
+        return updated
+
+    def _retry_or_drop(self, model: type[models.Model], pk: int, deltas: dict):
+        with self._lock:
+            attempts = self._failed_attempts.pop((model, pk), 0) + 1
+            if attempts < settings.COUNTERS_FLUSH_MAX_ATTEMPTS:
+                self._failed_attempts[model, pk] = attempts
+                for field_name, delta in deltas.items():
+                    self._pending[model][pk][field_name] += delta
+                return
+        logger.exception(
+            "Dropped counters deltas of %s %s after %s failed flushes: %s",
+            model._meta.label,
+            pk,
+            attempts,
+            dict(deltas),
+        )
+
+    def _forget_failures(self, pending: dict):
+        if not self._failed_attempts:
+            return
+        with self._lock:
+            for model, rows in pending.items():
+                for pk in rows:
+                    self._failed_attempts.pop((model, pk), None)
+
+    def _ensure_flusher(self):
+        interval = settings.COUNTERS_FLUSH_INTERVAL_SECONDS
+        if interval <= 0 or (self._flusher and self._flusher.is_alive()):
+            return
+        with self._lock:
+            if self._flusher and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(
+                target=self._flush_periodically,
+                args=(interval,),
+                name="counter-buffer-flusher",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def _flush_periodically(self, interval: float):
+        while True:
+            time.sleep(interval)
+            close_old_connections()
+            # Failure is already logged, deltas will be retried on the next iteration
+            with contextlib.suppress(Exception):
+                self.flush()
+
+
+def apply_counter_deltas(
+    model: type[models.Model], rows: dict[int, dict[str, float]]
+) -> int:
+    """Add deltas to counters of many rows with one ``UPDATE ... FROM (VALUES ...)``.
+
+    ``rows`` maps primary key to deltas per counter field, returns number of updated
+    rows.
+    """
+    rows = {pk: deltas for pk, deltas in rows.items() if any(deltas.values())}
+    if not rows:
+        return 0
+
+    opts = model._meta
+    pk_field = opts.pk
+    fields = [opts.get_field(name) for name in sorted(set().union(*rows.values()))]
+    qn = connection.ops.quote_name
+
+    row_placeholder = ", ".join(
+        f"%s::{field.cast_db_type(connection)}" for field in [pk_field, *fields]
+    )
+    values_sql = ", ".join([f"({row_placeholder})"] * len(rows))
+    params = []
+    for pk in sorted(rows):
+        params.append(pk)
+        params.extend(rows[pk].get(field.name, 0) for field in fields)
+
+    columns = ", ".join(qn(field.column) for field in [pk_field, *fields])
+    assignments = ", ".join(
+        f"{qn(field.column)} = t.{qn(field.column)} + v.{qn(field.column)}"
+        for field in fields
+    )
+    sql = (
+        f"UPDATE {qn(opts.db_table)} AS t SET {assignments} "
+        f"FROM (VALUES {values_sql}) AS v ({columns}) "
+        f"WHERE t.{qn(pk_field.column)} = v.{qn(pk_field.column)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def is_counters_write_behind_enabled() -> bool:
+    """Check if counters should be buffered instead of being updated right away."""
+    return settings.COUNTERS_WRITE_BEHIND
+
+
+counter_buffer = CounterBuffer()
@@ -0,0 +1,208 @@
+import json
+import re
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from django.db.models import QuerySet
+
+# column compared with a constant or parameter in plan's filter or index condition,
+# like ``(status)::text = 'published'::text`` or ``(p.user_id = 42)``
+CONDITION_COLUMN_RE = re.compile(
+    r"\(+(?:\w+\.)?(?P<column>\w+)\)?(?:::[\w ]+)?\s*"
+    r"(?P<operator>=|<>|<=|>=|<|>|~~|&&|@>|IS NOT|IS)\s*"
+    r"(?P<value>'[^']*'|[\w.$-]+)"
+)
+SORT_KEY_RE = re.compile(r"^(?:\w+\.)?(?P<column>\w+)(?P<descending> DESC)?")
+
+
+class PlanFinding(NamedTuple):
+    """Problem found in the query plan, with index which might fix it."""
+
+    kind: str
+    relation: str
+    detail: str
+    suggestion: str
+
+
+class ExplainedQuery(NamedTuple):
+    """Plan of executed query with its timings and found problems."""
+
+    plan: dict
+    planning_time_ms: float
+    execution_time_ms: float
+    findings: list[PlanFinding]
+
+
+def explain_queryset(
+    queryset: QuerySet, min_seq_scan_rows: int = 1000, max_estimate_error: float = 10
+) -> ExplainedQuery:
+    """Run ``EXPLAIN (ANALYZE, BUFFERS)`` for the queryset and look for problems.
+
+    Query is actually executed, so only read-only querysets should be explained.
+    """
+    result = queryset.explain(format="json", analyze=True, buffers=True)
+    explained = (json.loads(result) if isinstance(result, str) else result)[0]
+    return ExplainedQuery(
+        plan=explained["Plan"],
+        planning_time_ms=explained.get("Planning Time", 0),
+        execution_time_ms=explained.get("Execution Time", 0),
+        findings=find_plan_problems(
+            explained["Plan"], min_seq_scan_rows, max_estimate_error
+        ),
+    )
+
+
+def iter_plan_nodes(
+    plan: dict, parent: dict | None = None
+) -> Iterator[tuple[dict, dict]]:
+    """Iterate over all nodes of the plan along with their parents."""
+    yield plan, parent
+    for child in plan.get("Plans", ()):
+        yield from iter_plan_nodes(child, plan)
+
+
+def find_plan_problems(
+    plan: dict, min_seq_scan_rows: int = 1000, max_estimate_error: float = 10
+) -> list[PlanFinding]:
+    """Find sequential scans of big tables, sorts spilled to disk and bad estimates.
+
+    Sequential scans of tables which produce or filter out fewer than
+    ``min_seq_scan_rows`` rows are fine and aren't reported. Estimate is bad when
+    actual number of rows differs from the planned one more than
+    ``max_estimate_error`` times.
+    """
+    findings = []
+    for node, _ in iter_plan_nodes(plan):
+        node_type = node["Node Type"]
+        if node_type == "Seq Scan" and _get_scanned_rows(node) >= min_seq_scan_rows:
+            findings.append(_get_seq_scan_finding(node))
+        elif node_type in ("Sort", "Incremental Sort") and _is_sort_spilled(node):
+            findings.append(_get_sort_finding(node))
+        if finding := _get_estimate_finding(node, max_estimate_error):
+            findings.append(finding)
+    return findings
+
+
+def _get_scanned_rows(node: dict) -> int:
+    loops = node.get("Actual Loops", 1)
+    return (node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)) * loops
+
+
+def _is_sort_spilled(node: dict) -> bool:
+    return node.get("Sort Space Type") == "Disk" or "external" in node.get(
+        "Sort Method", ""
+    )
+
+
+def _get_seq_scan_finding(node: dict) -> PlanFinding:
+    relation = node.get("Relation Name", "")
+    condition = node.get("Filter", "")
+    return PlanFinding(
+        kind="seq_scan",
+        relation=relation,
+        detail=(
+            f"{_get_scanned_rows(node)} rows scanned, "
+            f"{node.get('Actual Rows', 0) * node.get('Actual Loops', 1)} kept"
+            + (f", filter {condition}" if condition else "")
+        ),
+        suggestion=suggest_index(relation, condition),
+    )
+
+
+def _get_sort_finding(node: dict) -> PlanFinding:
+    sort_keys = node.get("Sort Key", [])
+    scan = _find_scan_below(node)
+    relation = scan.get("Relation Name", "") if scan else ""
+    condition = scan.get("Filter", "") or scan.get("Index Cond", "") if scan else ""
+    return PlanFinding(
+        kind="disk_sort",
+        relation=relation,
+        detail=(
+            f"sort by {', '.join(sort_keys)} used {node.get('Sort Space Used', 0)}kB "
+            f"of {node.get('Sort Space Type', 'disk').lower()}"
+        ),
+        suggestion=suggest_index(relation, condition, sort_keys),
+    )
+
+
+def _get_estimate_finding(node: dict, max_estimate_error: float) -> PlanFinding | None:
+    if "Actual Rows" not in node or node.get("Actual Loops", 1) == 0:
+        return None
+    planned = max(node.get("Plan Rows", 0), 1)
+    actual = max(node["Actual Rows"], 1)
+    if max(planned, actual) / min(planned, actual) <= max_estimate_error:
+        return None
+    relation = node.get("Relation Name", "")
+    return PlanFinding(
+        kind="row_estimate",
+        relation=relation,
+        detail=f"{node['Node Type']} planned {planned} rows, got {actual}",
+        suggestion=(
+            f"ANALYZE {relation}; consider extended statistics for correlated columns"
+            if relation
+            else "ANALYZE tables below this node"
+        ),
+    )
+
+
+def _find_scan_below(node: dict) -> dict | None:
+    for child, _ in iter_plan_nodes(node):
+        if "Relation Name" in child:
+            return child
+    return None
+
+
+class ConditionColumns(NamedTuple):
+    """Columns of the query condition grouped by how index can use them."""
+
+    equal: list[str]
+    range: list[str]
+    partial: list[str]
+    array: list[str]
+
+
+def parse_condition_columns(condition: str) -> ConditionColumns:
+    """Group columns of the plan's condition by comparison used for them."""
+    columns = ConditionColumns(equal=[], range=[], partial=[], array=[])
+    for match in CONDITION_COLUMN_RE.finditer(condition):
+        column, operator, value = match.group("column", "operator", "value")
+        if operator == "=" and value.startswith("'"):
+            columns.partial.append(f"{column} = {value}")
+        elif operator == "=":
+            columns.equal.append(column)
+        elif operator in ("&&", "@>"):
+            columns.array.append(column)
+        elif operator not in ("IS", "IS NOT"):
+            columns.range.append(column)
+    return columns
+
+
+def suggest_index(relation: str, condition: str = "", sort_keys: list[str] = ()) -> str:
+    """Suggest index covering conditions and ordering of the query.
+
+    Columns compared for equality go first, then sort keys, then the first range
+    condition. Comparisons with string constants, like statuses, go to ``WHERE`` of
+    partial index instead, as they usually split table into few big parts.
+    """
+    if not relation:
+        return ""
+    condition_columns = parse_condition_columns(condition)
+    if condition_columns.array:
+        return f"CREATE INDEX ON {relation} USING gin ({condition_columns.array[0]})"
+
+    sort_columns = [
+        match["column"] + (" DESC" if match["descending"] else "")
+        for match in map(SORT_KEY_RE.match, sort_keys)
+        if match
+    ]
+    columns = list(
+        dict.fromkeys(
+            [*condition_columns.equal, *sort_columns, *condition_columns.range[:1]]
+        )
+    )
+    if not columns:
+        return ""
+    suggestion = f"CREATE INDEX ON {relation} ({', '.join(columns)})"
+    if condition_columns.partial:
+        suggestion += f" WHERE {' AND '.join(dict.fromkeys(condition_columns.partial))}"
+    return suggestion
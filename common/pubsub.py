@@ -0,0 +1,191 @@
+import abc
+import asyncio
+import contextlib
+import json
+import logging
+import threading
+from collections import defaultdict
+from collections.abc import AsyncIterator
+
+import psycopg
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """Messages published to the channel since subscribing, in order.
+
+    Only last ``max_size`` messages are kept, so slow subscriber misses older ones
+    instead of making publisher wait or growing without limit.
+    """
+
+    def __init__(self, channel: str, max_size: int):  # noqa: D107
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(max_size)
+
+    async def get(self, timeout: float | None = None) -> dict | None:
+        """Wait for the next message, return ``None`` if none came within timeout."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def put(self, message: dict):
+        """Add message, dropping the oldest one when subscription is full."""
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(message)
+
+
+class PubSub(abc.ABC):
+    """Publish messages to subscribers of the channel, e.g. viewers of the post.
+
+    Messages are delivered to subscribers in event loops of this process, backends
+    differ by how messages published by other processes reach them. Publishing is
+    synchronous and never blocks on subscribers, so it's safe in request handlers.
+
+    >>> get_pubsub().publish("post:42", {"event": "comment", "data": {...}})
+    >>> async with get_pubsub().subscribe("post:42") as subscription:
+    ...     message = await subscription.get(timeout=15)
+    """
+
+    name: str
+    subscription_max_size = 100
+
+    def __init__(self):  # noqa: D107
+        self._lock = threading.Lock()
+        self._subscriptions: dict[str, set[Subscription]] = defaultdict(set)
+
+    @abc.abstractmethod
+    def publish(self, channel: str, message: dict):
+        """Send JSON serializable message to all subscribers of the channel."""
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[Subscription]:
+        """Receive messages published to the channel while in context."""
+        subscription = Subscription(channel, self.subscription_max_size)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        await self.on_subscribe(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscriptions[channel].discard(subscription)
+                if not self._subscriptions[channel]:
+                    del self._subscriptions[channel]
+            await self.on_unsubscribe(subscription)
+
+    def has_subscribers(self) -> bool:
+        """Check if anyone in this process is subscribed to any channel."""
+        with self._lock:
+            return bool(self._subscriptions)
+
+    async def on_subscribe(self, subscription: Subscription):  # noqa: B027
+        """Prepare delivery of messages from other processes to the subscription."""
+
+    async def on_unsubscribe(self, subscription: Subscription):  # noqa: B027
+        """Clean up after subscription is gone."""
+
+    def deliver(self, channel: str, message: dict):
+        """Pass message to subscribers of the channel in this process."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            # subscriber's queue isn't thread-safe, so it's filled by its own loop
+            with contextlib.suppress(RuntimeError):
+                subscription.loop.call_soon_threadsafe(subscription.put, message)
+
+
+class LocalPubSub(PubSub):
+    """Messages only reach subscribers in the same process.
+
+    Fits single process servers and tests, with several workers viewers of the
+    same post may be connected to different ones.
+    """
+
+    name = "local"
+
+    def publish(self, channel, message):
+        # subscribers get the same plain JSON data as from other backends
+        self.deliver(channel, json.loads(json.dumps(message, cls=DjangoJSONEncoder)))
+
+
+class PostgresPubSub(PubSub):
+    """Messages go through Postgres ``NOTIFY``, so they reach every process.
+
+    Every process with subscribers keeps single extra connection which listens to
+    ``notify_channel`` and passes messages to local subscribers. Notifications are
+    sent on commit, payload must be shorter than 8000 bytes.
+    """
+
+    name = "postgres"
+    notify_channel = "pubsub"
+    reconnect_delay_seconds = 1
+
+    def __init__(self):  # noqa: D107
+        super().__init__()
+        self._listener: asyncio.Task | None = None
+
+    def publish(self, channel, message):
+        payload = json.dumps(
+            {"channel": channel, "message": message},
+            cls=DjangoJSONEncoder,
+            ensure_ascii=False,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.notify_channel, payload])
+
+    async def on_subscribe(self, subscription):
+        if self._listener is None or self._listener.done():
+            ready = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen(ready))
+            await ready.wait()
+
+    async def on_unsubscribe(self, subscription):
+        if self._listener and not self.has_subscribers():
+            # detached before waiting, so subscriber coming meanwhile starts a new one
+            listener, self._listener = self._listener, None
+            listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await listener
+
+    async def _listen(self, ready: asyncio.Event):
+        params = connection.get_connection_params()
+        params.pop("cursor_factory", None)
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    **params, autocommit=True
+                ) as listener:
+                    await listener.execute(f'LISTEN "{self.notify_channel}"')
+                    ready.set()
+                    async for notify in listener.notifies():
+                        payload = json.loads(notify.payload)
+                        self.deliver(payload["channel"], payload["message"])
+            except psycopg.Error:
+                logger.exception("Pub/sub listener failed, reconnecting")
+                ready.set()
+                await asyncio.sleep(self.reconnect_delay_seconds)
+
+
+PUBSUB_BACKENDS: dict[str, PubSub] = {
+    backend.name: backend for backend in (LocalPubSub(), PostgresPubSub())
+}
+
+
+def get_pubsub(name: str | None = None) -> PubSub:
+    """Return pub/sub backend, configured one by default."""
+    name = name or settings.PUBSUB_BACKEND
+    try:
+        return PUBSUB_BACKENDS[name]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Unknown pub/sub backend {name!r}, "
+            f"choose one of {', '.join(PUBSUB_BACKENDS)}"
+        ) from None
@@ -0,0 +1,139 @@
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from django.db import connection, models
+from django.db.models import Aggregate, QuerySet
+from django.db.models.expressions import RawSQL
+
+ACTUAL_PREFIX = "actual_"
+CHUNK_ALIAS = "reconciled_chunk"
+
+
+class CounterSource(NamedTuple):
+    """Rows denormalized counters are calculated from, like votes of posts.
+
+    ``target_field`` is the foreign key to the counted row, ``aggregates`` map counter
+    field name to aggregate calculating its value over rows of one target.
+    """
+
+    queryset: QuerySet
+    target_field: str
+    aggregates: dict[str, Aggregate]
+
+
+class CounterMismatch(NamedTuple):
+    """Denormalized counter which differs from its actual value."""
+
+    pk: int
+    field_name: str
+    stored: float
+    actual: float
+
+
+def iter_counter_mismatches(
+    model: type[models.Model],
+    counter_sources: list[CounterSource],
+    chunk_size: int = 1000,
+    start_after: int = 0,
+) -> Iterator[tuple[int, list[CounterMismatch]]]:
+    """Scan rows in primary key order, yield last scanned pk and mismatches per chunk.
+
+    Each chunk is a single keyset-paginated statement, which aggregates every source
+    once with ``GROUP BY`` over the chunk's primary key range and joins results to the
+    chunk. Stored and actual values come from the same snapshot and no locks are held
+    between chunks.
+    """
+    counter_fields = [
+        field_name for source in counter_sources for field_name in source.aggregates
+    ]
+    last_pk = start_after
+    while True:
+        sql, params = _get_chunk_sql(model, counter_sources, last_pk, chunk_size)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        if not rows:
+            return
+        last_pk = rows[-1][0]
+        mismatches = []
+        for pk, *values in rows:
+            stored_values = values[: len(counter_fields)]
+            actual_values = values[len(counter_fields) :]
+            mismatches.extend(
+                CounterMismatch(pk, field_name, stored, actual)
+                for field_name, stored, actual in zip(
+                    counter_fields, stored_values, actual_values, strict=True
+                )
+                if stored != actual
+            )
+        yield last_pk, mismatches
+
+
+def get_counter_fix_deltas(
+    mismatches: list[CounterMismatch],
+) -> dict[int, dict[str, float]]:
+    """Turn mismatches into deltas, which don't override concurrent increments."""
+    deltas = {}
+    for mismatch in mismatches:
+        deltas.setdefault(mismatch.pk, {})[mismatch.field_name] = (
+            mismatch.actual - mismatch.stored
+        )
+    return deltas
+
+
+def _get_chunk_sql(
+    model: type[models.Model],
+    counter_sources: list[CounterSource],
+    start_after: int,
+    chunk_size: int,
+) -> tuple[str, list]:
+    qn = connection.ops.quote_name
+    counter_fields = [
+        field_name for source in counter_sources for field_name in source.aggregates
+    ]
+    chunk_sql, chunk_params = (
+        model._default_manager.filter(pk__gt=start_after)
+        .order_by("pk")
+        .values_list("pk", *counter_fields)[:chunk_size]
+        .query.sql_with_params()
+    )
+    chunk_columns = ", ".join(qn(name) for name in ["pk", *counter_fields])
+    last_chunk_pk = RawSQL(f"SELECT max(pk) FROM {CHUNK_ALIAS}", ())
+
+    params = list(chunk_params)
+    joins, actual_columns = [], []
+    for index, source in enumerate(counter_sources):
+        alias = f"actual_{index}"
+        source_sql, source_params = (
+            source.queryset.filter(
+                **{
+                    f"{source.target_field}__gt": start_after,
+                    f"{source.target_field}__lte": last_chunk_pk,
+                }
+            )
+            .order_by()
+            .values(source.target_field)
+            .annotate(
+                **{
+                    f"{ACTUAL_PREFIX}{field_name}": aggregate
+                    for field_name, aggregate in source.aggregates.items()
+                }
+            )
+            .query.sql_with_params()
+        )
+        params.extend(source_params)
+        source_columns = ", ".join(qn(name) for name in ["pk", *source.aggregates])
+        joins.append(
+            f"LEFT JOIN ({source_sql}) AS {alias} ({source_columns}) "
+            f"ON {alias}.pk = {CHUNK_ALIAS}.pk"
+        )
+        actual_columns.extend(
+            f"COALESCE({alias}.{qn(field_name)}, 0)" for field_name in source.aggregates
+        )
+
+    sql = (
+        f"WITH {CHUNK_ALIAS} ({chunk_columns}) AS ({chunk_sql}) "
+        f"SELECT {CHUNK_ALIAS}.*, {', '.join(actual_columns)} FROM {CHUNK_ALIAS} "
+        f"{' '.join(joins)} ORDER BY {CHUNK_ALIAS}.pk"
+    )
+    return sql, params
@@ -0,0 +1,153 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, models
+from django.db.models.signals import post_delete, post_save
+
+
+class UUIDResolver:
+    """Resolve UUIDs of objects to their primary keys and other immutable fields.
+
+    Resolved fields are kept in memory of the process for ``local_timeout`` seconds
+    and in shared cache for ``UUID_RESOLVER_CACHE_SECONDS``, so the same UUID is
+    looked up in database once. Object is forgotten when it's changed or deleted,
+    memory of other processes keeps it for ``local_timeout`` seconds at most, so
+    only fields which never change should be resolved. Unknown UUIDs aren't cached.
+
+    >>> post_resolver = UUIDResolver(Post, PostRef)
+    >>> post_resolver.resolve(post_uuid)
+    PostRef(pk=42)
+    """
+
+    def __init__(  # noqa: D107
+        self,
+        model: type[models.Model],
+        ref_class: type[tuple],
+        local_timeout: float = 60,
+        local_max_size: int = 10000,
+    ):
+        self.model = model
+        self.ref_class = ref_class
+        self.local_timeout = local_timeout
+        self.local_max_size = local_max_size
+        self.cache_prefix = (
+            f"uuid:{model._meta.label_lower}:{','.join(ref_class._fields)}"
+        )
+        self._lock = threading.Lock()
+        self._local: OrderedDict[uuid.UUID, tuple[float, tuple]] = OrderedDict()
+        self._resolved_field_names = {"uuid"} | {
+            model._meta.get_field(name).name for name in ref_class._fields if name != "pk"
+        }
+        post_save.connect(self._forget_saved, sender=model, weak=False)
+        post_delete.connect(self._forget_deleted, sender=model, weak=False)
+
+    def __deepcopy__(self, memo):
+        # resolver is shared by all copies of serializer fields using it
+        return self
+
+    def resolve(self, value: uuid.UUID | str) -> tuple | None:
+        """Return fields of the object with given UUID, ``None`` if there is no such.
+
+        Raises ``ValueError`` if the value isn't a valid UUID.
+        """
+        value = _to_uuid(value)
+        return self.resolve_many([value]).get(value)
+
+    def resolve_many(self, values: Iterable[uuid.UUID | str]) -> dict[uuid.UUID, tuple]:
+        """Return fields of the objects by their UUIDs, unknown ones are left out."""
+        refs = {}
+        missing = set()
+        for value in map(_to_uuid, values):
+            if (ref := self._get_local(value)) is not None:
+                refs[value] = ref
+            else:
+                missing.add(value)
+        if not missing:
+            return refs
+
+        cached = cache.get_many([self._get_cache_key(value) for value in missing])
+        for value in list(missing):
+            if (ref := cached.get(self._get_cache_key(value))) is not None:
+                refs[value] = self._set_local(value, self.ref_class(*ref))
+                missing.remove(value)
+        if not missing:
+            return refs
+
+        fresh = {
+            value: self.ref_class(*ref)
+            for value, *ref in self.model.objects.filter(uuid__in=missing).values_list(
+                "uuid", *self.ref_class._fields
+            )
+        }
+        cache.set_many(
+            {self._get_cache_key(value): tuple(ref) for value, ref in fresh.items()},
+            settings.UUID_RESOLVER_CACHE_SECONDS,
+        )
+        for value, ref in fresh.items():
+            refs[value] = self._set_local(value, ref)
+        return refs
+
+    def get_instance(self, value: uuid.UUID | str) -> models.Model | None:
+        """Return instance with resolved fields loaded, others are deferred."""
+        value = _to_uuid(value)
+        if (ref := self.resolve(value)) is None:
+            return None
+        pk_name = self.model._meta.pk.attname
+        values = {"uuid": value}
+        for name, field_value in ref._asdict().items():
+            values[pk_name if name == "pk" else name] = field_value
+        # values are expected in order of model fields
+        fields = [f for f in self.model._meta.concrete_fields if f.attname in values]
+        return self.model.from_db(
+            DEFAULT_DB_ALIAS,
+            [field.attname for field in fields],
+            [values[field.attname] for field in fields],
+        )
+
+    def forget(self, value: uuid.UUID | str):
+        """Drop resolved fields of the object from shared cache and process memory."""
+        value = _to_uuid(value)
+        with self._lock:
+            self._local.pop(value, None)
+        cache.delete(self._get_cache_key(value))
+
+    def _get_local(self, value: uuid.UUID) -> tuple | None:
+        with self._lock:
+            expires_at, ref = self._local.get(value, (0, None))
+            if expires_at < time.monotonic():
+                self._local.pop(value, None)
+                return None
+            self._local.move_to_end(value)
+            return ref
+
+    def _set_local(self, value: uuid.UUID, ref: tuple) -> tuple:
+        with self._lock:
+            self._local[value] = (time.monotonic() + self.local_timeout, ref)
+            self._local.move_to_end(value)
+            while len(self._local) > self.local_max_size:
+                self._local.popitem(last=False)
+        return ref
+
+    def _get_cache_key(self, value: uuid.UUID) -> str:
+        return f"{self.cache_prefix}:{value}"
+
+    def _forget_saved(self, sender, instance, created, update_fields=None, **kwargs):
+        # counters and other fields saved on their own don't make resolved fields stale
+        if created or (
+            update_fields is not None
+            and self._resolved_field_names.isdisjoint(update_fields)
+        ):
+            return
+        self.forget(instance.uuid)
+
+    def _forget_deleted(self, sender, instance, **kwargs):
+        self.forget(instance.uuid)
+
+
+def _to_uuid(value: uuid.UUID | str) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
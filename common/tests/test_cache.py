@@ -0,0 +1,26 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from common.cache import check_cache_is_shared
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+REDIS_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://kapibara-cache:6379/0",
+    }
+}
+
+
+def test_per_process_cache_is_refused_for_several_processes(settings):
+    settings.CACHES = LOCMEM_CACHE
+
+    with pytest.raises(ImproperlyConfigured):
+        check_cache_is_shared(2)
+    check_cache_is_shared(1)
+
+
+def test_shared_cache_is_fine_for_several_processes(settings):
+    settings.CACHES = REDIS_CACHE
+
+    check_cache_is_shared(4)
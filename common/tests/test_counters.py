@@ -0,0 +1,96 @@
+import pytest
+from rest_framework.reverse import reverse
+
+from common.counters import CounterBuffer, counter_buffer
+from posts.choices import PostStatus, Vote
+from posts.models import Post
+from posts.tests.factories import PostFactory
+from users.models import UserPublic
+from users.tests.factories import UserPublicFactory
+
+
+@pytest.mark.django_db
+class TestCounterBuffer:
+    def setup(self):
+        self.buffer = CounterBuffer()
+        self.post = PostFactory(rating=10, votes_up_count=3)
+        self.user = UserPublicFactory(rating=1.5)
+
+    def test_pending_deltas_applied_on_read(self, settings):
+        settings.COUNTERS_FLUSH_INTERVAL_SECONDS = 0
+        self.buffer.add(Post, self.post.pk, rating=1, votes_up_count=1)
+        self.buffer.add(Post, self.post.pk, rating=1, votes_up_count=1)
+
+        self.post.refresh_from_db()
+        assert self.post.rating == 10
+        self.buffer.apply_pending(self.post)
+        assert self.post.rating == 12
+        assert self.post.votes_up_count == 5
+
+    def test_flush_updates_all_tables(self, settings):
+        settings.COUNTERS_FLUSH_INTERVAL_SECONDS = 0
+        other_post = PostFactory(rating=0)
+        self.buffer.add(Post, self.post.pk, rating=-1, votes_down_count=1)
+        self.buffer.add(Post, other_post.pk, rating=1)
+        self.buffer.add(UserPublic, self.user.pk, rating=0.5, votes_up_count=1)
+
+        assert self.buffer.flush() == 3
+
+        self.post.refresh_from_db()
+        other_post.refresh_from_db()
+        self.user.refresh_from_db()
+        assert (self.post.rating, self.post.votes_down_count) == (9, 1)
+        assert other_post.rating == 1
+        assert (self.user.rating, self.user.votes_up_count) == (2, 1)
+        assert self.buffer.get_pending(Post, self.post.pk) == {}
+
+    def test_failing_row_doesnt_block_others(self, settings, caplog):
+        settings.COUNTERS_FLUSH_INTERVAL_SECONDS = 0
+        settings.COUNTERS_FLUSH_MAX_ATTEMPTS = 2
+        # votes count can't go negative
+        self.buffer.add(Post, self.post.pk, votes_up_count=-5)
+        self.buffer.add(UserPublic, self.user.pk, votes_up_count=1)
+
+        assert self.buffer.flush() == 1
+        assert self.buffer.get_pending(Post, self.post.pk) == {"votes_up_count": -5}
+        self.buffer.add(Post, self.post.pk, rating=1)
+        assert self.buffer.flush() == 0
+
+        assert self.buffer.get_pending(Post, self.post.pk) == {}
+        assert "Dropped counters deltas" in caplog.text
+        self.post.refresh_from_db()
+        self.user.refresh_from_db()
+        assert (self.post.rating, self.post.votes_up_count) == (10, 3)
+        assert self.user.votes_up_count == 1
+
+
+@pytest.mark.django_db(transaction=True)
+class TestVoteWithWriteBehindCounters:
+    def setup(self):
+        self.post = PostFactory(status=PostStatus.PUBLISHED, rating=10)
+        self.voter = UserPublicFactory()
+
+    def teardown(self):
+        counter_buffer.flush()
+
+    def test_vote_response_includes_buffered_counters(self, authed_api_client, settings):
+        settings.COUNTERS_WRITE_BEHIND = True
+        settings.COUNTERS_FLUSH_INTERVAL_SECONDS = 0
+
+        result = authed_api_client(self.voter).post(
+            reverse("v1:posts:posts-vote", kwargs={"uuid": self.post.uuid}),
+            data={"value": Vote.UPVOTE},
+        )
+
+        assert result.data["rating"] == 11
+        assert result.data["votes_up_count"] == 1
+        self.post.refresh_from_db()
+        assert self.post.rating == 10
+
+        counter_buffer.flush()
+        self.post.refresh_from_db()
+        self.voter.refresh_from_db()
+        self.post.user.refresh_from_db()
+        assert self.post.rating == 11
+        assert self.voter.votes_up_count == 1
+        assert self.post.user.rating == 1
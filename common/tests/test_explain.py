@@ -0,0 +1,91 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from comments.tests.factories import CommentFactory
+from common.explain import find_plan_problems, suggest_index
+from posts.choices import PostStatus
+from posts.tests.factories import PostFactory
+
+
+def test_plan_problems_found():
+    plan = {
+        "Node Type": "Limit",
+        "Plan Rows": 101,
+        "Actual Rows": 101,
+        "Actual Loops": 1,
+        "Plans": [
+            {
+                "Node Type": "Sort",
+                "Sort Key": ["posts_post.created_at DESC", "posts_post.id DESC"],
+                "Sort Method": "external merge",
+                "Sort Space Used": 5120,
+                "Sort Space Type": "Disk",
+                "Plan Rows": 50000,
+                "Actual Rows": 101,
+                "Actual Loops": 1,
+                "Plans": [
+                    {
+                        "Node Type": "Seq Scan",
+                        "Relation Name": "posts_post",
+                        "Filter": "((user_id = 42) AND ((status)::text = 'P'::text))",
+                        "Plan Rows": 50000,
+                        "Actual Rows": 40000,
+                        "Rows Removed by Filter": 60000,
+                        "Actual Loops": 1,
+                    }
+                ],
+            }
+        ],
+    }
+
+    findings = {finding.kind: finding for finding in find_plan_problems(plan)}
+
+    assert findings.keys() == {"disk_sort", "seq_scan", "row_estimate"}
+    assert findings["seq_scan"].detail.startswith("100000 rows scanned, 40000 kept")
+    assert findings["disk_sort"].suggestion == (
+        "CREATE INDEX ON posts_post (user_id, created_at DESC, id DESC) "
+        "WHERE status = 'P'"
+    )
+    assert findings["row_estimate"].relation == ""
+
+
+def test_small_seq_scans_arent_reported():
+    plan = {
+        "Node Type": "Seq Scan",
+        "Relation Name": "posts_tag",
+        "Plan Rows": 10,
+        "Actual Rows": 10,
+        "Actual Loops": 1,
+    }
+    assert find_plan_problems(plan) == []
+
+
+@pytest.mark.parametrize(
+    ("condition", "expected"),
+    (
+        ("(rating > 10)", "CREATE INDEX ON t (rating)"),
+        (
+            "(tag_names && '{python}'::varchar[])",
+            "CREATE INDEX ON t USING gin (tag_names)",
+        ),
+        ("(published_at IS NOT NULL)", ""),
+    ),
+)
+def test_suggest_index(condition, expected):
+    assert suggest_index("t", condition) == expected
+
+
+@pytest.mark.django_db
+def test_explain_selectors_command():
+    post = PostFactory(status=PostStatus.PUBLISHED)
+    CommentFactory(post=post)
+    out = StringIO()
+
+    call_command("explain_selectors", "--format=json", "--with-plans", stdout=out)
+
+    report = {entry["selector"]: entry for entry in json.loads(out.getvalue())}
+    assert {"fetch_new_posts", "get_comments_root_nodes_qs"} <= report.keys()
+    assert all("Node Type" in entry["plan"] for entry in report.values())
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+
+from common.pubsub import LocalPubSub, PostgresPubSub, get_pubsub
+
+# event loop wakes itself up through socket pair
+pytestmark = pytest.mark.enable_socket
+
+
+def test_local_subscribers_get_messages_of_their_channel():
+    pubsub = LocalPubSub()
+
+    async def receive():
+        async with pubsub.subscribe("a") as first, pubsub.subscribe("a") as second:
+            async with pubsub.subscribe("b") as other:
+                # published from another thread, like request handler does
+                thread = threading.Thread(target=pubsub.publish, args=("a", {"n": 1}))
+                thread.start()
+                thread.join()
+                return (
+                    await first.get(timeout=1),
+                    await second.get(timeout=1),
+                    await other.get(timeout=0.01),
+                )
+
+    assert asyncio.run(receive()) == ({"n": 1}, {"n": 1}, None)
+    assert not pubsub.has_subscribers()
+
+
+def test_slow_subscriber_misses_oldest_messages():
+    pubsub = LocalPubSub()
+    pubsub.subscription_max_size = 2
+
+    async def receive():
+        async with pubsub.subscribe("a") as subscription:
+            for n in range(3):
+                pubsub.publish("a", {"n": n})
+            await asyncio.sleep(0)
+            return [await subscription.get(timeout=0.01) for _ in range(3)]
+
+    assert asyncio.run(receive()) == [{"n": 1}, {"n": 2}, None]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_postgres_notifications_reach_subscribers():
+    pubsub = PostgresPubSub()
+
+    async def receive():
+        async with pubsub.subscribe("a") as subscription:
+            await sync_to_async(pubsub.publish)("a", {"n": 1})
+            return await subscription.get(timeout=5)
+
+    assert asyncio.run(receive()) == {"n": 1}
+    assert pubsub._listener is None
+
+
+def test_subscribe_while_listener_is_stopping():
+    class SlowlyStoppingPubSub(PostgresPubSub):
+        async def _listen(self, ready):
+            ready.set()
+            try:
+                await asyncio.Event().wait()
+            finally:
+                # like closing of the connection
+                await asyncio.sleep(0.01)
+
+    pubsub = SlowlyStoppingPubSub()
+
+    async def resubscribe():
+        first = pubsub.subscribe("a")
+        await first.__aenter__()
+        unsubscribing = asyncio.create_task(first.__aexit__(None, None, None))
+        await asyncio.sleep(0)
+        async with pubsub.subscribe("a"):
+            await unsubscribing
+            return pubsub._listener is not None and not pubsub._listener.done()
+
+    assert asyncio.run(resubscribe())
+    assert pubsub._listener is None
+
+
+def test_unknown_backend(settings):
+    settings.PUBSUB_BACKEND = "redis"
+
+    with pytest.raises(ImproperlyConfigured):
+        get_pubsub()
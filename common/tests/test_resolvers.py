@@ -0,0 +1,127 @@
+import uuid
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from comments.selectors import CommentRef, comment_resolver
+from comments.tests.factories import CommentFactory
+from posts.selectors import PostRef, post_resolver
+from posts.tests.factories import PostFactory
+from users.tests.factories import UserPublicFactory
+
+
+@pytest.mark.django_db
+class TestUUIDResolver:
+    def setup(self):
+        self.post = PostFactory()
+
+    def test_uuid_is_looked_up_once(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            assert post_resolver.resolve(self.post.uuid) == PostRef(pk=self.post.pk)
+            assert post_resolver.resolve(str(self.post.uuid)) == PostRef(pk=self.post.pk)
+
+    def test_shared_cache_is_used_when_memory_is_empty(self, django_assert_num_queries):
+        post_resolver.resolve(self.post.uuid)
+        post_resolver._local.clear()
+
+        with django_assert_num_queries(0):
+            assert post_resolver.resolve(self.post.uuid) == PostRef(pk=self.post.pk)
+
+    def test_unknown_uuid_isnt_cached(self):
+        unknown = uuid.uuid4()
+
+        assert post_resolver.resolve(unknown) is None
+        assert unknown not in post_resolver._local
+        assert post_resolver.get_instance(unknown) is None
+
+    def test_invalid_uuid(self):
+        with pytest.raises(ValueError):
+            post_resolver.resolve("not-uuid")
+
+    def test_many_uuids_are_looked_up_together(self, django_assert_num_queries):
+        other_post = PostFactory()
+        post_resolver.resolve(self.post.uuid)
+
+        with django_assert_num_queries(1):
+            refs = post_resolver.resolve_many(
+                [self.post.uuid, other_post.uuid, uuid.uuid4()]
+            )
+
+        assert refs == {
+            self.post.uuid: PostRef(pk=self.post.pk),
+            other_post.uuid: PostRef(pk=other_post.pk),
+        }
+
+    def test_instance_has_resolved_fields(self, django_assert_num_queries):
+        user = UserPublicFactory()
+        root = CommentFactory(post=self.post, user=user)
+        reply = CommentFactory(post=self.post, user=user, parent=root)
+        reply.refresh_from_db()
+
+        with django_assert_num_queries(1):
+            instance = comment_resolver.get_instance(reply.uuid)
+            assert (instance.pk, instance.uuid, instance.post_id) == (
+                reply.pk,
+                reply.uuid,
+                self.post.pk,
+            )
+            assert (instance.tree_id, instance.level, instance.path) == (
+                reply.tree_id,
+                reply.level,
+                reply.path,
+            )
+        assert instance.get_deferred_fields() >= {"content", "user_id"}
+
+    def test_deleted_object_is_forgotten(self):
+        post_resolver.resolve(self.post.uuid)
+
+        self.post.delete()
+
+        assert post_resolver.resolve(self.post.uuid) is None
+
+    def test_changed_object_is_forgotten(self, django_assert_num_queries):
+        user = UserPublicFactory()
+        comment = CommentFactory(post=self.post, user=user)
+        comment_resolver.resolve(comment.uuid)
+
+        comment.content = "changed"
+        comment.save(update_fields=["content"])
+        with django_assert_num_queries(0):
+            comment_resolver.resolve(comment.uuid)
+
+        comment.post = PostFactory()
+        comment.save()
+        with django_assert_num_queries(1):
+            ref = comment_resolver.resolve(comment.uuid)
+        assert ref == CommentRef(
+            pk=comment.pk,
+            post_id=comment.post_id,
+            tree_id=comment.tree_id,
+            level=comment.level,
+            path=comment.path,
+        )
+
+
+@pytest.mark.django_db
+def test_reply_is_created_without_lookups_of_resolved_uuids(authed_api_client):
+    user = UserPublicFactory()
+    post = PostFactory()
+    parent = CommentFactory(post=post, user=user)
+    client = authed_api_client(user)
+    url = reverse("v1:comments:comments-list")
+    client.post(url, data={"post": post.uuid, "parent": parent.uuid, "content": "1"})
+
+    with CaptureQueriesContext(connection) as queries:
+        result = client.post(
+            url, data={"post": post.uuid, "parent": parent.uuid, "content": "2"}
+        )
+
+    assert result.status_code == status.HTTP_201_CREATED, result.content.decode()
+    assert not [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith("SELECT") and "uuid" in query["sql"].split("WHERE")[-1]
+    ]
@@ -0,0 +1,37 @@
+from rest_framework import serializers
+
+from communities.choices import CommunityFeedSort
+from communities.models import Community
+from users.choices import UserCommunityStatus
+
+
+class CommunityHeaderSerializer(serializers.ModelSerializer):
+    """Serializer to represent community above its feed."""
+
+    class Meta:
+        model = Community
+        fields = (
+            "name",
+            "slug",
+            "avatar",
+            "description",
+            "status",
+            "subscribers_count",
+            "members_count",
+        )
+
+
+class CommunityPostsQuerySerializer(serializers.Serializer):
+    """Serializer to validate query parameters of community feed."""
+
+    sort = serializers.ChoiceField(
+        choices=CommunityFeedSort.choices, default=CommunityFeedSort.NEW
+    )
+
+
+class CommunitySubscriptionSerializer(serializers.Serializer):
+    """Serializer to validate subscription to the community."""
+
+    status = serializers.ChoiceField(
+        choices=UserCommunityStatus.choices, default=UserCommunityStatus.SUBSCRIBED
+    )
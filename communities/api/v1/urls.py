@@ -0,0 +1,10 @@
+from rest_framework.routers import SimpleRouter
+
+from communities.api.v1 import views
+
+app_name = "communities"
+
+router = SimpleRouter()
+router.register("", views.CommunityViewSet, basename="communities")
+
+urlpatterns = router.urls
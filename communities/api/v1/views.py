@@ -0,0 +1,100 @@
+from django.http import Http404
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from common.api.pagination import KeysetPagination
+from common.api.parameters import COMMUNITY_FEED_SORT
+from common.api.response_cache import AnonymousResponseCacheMixin
+from communities.api.serializers import (
+    CommunityHeaderSerializer,
+    CommunityPostsQuerySerializer,
+    CommunitySubscriptionSerializer,
+)
+from communities.models import Community
+from communities.selectors import (
+    fetch_community_posts,
+    get_community_cache_version_key,
+    get_community_header,
+)
+from communities.services import subscribe_to_community, unsubscribe_from_community
+from posts.api.mixins import ViewerFiltersMixin
+from posts.api.serializers import PostListSerializer
+from posts.filters import PostFilter
+from posts.selectors import POSTS_FEEDS_CACHE_VERSION_KEY, defer_post_content
+
+
+class CommunityViewSet(AnonymousResponseCacheMixin, ViewerFiltersMixin, GenericViewSet):
+    """Viewset to provide community header, its feeds and subscriptions."""
+
+    anonymous_cache_actions = ("retrieve", "posts")
+
+    serializer_class = CommunityHeaderSerializer
+    pagination_class = KeysetPagination
+    filterset_class = PostFilter
+    lookup_field = "slug"
+
+    def get_cache_version_keys(self, **kwargs) -> list[str]:
+        """Return versions of the community header and of cached posts feeds."""
+        return [
+            get_community_cache_version_key(kwargs[self.lookup_field]),
+            POSTS_FEEDS_CACHE_VERSION_KEY,
+        ]
+
+    def get_permissions(self):
+        """Return proper permissions based on action user performing."""
+        if self.action == "subscription":
+            return [IsAuthenticated()]
+        return [AllowAny()]
+
+    def get_object(self) -> Community:
+        """Return cached community header instead of querying the database."""
+        community = get_community_header(self.kwargs[self.lookup_field])
+        if community is None:
+            raise Http404
+        return community
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return community header."""
+        return Response(self.get_serializer(self.get_object()).data)
+
+    @extend_schema(
+        parameters=[COMMUNITY_FEED_SORT], responses=PostListSerializer(many=True)
+    )
+    @action(methods=["GET"], detail=True)
+    def posts(self, request, *args, **kwargs):
+        """Return community header with page of its newest or top posts."""
+        community = self.get_object()
+        query_serializer = CommunityPostsQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        queryset = fetch_community_posts(
+            community, query_serializer.validated_data["sort"]
+        )
+        queryset = defer_post_content(self.filter_queryset(queryset))
+
+        page = self.paginate_queryset(queryset)
+        serializer = PostListSerializer(
+            page, many=True, context=self.get_serializer_context()
+        )
+        response = self.get_paginated_response(serializer.data)
+        response.data["community"] = self.get_serializer(community).data
+        return response
+
+    @extend_schema(request=CommunitySubscriptionSerializer, responses={204: None})
+    @action(methods=["POST", "DELETE"], detail=True)
+    def subscription(self, request, *args, **kwargs):
+        """Subscribe to the community, join it or leave it."""
+        community = self.get_object()
+        if request.method == "DELETE":
+            unsubscribe_from_community(community, request.user)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        serializer = CommunitySubscriptionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        subscribe_to_community(
+            community, request.user, serializer.validated_data["status"]
+        )
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -4,3 +4,8 @@ from django.db import models
 class CommunityStatus(models.TextChoices):
     OPEN = "O", "Open"
     CLOSED = "C", "Closed"
+
+
+class CommunityFeedSort(models.TextChoices):
+    NEW = "new", "New"
+    TOP = "top", "Top"
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("communities", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="community",
+            name="members_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="community",
+            name="subscribers_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -28,3 +28,5 @@ class Community(Timestamped):
     status = models.CharField(
         max_length=1, choices=CommunityStatus.choices, default=CommunityStatus.OPEN
     )
+    subscribers_count = models.PositiveIntegerField(default=0)
+    members_count = models.PositiveIntegerField(default=0)
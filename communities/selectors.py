@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, QuerySet
+
+from common.reconciliation import CounterSource
+from communities.choices import CommunityFeedSort
+from communities.models import Community
+from posts.choices import PostStatus
+from posts.models import Post
+from users.choices import UserCommunityStatus
+from users.models import UserCommunity
+
+COMMUNITY_COUNTER_FIELDS = ("subscribers_count", "members_count")
+
+# Rows each of ``COMMUNITY_COUNTER_FIELDS`` is calculated from
+COMMUNITY_COUNTER_SOURCES = [
+    CounterSource(
+        UserCommunity.objects.all(),
+        "community",
+        {
+            "subscribers_count": Count(
+                "pk", filter=Q(status=UserCommunityStatus.SUBSCRIBED)
+            ),
+            "members_count": Count("pk", filter=Q(status=UserCommunityStatus.JOINED)),
+        },
+    ),
+]
+
+COMMUNITY_HEADER_FIELDS = (
+    "id",
+    "name",
+    "slug",
+    "avatar",
+    "description",
+    "status",
+    *COMMUNITY_COUNTER_FIELDS,
+)
+
+COMMUNITY_FEED_ORDERING = {
+    CommunityFeedSort.NEW: ("-published_at", "-id"),
+    CommunityFeedSort.TOP: ("-rating", "-id"),
+}
+
+
+def get_community_header_cache_key(slug: str) -> str:
+    return f"communities:header:{slug}"
+
+
+def get_community_cache_version_key(slug: str) -> str:
+    """Return key of the version of cached responses with the community header."""
+    return f"communities:community-version:{slug}"
+
+
+def get_community_header(slug: str) -> Community | None:
+    """Get community with fields shown above its feed.
+
+    Header is cached for ``COMMUNITY_HEADER_CACHE_SECONDS``, so feed requests don't
+    hit communities table, counters in it may lag behind for that long.
+    """
+    cache_key = get_community_header_cache_key(slug)
+    if (cached := cache.get(cache_key)) is not None:
+        return cached
+
+    community = Community.objects.only(*COMMUNITY_HEADER_FIELDS).filter(slug=slug).first()
+    if community:
+        cache.set(cache_key, community, settings.COMMUNITY_HEADER_CACHE_SECONDS)
+    return community
+
+
+def fetch_community_posts(
+    community: Community, sort: CommunityFeedSort = CommunityFeedSort.NEW
+) -> QuerySet[Post]:
+    """Fetch published posts of the community.
+
+    Both orderings are served by partial indexes on published posts of the community,
+    so pages are read with index range scan no matter how big the community is.
+    """
+    return (
+        Post.objects.filter(community_id=community.pk, status=PostStatus.PUBLISHED)
+        .order_by(*COMMUNITY_FEED_ORDERING[sort])
+        .select_related("user", "community")
+    )
@@ -0,0 +1,82 @@
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from common.cache import bump_cache_version
+from communities.models import Community
+from communities.selectors import (
+    get_community_cache_version_key,
+    get_community_header_cache_key,
+)
+from users.choices import UserCommunityStatus
+from users.models import UserCommunity, UserPublic
+
+logger = logging.getLogger(__name__)
+
+COMMUNITY_STATUS_COUNTER_FIELDS = {
+    UserCommunityStatus.SUBSCRIBED: "subscribers_count",
+    UserCommunityStatus.JOINED: "members_count",
+}
+
+
+def _update_community_counters(community: Community, deltas: dict[str, int]):
+    deltas = {field_name: delta for field_name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    Community.objects.filter(pk=community.pk).update(
+        **{field_name: F(field_name) + delta for field_name, delta in deltas.items()}
+    )
+    community.refresh_from_db(fields=list(deltas))
+
+
+def invalidate_community_header(community: Community):
+    """Drop cached header of the community and responses showing it."""
+    cache.delete(get_community_header_cache_key(community.slug))
+    bump_cache_version(get_community_cache_version_key(community.slug))
+
+
+@transaction.atomic
+def subscribe_to_community(
+    community: Community,
+    actor: UserPublic,
+    status: UserCommunityStatus = UserCommunityStatus.SUBSCRIBED,
+) -> UserCommunity:
+    """Subscribe user to the community or join it, keeping its counters in sync."""
+    status = UserCommunityStatus(status)
+    # Community row is locked, so concurrent requests of the same user can't create
+    # duplicate subscriptions or lose counter updates.
+    Community.objects.select_for_update().filter(pk=community.pk).first()
+    user_community = UserCommunity.objects.filter(user=actor, community=community).first()
+    if user_community and user_community.status == status:
+        return user_community
+
+    deltas = {COMMUNITY_STATUS_COUNTER_FIELDS[status]: 1}
+    if user_community:
+        deltas[COMMUNITY_STATUS_COUNTER_FIELDS[user_community.status]] = -1
+        user_community.status = status
+        user_community.save(update_fields=["status", "updated_at"])
+    else:
+        user_community = UserCommunity.objects.create(
+            user=actor, community=community, status=status
+        )
+    logger.info("User %s %s community %s", actor, status.label.lower(), community)
+    _update_community_counters(community, deltas)
+    transaction.on_commit(lambda: invalidate_community_header(community))
+    return user_community
+
+
+@transaction.atomic
+def unsubscribe_from_community(community: Community, actor: UserPublic):
+    """Remove user's subscription to the community or membership in it."""
+    Community.objects.select_for_update().filter(pk=community.pk).first()
+    user_community = UserCommunity.objects.filter(user=actor, community=community).first()
+    if not user_community:
+        return
+
+    user_community.delete()
+    logger.info("User %s left community %s", actor, community)
+    field_name = COMMUNITY_STATUS_COUNTER_FIELDS[user_community.status]
+    _update_community_counters(community, {field_name: -1})
+    transaction.on_commit(lambda: invalidate_community_header(community))
@@ -0,0 +1,127 @@
+import datetime
+import uuid
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from communities.models import Community
+from communities.services import subscribe_to_community
+from communities.tests.factories import CommunityFactory
+from posts.choices import PostStatus
+from posts.tests.factories import PostFactory
+from users.choices import UserCommunityStatus
+from users.models import UserCommunity
+from users.tests.factories import UserPublicFactory
+
+
+@pytest.mark.django_db
+class TestCommunityFeed:
+    def setup(self):
+        self.community = CommunityFactory()
+        now = timezone.now()
+        self.posts = [
+            PostFactory(
+                community=self.community,
+                status=PostStatus.PUBLISHED,
+                published_at=now - datetime.timedelta(hours=hours),
+                rating=rating,
+            )
+            for hours, rating in ((3, 5), (1, 1), (2, 10))
+        ]
+        PostFactory(community=self.community, status=PostStatus.DRAFT)
+        PostFactory(community=CommunityFactory(), status=PostStatus.PUBLISHED)
+
+    def test_new_posts(self, anon_api_client):
+        result = anon_api_client().get(self._url("posts"))
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        assert self._uuids(result) == [
+            self.posts[1].uuid,
+            self.posts[2].uuid,
+            self.posts[0].uuid,
+        ]
+        assert result.data["community"]["slug"] == self.community.slug
+
+    def test_top_posts(self, anon_api_client):
+        result = anon_api_client().get(self._url("posts"), {"sort": "top"})
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        assert self._uuids(result) == [
+            self.posts[2].uuid,
+            self.posts[0].uuid,
+            self.posts[1].uuid,
+        ]
+
+    def test_feed_reads_cached_header(self, anon_api_client, settings):
+        settings.ANONYMOUS_CACHE_SECONDS = 0
+        client = anon_api_client()
+        client.get(self._url())
+
+        with CaptureQueriesContext(connection) as queries:
+            result = client.get(self._url("posts"))
+
+        assert result.status_code == status.HTTP_200_OK
+        # just the page of posts
+        assert len(queries) == 1
+
+    def test_unknown_community(self, anon_api_client):
+        result = anon_api_client().get(
+            reverse("v1:communities:communities-posts", kwargs={"slug": "unknown"})
+        )
+        assert result.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_subscription_counters(
+        self, authed_api_client, django_capture_on_commit_callbacks
+    ):
+        user = UserPublicFactory()
+        client = authed_api_client(user)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post(self._url("subscription"))
+        self._assert_counters(subscribers_count=1, members_count=0)
+        result = client.get(self._url())
+        assert result.data["subscribers_count"] == 1
+
+        client.post(self._url("subscription"), {"status": UserCommunityStatus.JOINED})
+        self._assert_counters(subscribers_count=0, members_count=1)
+        assert UserCommunity.objects.filter(user=user).count() == 1
+
+        for _ in range(2):
+            result = client.delete(self._url("subscription"))
+            assert result.status_code == status.HTTP_204_NO_CONTENT
+        self._assert_counters(subscribers_count=0, members_count=0)
+        assert not UserCommunity.objects.filter(user=user).exists()
+
+    def test_subscription_invalidates_cached_header(
+        self, anon_api_client, django_capture_on_commit_callbacks
+    ):
+        anon_client = anon_api_client()
+        anon_client.get(self._url())
+        anon_client.get(self._url("posts"))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            subscribe_to_community(self.community, UserPublicFactory())
+
+        assert anon_client.get(self._url()).json()["subscribers_count"] == 1
+        result = anon_client.get(self._url("posts"))
+        assert result.json()["community"]["subscribers_count"] == 1
+
+    def test_cant_subscribe_as_anonymous(self, anon_api_client):
+        result = anon_api_client().post(self._url("subscription"))
+        assert result.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def _assert_counters(self, **counters):
+        community = Community.objects.get(pk=self.community.pk)
+        assert {name: getattr(community, name) for name in counters} == counters
+
+    def _url(self, action="detail"):
+        return reverse(
+            f"v1:communities:communities-{action}", kwargs={"slug": self.community.slug}
+        )
+
+    def _uuids(self, result):
+        return [uuid.UUID(post["uuid"]) for post in result.data["results"]]
@@ -0,0 +1,12 @@
+import factory
+from factory.django import DjangoModelFactory
+
+from users.tests.factories import UserPublicFactory
+
+
+class CommunityFactory(DjangoModelFactory):
+    name = factory.Sequence(lambda n: f"community {n}")
+    owner = factory.SubFactory(UserPublicFactory)
+
+    class Meta:
+        model = "communities.Community"
@@ -1,8 +1,15 @@
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import AccessToken
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with empty cache, so no data leaks from other tests."""
+    cache.clear()
+
+
 @pytest.fixture()
 def api_client():
     """Fixture to be used when need DRF's APIClient."""
@@ -46,6 +46,7 @@ KAPIBARA_APPS = [
     "posts",
     "communities",
     "comments",
+    "votes",
     "core_app.apps.KapibaraAdminConfig",
 ]
 
@@ -91,6 +92,8 @@ WSGI_APPLICATION = "core_app.wsgi.application"
 
 DATABASES = {"default": env.db()}
 
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",  # noqa: E501
@@ -151,7 +154,7 @@ REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 100,
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_SCHEMA_CLASS": "common.api.schema.AutoSchema",
     "DATETIME_FORMAT": "%Y-%m-%dT%H:%M:%S%z",
 }
 
@@ -186,11 +189,54 @@ LOADTEST_PASSWORD = env.str("LOADTEST_PASSWORD", "testpassword")
 
 COMMENTS_EDITABLE_WINDOW_MINUTES = env.int("COMMENTS_EDITABLE_WINDOW_MINUTES", 2)
 COMMENTS_TREE_DEFAULT_LEVEL = env.int("COMMENTS_TREE_DEFAULT_LEVEL", 2)
+# root comments per page, and total number of comments per response with their replies
+COMMENTS_PAGE_SIZE = env.int("COMMENTS_PAGE_SIZE", 50)
+COMMENTS_TREE_MAX_NODES = env.int("COMMENTS_TREE_MAX_NODES", 500)
+COMMENTS_TREE_CACHE_SECONDS = env.int("COMMENTS_TREE_CACHE_SECONDS", 300)
+# "mptt" nested sets or "path" materialized paths, see comments.tree_storage
+COMMENTS_TREE_STORAGE = env.str("COMMENTS_TREE_STORAGE", "mptt")
 COMMENT_RATING_MULTIPLIER = env.float("COMMENT_RATING_MULTIPLIER", 0.5)
 
 POST_RATING_MULTIPLIER = env.float("POST_RATING_MULTIPLIER", 1)
 POST_EDITABLE_WINDOW_MINUTES = env.int("POST_EDITABLE_WINDOW_MINUTES", 20)
 
+# When enabled, rating and votes counters are buffered in process memory and written
+# in batches every COUNTERS_FLUSH_INTERVAL_SECONDS instead of on every vote.
+COUNTERS_WRITE_BEHIND = env.bool("COUNTERS_WRITE_BEHIND", False)
+COUNTERS_FLUSH_INTERVAL_SECONDS = env.float("COUNTERS_FLUSH_INTERVAL_SECONDS", 5)
+# deltas of the row which failed to flush that many times are dropped, and its counters
+# are left for reconcile_counters command to fix
+COUNTERS_FLUSH_MAX_ATTEMPTS = env.int("COUNTERS_FLUSH_MAX_ATTEMPTS", 5)
+VOTES_BATCH_MAX_SIZE = env.int("VOTES_BATCH_MAX_SIZE", 500)
+VOTE_EVENTS_PARTITIONS_DAYS_AHEAD = env.int("VOTE_EVENTS_PARTITIONS_DAYS_AHEAD", 7)
+VOTE_EVENTS_RETENTION_DAYS = env.int("VOTE_EVENTS_RETENTION_DAYS", 90)
+TOP_POSTS_LEADERBOARD_SIZE = env.int("TOP_POSTS_LEADERBOARD_SIZE", 1000)
+# how fast hot score of the post decays with its age in hours
+HOT_POSTS_GRAVITY = env.float("HOT_POSTS_GRAVITY", 1.8)
+# hot scores are recalculated only for posts published within that many days
+HOT_POSTS_WINDOW_DAYS = env.int("HOT_POSTS_WINDOW_DAYS", 7)
+# comments velocity of the post halves every that many hours without new comments
+COMMENTS_VELOCITY_HALF_LIFE_HOURS = env.float("COMMENTS_VELOCITY_HALF_LIFE_HOURS", 6)
+# posts of authors with more followers are not copied to followers timelines, but
+# merged into their home feed on read
+TIMELINE_FANOUT_MAX_FOLLOWERS = env.int("TIMELINE_FANOUT_MAX_FOLLOWERS", 10000)
+# published post is delivered to timelines of that many subscribers per statement
+TIMELINE_FANOUT_BATCH_SIZE = env.int("TIMELINE_FANOUT_BATCH_SIZE", 1000)
+TIMELINE_RETENTION_DAYS = env.int("TIMELINE_RETENTION_DAYS", 30)
+VIEWER_FILTERS_CACHE_SECONDS = env.int("VIEWER_FILTERS_CACHE_SECONDS", 300)
+# for how long responses to anonymous users are cached, 0 to disable
+ANONYMOUS_CACHE_SECONDS = env.int("ANONYMOUS_CACHE_SECONDS", 30)
+COMMUNITY_HEADER_CACHE_SECONDS = env.int("COMMUNITY_HEADER_CACHE_SECONDS", 60)
+# primary keys and other immutable fields of posts and comments resolved by UUID
+UUID_RESOLVER_CACHE_SECONDS = env.int("UUID_RESOLVER_CACHE_SECONDS", 86400)
+# "postgres" reaches viewers in all processes, "local" only ones in the same process,
+# see common.pubsub
+PUBSUB_BACKEND = env.str("PUBSUB_BACKEND", "postgres")
+# live updates of the post, see posts.api.v1.streams
+POST_EVENTS_STREAM_SECONDS = env.int("POST_EVENTS_STREAM_SECONDS", 300)
+POST_EVENTS_HEARTBEAT_SECONDS = env.int("POST_EVENTS_HEARTBEAT_SECONDS", 15)
+POST_EVENTS_RETRY_MILLISECONDS = env.int("POST_EVENTS_RETRY_MILLISECONDS", 3000)
+
 
 # Storages config
 if USE_CLOUD_STORAGE := env.bool("USE_CLOUD_STORAGE", False):
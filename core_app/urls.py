@@ -29,8 +29,10 @@ v1_urls = [
         name="redoc",
     ),
     path("comments/", include("comments.api.v1.urls", namespace="comments")),
+    path("communities/", include("communities.api.v1.urls", namespace="communities")),
     path("posts/", include("posts.api.v1.urls", namespace="posts")),
     path("users/", include("users.api.v1.urls", namespace="users")),
+    path("votes/", include("votes.api.v1.urls", namespace="votes")),
 ]
 
 urlpatterns = [
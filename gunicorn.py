@@ -12,3 +12,29 @@ accesslog = "-"
 errorlog = "-"
 
 worker_tmp_dir = "/dev/shm"
+
+
+def on_starting(server):
+    """Make sure all workers see the same cache before starting them."""
+    import os
+
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core_app.settings")
+    django.setup()
+    from django.core.exceptions import ImproperlyConfigured
+
+    from common.cache import check_cache_is_shared
+
+    try:
+        check_cache_is_shared(server.cfg.workers)
+    except ImproperlyConfigured as e:
+        # gunicorn stops with the error message on RuntimeError only
+        raise RuntimeError(str(e)) from e
+
+
+def worker_exit(server, worker):
+    """Write buffered counters to the database before worker shuts down."""
+    from common.counters import counter_buffer
+
+    counter_buffer.flush()
@@ -0,0 +1,21 @@
+from functools import partial
+
+from django.utils.functional import cached_property
+
+from posts.selectors import is_post_visible
+from users.selectors import ViewerFilters, get_viewer_filters
+
+
+class ViewerFiltersMixin:
+    """Hide posts of authors blocked and with tags ignored by the viewer."""
+
+    @cached_property
+    def viewer_filters(self) -> ViewerFilters:
+        """Authors and tags hidden by the viewer, loaded once per request."""
+        return get_viewer_filters(self.request.user)
+
+    def get_page_item_filter(self):
+        """Return filter of posts hidden by the viewer, used by pagination."""
+        if not any(self.viewer_filters):
+            return None
+        return partial(is_post_visible, viewer_filters=self.viewer_filters)
@@ -1,17 +1,28 @@
 from rest_framework import serializers
 
 from common.api.fields import WritableSlugRelatedField
+from common.api.fieldsets import SparseFieldsetSerializerMixin
+from common.api.viewer_context import ViewerContextListSerializer, get_viewer_context
+from posts.choices import TopPostsWindow
 from posts.models import Post, PostVote, Tag
-from posts.selectors import can_edit_post
-from users.api.serializers import UserPublicMinimalSerializer
+from posts.selectors import can_edit_post, get_bookmarked_posts, get_post_votes_values
+from users.api.serializers import AuthorViewerContextMixin, UserPublicMinimalSerializer
+from users.selectors import get_user_relations_statuses, get_users_with_notes
 
 
-class PostSerializer(serializers.ModelSerializer):
-    """Serializer to represent Post instance."""
+class PostSerializer(
+    SparseFieldsetSerializerMixin, AuthorViewerContextMixin, serializers.ModelSerializer
+):
+    """Serializer to represent Post instance, or only fields asked by the client."""
 
     author = UserPublicMinimalSerializer(source="user")
-    tags = serializers.SlugRelatedField("name", many=True, read_only=True)
+    tags = serializers.ListField(
+        source="tag_names", child=serializers.CharField(), read_only=True
+    )
     can_edit = serializers.SerializerMethodField()
+    viewer = serializers.SerializerMethodField()
+
+    viewer_context_prefix = "post"
 
     class Meta:
         model = Post
@@ -32,13 +43,52 @@ class PostSerializer(serializers.ModelSerializer):
             "status",
             "published_at",
             "can_edit",
+            "viewer",
         )
+        list_serializer_class = ViewerContextListSerializer
+        sparse_field_sources = {
+            "can_edit": ("user", "status", "published_at"),
+            "viewer": ("user",),
+        }
 
     def get_can_edit(self, obj: Post):
         request = self.context.get("request")
         user = request and request.user
         return can_edit_post(user, obj)
 
+    def load_viewer_context(self, posts: list[Post]):
+        """Load viewer's votes, bookmarks and relations to authors for all posts."""
+        viewer_context = get_viewer_context(self.context)
+        post_ids = {post.pk for post in posts}
+        viewer_context.load("post_votes", post_ids, get_post_votes_values)
+        viewer_context.load("post_bookmarks", post_ids, get_bookmarked_posts)
+        author_ids = {post.user_id for post in posts}
+        viewer_context.load(
+            "post_author_relations", author_ids, get_user_relations_statuses
+        )
+        viewer_context.load("post_author_notes", author_ids, get_users_with_notes)
+
+    def get_viewer(self, obj: Post) -> dict:
+        """Get viewer's vote for the post, bookmark and relation to its author."""
+        self.load_viewer_context([obj])
+        viewer_context = get_viewer_context(self.context)
+        return {
+            "vote": viewer_context.get("post_votes", obj.pk),
+            "bookmarked": viewer_context.get("post_bookmarks", obj.pk, False),
+            **self.get_author_viewer_context(obj),
+        }
+
+
+class PostListSerializer(PostSerializer):
+    """Serializer to represent Post in feeds, with excerpt instead of full content."""
+
+    class Meta(PostSerializer.Meta):
+        fields = tuple(
+            field_name
+            for field_name in PostSerializer.Meta.fields
+            if field_name != "content"
+        ) + ("excerpt", "cover_image", "reading_time_minutes")
+
 
 class PostRatingOnlySerializer(serializers.ModelSerializer):
     """Serializer to return only rating related data."""
@@ -94,3 +144,11 @@ class PostVoteCreateSerializer(serializers.ModelSerializer):
             "user",
             "value",
         )
+
+
+class TopPostsQuerySerializer(serializers.Serializer):
+    """Serializer to validate query parameters of top posts."""
+
+    window = serializers.ChoiceField(
+        choices=TopPostsWindow.choices, default=TopPostsWindow.DAY
+    )
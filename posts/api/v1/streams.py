@@ -0,0 +1,60 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import (
+    Http404,
+    HttpResponseNotAllowed,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+
+from common.pubsub import get_pubsub
+from posts.events import get_post_events_channel
+from posts.selectors import fetch_new_posts
+
+
+async def post_events_stream(request, uuid):
+    """Stream new comments and rating changes of the post as server-sent events.
+
+    Viewer keeps single connection open instead of polling comments. Stream ends
+    after ``POST_EVENTS_STREAM_SECONDS``, browsers reconnect to it automatically.
+    Only ASGI server streams events as they come, WSGI one would collect the whole
+    stream first and hold its worker meanwhile, so stream is refused there.
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "Live updates are served by ASGI server only"}, status=501
+        )
+    post_id = await (
+        fetch_new_posts().filter(uuid=uuid).values_list("pk", flat=True).afirst()
+    )
+    if post_id is None:
+        raise Http404
+    return StreamingHttpResponse(
+        iter_post_events(post_id),
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def iter_post_events(post_id: int) -> AsyncIterator[str]:
+    """Yield events of the post in server-sent events format, with heartbeats."""
+    loop = asyncio.get_running_loop()
+    ends_at = loop.time() + settings.POST_EVENTS_STREAM_SECONDS
+    channel = get_post_events_channel(post_id)
+    async with get_pubsub().subscribe(channel) as subscription:
+        yield f"retry: {settings.POST_EVENTS_RETRY_MILLISECONDS}\n\n"
+        while (remaining := ends_at - loop.time()) > 0:
+            message = await subscription.get(
+                min(settings.POST_EVENTS_HEARTBEAT_SECONDS, remaining)
+            )
+            if message is None:
+                # comment line keeps proxies from closing idle connection
+                yield ": heartbeat\n\n"
+                continue
+            yield f"event: {message['event']}\ndata: {json.dumps(message['data'])}\n\n"
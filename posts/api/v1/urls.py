@@ -1,6 +1,7 @@
+from django.urls import path
 from rest_framework.routers import SimpleRouter
 
-from posts.api.v1 import views
+from posts.api.v1 import streams, views
 
 app_name = "posts"
 
@@ -8,4 +9,7 @@ router = SimpleRouter()
 router.register("my", views.MyPostsViewSet, basename="my-posts")
 router.register("", views.PostViewSet, basename="posts")
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("<uuid:uuid>/events/", streams.post_events_stream, name="posts-events"),
+    *router.urls,
+]
@@ -1,3 +1,4 @@
+from drf_spectacular.utils import extend_schema
 from rest_access_policy import AccessViewSetMixin
 from rest_framework import status
 from rest_framework.decorators import action
@@ -5,35 +6,68 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 
+from common.api.fieldsets import SparseFieldsetViewMixin
+from common.api.pagination import KeysetPagination
+from common.api.parameters import TOP_POSTS_WINDOW
+from common.api.response_cache import AnonymousResponseCacheMixin
+from common.counters import counter_buffer
+from posts.api.mixins import ViewerFiltersMixin
 from posts.api.permissions import Poster, PostVoter
 from posts.api.policies import OwnPostAccessPolicy
 from posts.api.serializers import (
     PostCreateSerializer,
+    PostListSerializer,
     PostRatingOnlySerializer,
     PostSerializer,
     PostVoteCreateSerializer,
+    TopPostsQuerySerializer,
 )
+from posts.filters import PostFilter
 from posts.models import Post
-from posts.selectors import fetch_new_posts, fetch_user_posts
-from posts.services import delete_post, publish_post, record_vote_for_post
+from posts.selectors import (
+    POSTS_FEEDS_CACHE_VERSION_KEY,
+    defer_post_content,
+    fetch_active_posts,
+    fetch_bookmarked_posts,
+    fetch_discussed_posts,
+    fetch_home_posts,
+    fetch_new_posts,
+    fetch_popular_posts,
+    fetch_top_posts,
+    fetch_user_posts,
+    get_post_cache_version_key,
+)
+from posts.services import (
+    bookmark_post,
+    delete_post,
+    publish_post,
+    record_vote_for_post,
+    unbookmark_post,
+)
 
 
-class MyPostsViewSet(AccessViewSetMixin, ModelViewSet):
+class MyPostsViewSet(AccessViewSetMixin, SparseFieldsetViewMixin, ModelViewSet):
     """API view to return all posts of the user and to allow to manage them."""
 
     serializer_class = PostSerializer
     access_policy = OwnPostAccessPolicy
+    pagination_class = KeysetPagination
     lookup_field = "uuid"
     http_method_names = ["post", "get", "patch", "delete"]
 
     def get_queryset(self):
         """Return queryset with user posts."""
-        return fetch_user_posts(self.request.user)
+        queryset = fetch_user_posts(self.request.user)
+        if self.action == "list":
+            return defer_post_content(queryset)
+        return queryset
 
     def get_serializer_class(self):
         """Return proper serializer based on action user performing."""
         if self.action in ("create", "update", "partial_update"):
             return PostCreateSerializer
+        if self.action == "list":
+            return PostListSerializer
         return self.serializer_class
 
     @action(
@@ -51,20 +85,136 @@ class MyPostsViewSet(AccessViewSetMixin, ModelViewSet):
         delete_post(instance, self.request.user)
 
 
-class PostViewSet(ReadOnlyModelViewSet):
+class PostViewSet(
+    AnonymousResponseCacheMixin,
+    ViewerFiltersMixin,
+    SparseFieldsetViewMixin,
+    ReadOnlyModelViewSet,
+):
     """Viewset to provide API's needed to fetch posts."""
 
+    anonymous_cache_actions = (
+        "list",
+        "retrieve",
+        "popular",
+        "discussed",
+        "active",
+        "top",
+    )
+    # actions returning feeds of posts, which show excerpts instead of full content
+    list_actions = (
+        "list",
+        "feed",
+        "bookmarks",
+        "popular",
+        "discussed",
+        "active",
+        "top",
+    )
+
     queryset = fetch_new_posts()
     serializer_class = PostSerializer
     permission_classes = (IsAuthenticated & Poster,)
+    pagination_class = KeysetPagination
+    filterset_class = PostFilter
     lookup_field = "uuid"
+    # read by pagination to hide posts of blocked authors and with ignored tags
+    sparse_fieldset_required_fields = ("user", "tag_names")
+
+    def get_cache_version_keys(self, **kwargs) -> list[str]:
+        """Return versions of cached feeds, or of the post for detail responses."""
+        if uuid := kwargs.get(self.lookup_field):
+            return [get_post_cache_version_key(uuid)]
+        return [POSTS_FEEDS_CACHE_VERSION_KEY]
+
+    def get_serializer_class(self):
+        """Return serializer without full content for feeds."""
+        if self.action in self.list_actions:
+            return PostListSerializer
+        return self.serializer_class
+
+    def filter_queryset(self, queryset):
+        """Filter posts by query parameters, skip loading content for feeds."""
+        queryset = super().filter_queryset(queryset)
+        if self.action in self.list_actions:
+            return defer_post_content(queryset)
+        return queryset
 
     def get_permissions(self):
         """Return proper permissions based on action user performing."""
         if self.action == "vote":
             return super().get_permissions()
+        if self.action in ("feed", "bookmarks", "bookmark"):
+            return [IsAuthenticated()]
         return [AllowAny()]
 
+    @action(methods=["GET"], detail=False)
+    def feed(self, request, *args, **kwargs):
+        """Return home feed with posts from user's subscriptions."""
+        querysets = [
+            self.filter_queryset(queryset) for queryset in fetch_home_posts(request.user)
+        ]
+        page = self.paginate_queryset(querysets)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(methods=["GET"], detail=False)
+    def bookmarks(self, request, *args, **kwargs):
+        """Return posts bookmarked by the user."""
+        queryset = self.filter_queryset(fetch_bookmarked_posts(request.user))
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(request=None, responses={204: None})
+    @action(methods=["POST", "DELETE"], detail=True)
+    def bookmark(self, request, *args, **kwargs):
+        """Add the post to bookmarks or remove it from them."""
+        post = self.get_object()
+        if request.method == "DELETE":
+            unbookmark_post(post, request.user)
+        else:
+            bookmark_post(post, request.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(methods=["GET"], detail=False)
+    def popular(self, request, *args, **kwargs):
+        """Return posts which are hot at the moment."""
+        queryset = self.filter_queryset(fetch_popular_posts())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(methods=["GET"], detail=False)
+    def discussed(self, request, *args, **kwargs):
+        """Return posts which are being actively commented at the moment."""
+        queryset = self.filter_queryset(fetch_discussed_posts())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(methods=["GET"], detail=False)
+    def active(self, request, *args, **kwargs):
+        """Return posts with the most recent comments."""
+        queryset = self.filter_queryset(fetch_active_posts())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(parameters=[TOP_POSTS_WINDOW])
+    @action(methods=["GET"], detail=False)
+    def top(self, request, *args, **kwargs):
+        """Return posts with highest rating within the time window."""
+        query_serializer = TopPostsQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        queryset = self.filter_queryset(
+            fetch_top_posts(query_serializer.validated_data["window"])
+        )
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @action(
         methods=["POST"],
         detail=True,
@@ -77,7 +227,7 @@ class PostViewSet(ReadOnlyModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         record_vote_for_post(post, request.user, serializer.data["value"])
-        post.refresh_from_db()
+        counter_buffer.apply_pending(post)
 
         return Response(
             PostRatingOnlySerializer(post).data, status=status.HTTP_201_CREATED
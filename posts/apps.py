@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class PostsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "posts"
+
+    def ready(self):
+        from posts import signals  # noqa: F401
@@ -10,3 +10,10 @@ class PostStatus(models.TextChoices):
 class Vote(models.IntegerChoices):
     UPVOTE = 1
     DOWNVOTE = -1
+
+
+class TopPostsWindow(models.TextChoices):
+    DAY = "day", "Day"
+    WEEK = "week", "Week"
+    MONTH = "month", "Month"
+    ALL = "all", "All time"
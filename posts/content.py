@@ -0,0 +1,51 @@
+import math
+from collections.abc import Iterator
+
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+EXCERPT_MAX_LENGTH = 300
+WORDS_PER_MINUTE = 200
+IMAGE_BLOCK_TYPE = "image"
+
+
+def iter_content_blocks(content) -> Iterator[dict]:
+    """Iterate over blocks of post content, skipping malformed ones.
+
+    Plain text content is treated as single paragraph.
+    """
+    if isinstance(content, str):
+        yield {"type": "paragraph", "content": content}
+        return
+    if not isinstance(content, list):
+        return
+    for block in content:
+        if isinstance(block, dict) and isinstance(block.get("content"), str):
+            yield block
+
+
+def iter_content_texts(content) -> Iterator[str]:
+    """Iterate over plain texts of text blocks of post content."""
+    for block in iter_content_blocks(content):
+        if block.get("type") != IMAGE_BLOCK_TYPE:
+            yield strip_tags(block["content"]).strip()
+
+
+def get_content_excerpt(content, max_length: int = EXCERPT_MAX_LENGTH) -> str:
+    """Get beginning of post text to be shown in feeds."""
+    text = " ".join(text for text in iter_content_texts(content) if text)
+    return Truncator(text).chars(max_length)
+
+
+def get_content_cover_image(content) -> str:
+    """Get reference to the first image of post content, empty if there is none."""
+    for block in iter_content_blocks(content):
+        if block.get("type") == IMAGE_BLOCK_TYPE:
+            return block["content"]
+    return ""
+
+
+def get_content_reading_time_minutes(content) -> int:
+    """Estimate how many minutes it takes to read post content."""
+    words_count = sum(len(text.split()) for text in iter_content_texts(content))
+    return math.ceil(words_count / WORDS_PER_MINUTE)
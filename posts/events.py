@@ -0,0 +1,22 @@
+from django.db import transaction
+
+from common.pubsub import get_pubsub
+
+
+def get_post_events_channel(post_id: int) -> str:
+    """Return pub/sub channel of live updates of the post and its comments."""
+    return f"post:{post_id}:events"
+
+
+def publish_post_event(post_id: int, event: str, data: dict):
+    """Send event to viewers of the post, e.g. about new comment or vote."""
+    get_pubsub().publish(get_post_events_channel(post_id), {"event": event, "data": data})
+
+
+def publish_post_event_on_commit(post_id: int, event: str, data: dict):
+    """Send event to viewers of the post once current transaction is committed.
+
+    Event is only a hint for live updates, so failure to publish it is logged and
+    doesn't fail the request which made the change.
+    """
+    transaction.on_commit(lambda: publish_post_event(post_id, event, data), robust=True)
@@ -0,0 +1,23 @@
+from django_filters import rest_framework as filters
+
+from posts.models import Post
+from posts.selectors import filter_posts_by_tags
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
+
+
+class PostFilter(filters.FilterSet):
+    tag = CharInFilter(method="filter_by_tags", help_text="Posts with any of the tags.")
+    tag_all = CharInFilter(
+        method="filter_by_tags", help_text="Posts with all of the tags."
+    )
+
+    class Meta:
+        model = Post
+        fields = ("tag", "tag_all")
+
+    def filter_by_tags(self, queryset, name, value):
+        """Filter posts by comma separated tag names."""
+        return filter_posts_by_tags(queryset, value, match_all=name == "tag_all")
@@ -0,0 +1,10 @@
+from common.commands import PeriodicCommand
+from posts.services import decay_comments_velocity
+
+
+class Command(PeriodicCommand):
+    help = "Decay comments velocity of the posts used to order discussed posts."
+
+    def handle_once(self, *args, **options):
+        updated = decay_comments_velocity()
+        self.stdout.write(f"Decayed comments velocity of {updated} posts")
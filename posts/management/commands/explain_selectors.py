@@ -0,0 +1,201 @@
+import json
+from collections.abc import Callable
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import QuerySet
+
+from comments.models import Comment
+from comments.selectors import get_children_comments, get_comments_root_nodes_qs
+from common.api.pagination import KeysetPagination
+from common.explain import explain_queryset
+from communities.choices import CommunityFeedSort
+from communities.models import Community
+from communities.selectors import fetch_community_posts
+from posts.choices import TopPostsWindow
+from posts.models import Post
+from posts.selectors import (
+    defer_post_content,
+    fetch_active_posts,
+    fetch_bookmarked_posts,
+    fetch_discussed_posts,
+    fetch_draft_posts,
+    fetch_home_posts,
+    fetch_new_posts,
+    fetch_popular_posts,
+    fetch_top_posts,
+    fetch_user_posts,
+)
+from users.models import UserPublic
+from users.selectors import fetch_active_relations
+
+
+class SampleObjects(NamedTuple):
+    """Objects selectors are called for, the busiest ones to get the worst plans."""
+
+    user: UserPublic | None
+    post: Post | None
+    comment: Comment | None
+    community: Community | None
+
+
+def _feed(queryset: QuerySet) -> QuerySet:
+    return defer_post_content(queryset)[: settings.REST_FRAMEWORK["PAGE_SIZE"] + 1]
+
+
+def _merged_feed(querysets: list[QuerySet]) -> QuerySet:
+    return KeysetPagination().fetch_after(
+        [defer_post_content(queryset) for queryset in querysets],
+        None,
+        settings.REST_FRAMEWORK["PAGE_SIZE"] + 1,
+    )
+
+
+# selector name and function building its queryset, exactly the way API runs it
+SELECTORS: dict[str, Callable[[SampleObjects], QuerySet | None]] = {
+    "fetch_new_posts": lambda sample: _feed(fetch_new_posts()),
+    "fetch_draft_posts": lambda sample: _feed(fetch_draft_posts()),
+    "fetch_popular_posts": lambda sample: _feed(fetch_popular_posts()),
+    "fetch_discussed_posts": lambda sample: _feed(fetch_discussed_posts()),
+    "fetch_active_posts": lambda sample: _feed(fetch_active_posts()),
+    **{
+        f"fetch_top_posts[{window}]": (
+            lambda sample, window=window: _feed(fetch_top_posts(window))
+        )
+        for window in TopPostsWindow
+    },
+    "fetch_user_posts": (
+        lambda sample: sample.user and _feed(fetch_user_posts(sample.user))
+    ),
+    "fetch_home_posts": (
+        lambda sample: sample.user and _merged_feed(fetch_home_posts(sample.user))
+    ),
+    "fetch_bookmarked_posts": (
+        lambda sample: sample.user and _feed(fetch_bookmarked_posts(sample.user))
+    ),
+    **{
+        f"fetch_community_posts[{sort}]": (
+            lambda sample, sort=sort: sample.community
+            and _feed(fetch_community_posts(sample.community, sort))
+        )
+        for sort in CommunityFeedSort
+    },
+    "get_comments_root_nodes_qs": (
+        lambda sample: sample.post
+        and get_comments_root_nodes_qs().filter(post_id=sample.post.pk)
+    ),
+    "get_children_comments": (
+        lambda sample: sample.comment
+        and get_children_comments(sample.comment, sample.comment.level + 3)
+    ),
+    "fetch_active_relations": (
+        lambda sample: sample.user and fetch_active_relations().filter(user=sample.user)
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN (ANALYZE, BUFFERS) for querysets of posts, comments and users "
+        "selectors, report sequential scans, sorts spilled to disk and bad row "
+        "estimates, and suggest indexes. Plans only make sense on database of "
+        "realistic size, like a fresh copy of production. JSON output is meant to be "
+        "kept and compared between releases."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--selector",
+            choices=SELECTORS,
+            action="append",
+            help="Selector to explain, all of them by default.",
+        )
+        parser.add_argument("--user", type=int, help="Primary key of the sample user.")
+        parser.add_argument("--post", type=int, help="Primary key of the sample post.")
+        parser.add_argument(
+            "--min-seq-scan-rows",
+            type=int,
+            default=1000,
+            help="Report sequential scans reading at least this many rows.",
+        )
+        parser.add_argument(
+            "--max-estimate-error",
+            type=float,
+            default=10,
+            help="Report nodes with actual rows differing from planned this many times.",
+        )
+        parser.add_argument("--format", choices=("text", "json"), default="text")
+        parser.add_argument(
+            "--with-plans", action="store_true", help="Include full plans into JSON."
+        )
+
+    def handle(self, *args, **options):
+        sample = self._get_sample_objects(options["user"], options["post"])
+        report = []
+        for name in options["selector"] or SELECTORS:
+            queryset = SELECTORS[name](sample)
+            if queryset is None or queryset.query.is_empty():
+                self.stderr.write(f"{name}: skipped, no sample objects to run it for")
+                continue
+            explained = explain_queryset(
+                queryset, options["min_seq_scan_rows"], options["max_estimate_error"]
+            )
+            report.append(
+                {
+                    "selector": name,
+                    "planning_time_ms": explained.planning_time_ms,
+                    "execution_time_ms": explained.execution_time_ms,
+                    "shared_hit_blocks": explained.plan.get("Shared Hit Blocks", 0),
+                    "shared_read_blocks": explained.plan.get("Shared Read Blocks", 0),
+                    "findings": [finding._asdict() for finding in explained.findings],
+                    **({"plan": explained.plan} if options["with_plans"] else {}),
+                }
+            )
+
+        if options["format"] == "json":
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        for entry in report:
+            self._write_text_entry(entry)
+
+    def _write_text_entry(self, entry: dict):
+        self.stdout.write(
+            f"{entry['selector']}: {entry['execution_time_ms']:.2f}ms, "
+            f"{entry['shared_hit_blocks']} blocks hit, "
+            f"{entry['shared_read_blocks']} read"
+        )
+        for finding in entry["findings"]:
+            self.stdout.write(
+                f"  {finding['kind']} {finding['relation']}: {finding['detail']}"
+            )
+            if finding["suggestion"]:
+                self.stdout.write(f"    suggestion: {finding['suggestion']}")
+
+    def _get_sample_objects(self, user_id: int | None, post_id: int | None):
+        try:
+            user = (
+                UserPublic.objects.get(pk=user_id)
+                if user_id
+                else UserPublic.objects.order_by("-rating").first()
+            )
+            post = (
+                Post.objects.get(pk=post_id)
+                if post_id
+                else Post.objects.order_by("-comments_count").first()
+            )
+        except (UserPublic.DoesNotExist, Post.DoesNotExist) as e:
+            raise CommandError(str(e)) from None
+
+        comment = (
+            post
+            and Comment.objects.filter(post=post, level=0)
+            .order_by("-children_count")
+            .first()
+        )
+        return SampleObjects(
+            user=user,
+            post=post,
+            comment=comment,
+            community=Community.objects.order_by("-subscribers_count").first(),
+        )
@@ -0,0 +1,10 @@
+from common.commands import PeriodicCommand
+from posts.services import fan_out_pending_posts
+
+
+class Command(PeriodicCommand):
+    help = "Deliver published posts to timelines of their subscribers."
+
+    def handle_once(self, *args, **options):
+        delivered = fan_out_pending_posts()
+        self.stdout.write(f"Delivered {delivered} posts to timelines")
@@ -0,0 +1,21 @@
+from common.commands import PeriodicCommand
+from posts.choices import TopPostsWindow
+from posts.services import rebuild_top_posts
+
+
+class Command(PeriodicCommand):
+    help = "Rebuild precomputed top posts leaderboards."
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--window",
+            choices=TopPostsWindow.values,
+            action="append",
+            help="Rebuild only given windows, all of them by default.",
+        )
+
+    def handle_once(self, *args, window, **options):
+        for top_window in window or TopPostsWindow.values:
+            count = rebuild_top_posts(top_window)
+            self.stdout.write(f"Rebuilt {top_window} leaderboard with {count} posts")
@@ -0,0 +1,14 @@
+from common.commands import PeriodicCommand
+from posts.services import recalculate_hot_scores
+
+
+class Command(PeriodicCommand):
+    help = "Recalculate hot scores of recent posts used to order popular posts."
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle_once(self, *args, chunk_size, **options):
+        updated = recalculate_hot_scores(chunk_size=chunk_size)
+        self.stdout.write(f"Updated hot scores of {updated} posts")
@@ -0,0 +1,10 @@
+from common.commands import PeriodicCommand
+from posts.services import trim_timelines
+
+
+class Command(PeriodicCommand):
+    help = "Remove posts older than retention period from users timelines."
+
+    def handle_once(self, *args, **options):
+        deleted = trim_timelines()
+        self.stdout.write(f"Removed {deleted} timeline entries")
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.4 on 2026-10-18 08:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0009_alter_post_options_alter_post_community_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TopPost",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "window",
+                    models.CharField(
+                        choices=[
+                            ("day", "Day"),
+                            ("week", "Week"),
+                            ("month", "Month"),
+                            ("all", "All time"),
+                        ],
+                        max_length=5,
+                    ),
+                ),
+                ("rating", models.IntegerField()),
+                ("published_at", models.DateTimeField(null=True)),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="top_entries",
+                        to="posts.post",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["window", "-rating", "-post"],
+                        name="top_post_window_rating_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="toppost",
+            constraint=models.UniqueConstraint(
+                fields=("window", "post"), name="top_post_window_post"
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0010_toppost"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="hot_score",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["-hot_score", "-id"],
+                name="post_hot_score_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0011_post_hot_score"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comments_velocity",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="comments_velocity_updated_at",
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="last_comment_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["-comments_velocity", "-id"],
+                name="post_comments_velocity_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(
+                    ("last_comment_at__isnull", False), ("status", "published")
+                ),
+                fields=["-last_comment_at", "-id"],
+                name="post_last_comment_at_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0012_post_comments_activity"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["-created_at", "-id"],
+                name="post_published_created_at_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="post_user_created_at_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0015_bookmark"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["community", "-published_at", "-id"],
+                name="post_community_new_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["community", "-rating", "-id"],
+                name="post_community_top_idx",
+            ),
+        ),
+    ]
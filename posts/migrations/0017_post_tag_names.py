@@ -0,0 +1,42 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:40
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0016_post_community_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="tag_names",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=50),
+                blank=True,
+                default=list,
+                editable=False,
+                size=None,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["tag_names"], name="post_tag_names_idx"
+            ),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE posts_post SET tag_names = ARRAY(
+                SELECT t.name FROM posts_tag AS t
+                JOIN posts_post_tags AS pt ON pt.tag_id = t.id
+                WHERE pt.post_id = posts_post.id
+                ORDER BY t.name
+            )
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:47
+
+from django.db import migrations, models
+
+from posts.content import (
+    get_content_cover_image,
+    get_content_excerpt,
+    get_content_reading_time_minutes,
+)
+
+
+def set_content_preview(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    posts = []
+    for post in Post.objects.only("pk", "content").iterator(chunk_size=1000):
+        post.excerpt = get_content_excerpt(post.content)
+        post.cover_image = get_content_cover_image(post.content)
+        post.reading_time_minutes = get_content_reading_time_minutes(post.content)
+        posts.append(post)
+        if len(posts) == 1000:
+            Post.objects.bulk_update(
+                posts, ["excerpt", "cover_image", "reading_time_minutes"]
+            )
+            posts = []
+    Post.objects.bulk_update(posts, ["excerpt", "cover_image", "reading_time_minutes"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0017_post_tag_names"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="cover_image",
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="excerpt",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="reading_time_minutes",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(set_content_preview, migrations.RunPython.noop),
+    ]
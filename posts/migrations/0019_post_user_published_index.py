@@ -0,0 +1,20 @@
+# Generated by Django 4.2.4 on 2026-10-18 11:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0018_post_content_preview"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["user", "-published_at", "-id"],
+                name="post_user_published_idx",
+            ),
+        ),
+    ]
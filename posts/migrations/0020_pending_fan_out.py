@@ -0,0 +1,37 @@
+# Generated by Django 4.2.4 on 2026-10-18 12:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0019_post_user_published_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingFanOut",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "post",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pending_fan_out",
+                        to="posts.post",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -1,12 +1,20 @@
 import uuid
 
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.db.models import UniqueConstraint
+from django.utils import timezone
 from django_extensions.db.fields import AutoSlugField
 
 from common.helpers import slugify_function
 from common.models import Timestamped
-from posts.choices import PostStatus, Vote
+from posts.choices import PostStatus, TopPostsWindow, Vote
+from posts.content import (
+    get_content_cover_image,
+    get_content_excerpt,
+    get_content_reading_time_minutes,
+)
 
 
 class PostGroup(Timestamped):
@@ -71,9 +79,18 @@ class Post(Timestamped):
     #   }
     # ]
     content = models.JSONField()
+    # derived from content on save, so feeds don't need to load the content itself
+    excerpt = models.TextField(blank=True, editable=False)
+    cover_image = models.CharField(max_length=500, blank=True, editable=False)
+    reading_time_minutes = models.PositiveSmallIntegerField(default=0, editable=False)
     image = models.ImageField(upload_to="posts/images/", null=True, blank=True)
     video = models.FileField(upload_to="posts/videos/", null=True, blank=True)
     tags = models.ManyToManyField("posts.Tag", blank=True)
+    # names of the tags, kept in sync with ``tags`` to filter and show posts by tags
+    # without joining them
+    tag_names = ArrayField(
+        models.CharField(max_length=50), default=list, blank=True, editable=False
+    )
     views_count = models.IntegerField(default=0)
     comments_count = models.PositiveIntegerField(default=0)
     votes_up_count = models.PositiveIntegerField(default=0)
@@ -83,10 +100,82 @@ class Post(Timestamped):
         max_length=9, choices=PostStatus.choices, default=PostStatus.DRAFT
     )
     published_at = models.DateTimeField(null=True, blank=True)
+    # time decayed rating, recalculated periodically for recent posts
+    hot_score = models.FloatField(default=0, editable=False)
+    last_comment_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # exponentially decayed number of recent comments
+    comments_velocity = models.FloatField(default=0, editable=False)
+    comments_velocity_updated_at = models.DateTimeField(null=True, editable=False)
+
+    CONTENT_PREVIEW_FIELDS = ("excerpt", "cover_image", "reading_time_minutes")
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=("-created_at", "-id"),
+                name="post_published_created_at_idx",
+                condition=models.Q(status=PostStatus.PUBLISHED),
+            ),
+            models.Index(
+                fields=("user", "-created_at", "-id"), name="post_user_created_at_idx"
+            ),
+            models.Index(
+                fields=("user", "-published_at", "-id"),
+                name="post_user_published_idx",
+                condition=models.Q(status=PostStatus.PUBLISHED),
+            ),
+            models.Index(
+                fields=("community", "-published_at", "-id"),
+                name="post_community_new_idx",
+                condition=models.Q(status=PostStatus.PUBLISHED),
+            ),
+            models.Index(
+                fields=("community", "-rating", "-id"),
+                name="post_community_top_idx",
+                condition=models.Q(status=PostStatus.PUBLISHED),
+            ),
+            models.Index(
+                fields=("-comments_velocity", "-id"),
+                name="post_comments_velocity_idx",
+                condition=models.Q(status=PostStatus.PUBLISHED),
+            ),
+            models.Index(
+                fields=("-last_comment_at", "-id"),
+                name="post_last_comment_at_idx",
+                condition=models.Q(
+                    status=PostStatus.PUBLISHED, last_comment_at__isnull=False
+                ),
+            ),
+            GinIndex(fields=("tag_names",), name="post_tag_names_idx"),
+            models.Index(
+                fields=("-hot_score", "-id"),
+                name="post_hot_score_idx",
+                condition=models.Q(status=PostStatus.PUBLISHED),
+            ),
+        ]
 
     def __str__(self):
         return f"<{self.pk}: {self.title}>"
 
+    def save(self, *args, **kwargs):
+        """Save the post, deriving its preview whenever content is saved.
+
+        Preview fields are added to ``update_fields`` which include content, so
+        partial saves write them too.
+        """
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            self.set_content_preview()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *self.CONTENT_PREVIEW_FIELDS}
+        super().save(*args, **kwargs)
+
+    def set_content_preview(self):
+        """Set excerpt, cover image and reading time of the post from its content."""
+        self.excerpt = get_content_excerpt(self.content)
+        self.cover_image = get_content_cover_image(self.content)
+        self.reading_time_minutes = get_content_reading_time_minutes(self.content)
+
 
 class Tag(models.Model):
     """Model to keep all created tags."""
@@ -108,3 +197,90 @@ class PostVote(Timestamped):
         constraints = [
             UniqueConstraint(fields=("user", "post"), name="user_post_vote"),
         ]
+
+
+class TopPost(models.Model):
+    """Precomputed entry of top posts leaderboard for the time window.
+
+    Leaderboards are updated on every vote and periodically rebuilt to drop posts
+    which left the window or fell out of the top.
+    """
+
+    window = models.CharField(max_length=5, choices=TopPostsWindow.choices)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="top_entries")
+    rating = models.IntegerField()
+    published_at = models.DateTimeField(null=True)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(fields=("window", "post"), name="top_post_window_post"),
+        ]
+        indexes = [
+            models.Index(
+                fields=("window", "-rating", "-post"), name="top_post_window_rating_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"<{self.window}: {self.post_id}>"
+
+
+class Bookmark(models.Model):
+    """Post saved by the user to read later."""
+
+    user = models.ForeignKey(
+        "users.UserPublic", on_delete=models.CASCADE, related_name="bookmarks"
+    )
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="bookmarks")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(fields=("user", "post"), name="bookmark_user_post"),
+        ]
+        indexes = [
+            models.Index(
+                fields=("user", "-created_at", "-post"), name="bookmark_user_feed_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"<{self.user_id}: {self.post_id}>"
+
+
+class PendingFanOut(models.Model):
+    """Published post waiting to be delivered to timelines of its subscribers."""
+
+    post = models.OneToOneField(
+        Post, on_delete=models.CASCADE, related_name="pending_fan_out"
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"<{self.post_id}>"
+
+
+class TimelineEntry(models.Model):
+    """Post delivered to home feed of the user subscribed to its author, tag, etc."""
+
+    user = models.ForeignKey(
+        "users.UserPublic", on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+    published_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(fields=("user", "post"), name="timeline_entry_user_post"),
+        ]
+        indexes = [
+            models.Index(
+                fields=("user", "-published_at", "-post"),
+                name="timeline_entry_user_feed_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"<{self.user_id}: {self.post_id}>"
@@ -1,22 +1,84 @@
+import datetime
+from typing import NamedTuple
+from uuid import UUID
+
 from django.conf import settings
-from django.db.models import QuerySet
+from django.db.models import (
+    Count,
+    DurationField,
+    Expression,
+    ExpressionWrapper,
+    F,
+    FilteredRelation,
+    FloatField,
+    Q,
+    QuerySet,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce, Extract, Greatest, Power
 from django.utils import timezone
 
-from posts.choices import PostStatus
-from posts.models import Post, PostVote
+from comments.models import Comment
+from common.reconciliation import CounterSource
+from common.resolvers import UUIDResolver
+from posts.choices import PostStatus, TopPostsWindow, Vote
+from posts.models import Bookmark, Post, PostVote
 from users.models import UserPublic
+from users.selectors import ViewerFilters, get_followed_popular_users_ids
+
+POST_COUNTER_FIELDS = ("votes_up_count", "votes_down_count", "rating", "comments_count")
+
+# Rows each of ``POST_COUNTER_FIELDS`` is calculated from
+POST_COUNTER_SOURCES = [
+    CounterSource(
+        PostVote.objects.all(),
+        "post",
+        {
+            "votes_up_count": Count("pk", filter=Q(value=Vote.UPVOTE)),
+            "votes_down_count": Count("pk", filter=Q(value=Vote.DOWNVOTE)),
+            "rating": Sum("value"),
+        },
+    ),
+    CounterSource(Comment.objects.all(), "post", {"comments_count": Count("pk")}),
+]
+
+POSTS_FEEDS_CACHE_VERSION_KEY = "posts:feeds-version"
+
+TOP_POSTS_WINDOW_DURATIONS = {
+    TopPostsWindow.DAY: datetime.timedelta(days=1),
+    TopPostsWindow.WEEK: datetime.timedelta(days=7),
+    TopPostsWindow.MONTH: datetime.timedelta(days=30),
+    TopPostsWindow.ALL: None,
+}
+
+
+class PostRef(NamedTuple):
+    """Fields of the post which never change, resolved by its UUID."""
+
+    pk: int
+
+
+post_resolver = UUIDResolver(Post, PostRef)
 
 
 def fetch_popular_posts() -> QuerySet[Post]:
-    """Fetch posts which have gotten a lot of user activity."""
+    """Fetch posts which have gotten a lot of user activity.
+
+    Posts are ordered by precomputed hot score, which is covered by partial index.
+    """
+    return (
+        Post.objects.filter(status=PostStatus.PUBLISHED)
+        .order_by("-hot_score", "-id")
+        .select_related("user", "community")
+    )
 
 
 def fetch_new_posts() -> QuerySet[Post]:
     """Fetch pots which were added recently."""
     return (
         Post.objects.filter(status=PostStatus.PUBLISHED)
-        .order_by("-created_at")
-        .prefetch_related("tags")
+        .order_by("-created_at", "-id")
         .select_related("user", "community")
     )
 
@@ -25,31 +87,224 @@ def fetch_draft_posts() -> QuerySet[Post]:
     """Fetch posts in draft status."""
     return (
         Post.objects.filter(status=PostStatus.DRAFT)
-        .order_by("-created_at")
-        .prefetch_related("tags")
+        .order_by("-created_at", "-id")
         .select_related("user", "community")
     )
 
 
 def fetch_user_posts(user: UserPublic) -> QuerySet[Post]:
     """Fetch all user posts, including all statuses."""
+    return user.posts.order_by("-created_at", "-id").select_related("user", "community")
+
+
+def fetch_top_posts(window: TopPostsWindow = TopPostsWindow.DAY) -> QuerySet[Post]:
+    """Fetch posts with highest rating published within the time window.
+
+    Posts are read from precomputed leaderboard, so the page is a range scan of
+    the leaderboard index instead of sorting all published posts by rating.
+    """
+    # Leaderboard is rebuilt periodically, posts which already left the window may
+    # still be there until the next rebuild
+    entry_condition = Q(top_entries__window=window)
+    if window_start := get_top_posts_window_start(window):
+        entry_condition &= Q(top_entries__published_at__gte=window_start)
     return (
-        user.posts.order_by("-created_at")
-        .prefetch_related("tags")
+        Post.objects.annotate(
+            top_entry=FilteredRelation("top_entries", condition=entry_condition)
+        )
+        .filter(status=PostStatus.PUBLISHED, top_entry__isnull=False)
+        .annotate(top_rating=F("top_entry__rating"))
+        .order_by("-top_rating", "-id")
         .select_related("user", "community")
     )
 
 
-def fetch_top_posts() -> QuerySet[Post]:
-    """Fetch posts with highest rating."""
+def get_top_posts_window_start(window: TopPostsWindow) -> datetime.datetime | None:
+    """Return since when posts belong to the window, ``None`` for all time window."""
+    duration = TOP_POSTS_WINDOW_DURATIONS[window]
+    return timezone.now() - duration if duration else None
+
+
+def get_post_top_posts_windows(post: Post) -> list[TopPostsWindow]:
+    """Return time windows which top posts leaderboards can include the post."""
+    if post.status != PostStatus.PUBLISHED:
+        return []
+    windows = []
+    for window in TopPostsWindow:
+        window_start = get_top_posts_window_start(window)
+        if not window_start or (post.published_at and post.published_at >= window_start):
+            windows.append(window)
+    return windows
+
+
+def get_hot_posts_window_start() -> datetime.datetime:
+    """Return since when published posts have their hot score recalculated."""
+    return timezone.now() - datetime.timedelta(days=settings.HOT_POSTS_WINDOW_DAYS)
+
+
+def get_hot_posts_gravity() -> float:
+    """Return how fast hot score of the post decays with its age."""
+    return settings.HOT_POSTS_GRAVITY
+
+
+def get_decayed_comments_velocity(at: datetime.datetime) -> Expression:
+    """Return expression of post comments velocity decayed to the given moment."""
+    half_life_seconds = settings.COMMENTS_VELOCITY_HALF_LIFE_HOURS * 3600
+    elapsed_seconds = Greatest(
+        Extract(
+            ExpressionWrapper(
+                Value(at) - F("comments_velocity_updated_at"),
+                output_field=DurationField(),
+            ),
+            "epoch",
+        ),
+        0,
+    )
+    return Coalesce(
+        F("comments_velocity") * Power(0.5, elapsed_seconds / half_life_seconds),
+        0.0,
+        output_field=FloatField(),
+    )
+
+
+def get_post_cache_version_key(post_uuid: UUID) -> str:
+    """Return key of the version of cached post responses."""
+    return f"posts:post-version:{post_uuid}"
+
+
+def get_timeline_fanout_max_followers() -> int:
+    """Return max number of followers author's posts are copied to timelines for."""
+    return settings.TIMELINE_FANOUT_MAX_FOLLOWERS
+
+
+def get_timeline_fanout_batch_size() -> int:
+    """Return how many subscribers post is delivered to in one statement."""
+    return settings.TIMELINE_FANOUT_BATCH_SIZE
+
+
+def get_timeline_retention_start() -> datetime.datetime:
+    """Return since when published posts are kept in timelines."""
+    return timezone.now() - datetime.timedelta(days=settings.TIMELINE_RETENTION_DAYS)
+
+
+def get_top_posts_leaderboard_size() -> int:
+    """Return how many posts are kept in every top posts leaderboard."""
+    return settings.TOP_POSTS_LEADERBOARD_SIZE
 
 
 def fetch_discussed_posts() -> QuerySet[Post]:
-    """Fetch posts with a lot of comments."""
+    """Fetch posts with a lot of comments recently."""
+    return (
+        Post.objects.filter(status=PostStatus.PUBLISHED)
+        .order_by("-comments_velocity", "-id")
+        .select_related("user", "community")
+    )
+
+
+def fetch_active_posts() -> QuerySet[Post]:
+    """Fetch posts which were commented most recently."""
+    return (
+        Post.objects.filter(status=PostStatus.PUBLISHED, last_comment_at__isnull=False)
+        .order_by("-last_comment_at", "-id")
+        .select_related("user", "community")
+    )
+
+
+def fetch_home_posts(user: UserPublic) -> list[QuerySet[Post]]:
+    """Fetch posts of authors, communities and tags the user subscribed to.
+
+    Posts are read from user's timeline filled on publishing. Posts of followed
+    authors with too many followers aren't copied to timelines, they are merged on
+    read, which costs more, so it's done only when user follows such authors.
+
+    Timeline and posts of popular authors are separate querysets, ordered the same
+    way and not overlapping, each is read by range scan of its own index. They are
+    meant to be paginated together by ``KeysetPagination``.
+    """
+    queryset = Post.objects.annotate(
+        timeline_entry=FilteredRelation(
+            "timeline_entries", condition=Q(timeline_entries__user=user)
+        )
+    ).filter(status=PostStatus.PUBLISHED)
+    querysets = [
+        queryset.filter(timeline_entry__isnull=False).annotate(
+            feed_published_at=F("timeline_entry__published_at")
+        )
+    ]
+    if popular_authors_ids := get_followed_popular_users_ids(
+        user, get_timeline_fanout_max_followers() + 1
+    ):
+        # posts delivered to timeline through community or tags are read from there
+        querysets.append(
+            queryset.filter(
+                user_id__in=popular_authors_ids,
+                published_at__isnull=False,
+                timeline_entry__isnull=True,
+            ).annotate(feed_published_at=F("published_at"))
+        )
+    return [
+        queryset.order_by("-feed_published_at", "-id").select_related("user", "community")
+        for queryset in querysets
+    ]
 
 
 def fetch_bookmarked_posts(user: UserPublic) -> QuerySet[Post]:
-    """Fetch posts which user bookmarked."""
+    """Fetch posts which user bookmarked, most recently bookmarked first.
+
+    Posts are read by range scan of user's bookmarks index, so it doesn't depend on
+    how many bookmarks user has.
+    """
+    return (
+        Post.objects.annotate(
+            bookmark=FilteredRelation("bookmarks", condition=Q(bookmarks__user=user))
+        )
+        .filter(status=PostStatus.PUBLISHED, bookmark__isnull=False)
+        .annotate(bookmarked_at=F("bookmark__created_at"))
+        .order_by("-bookmarked_at", "-id")
+        .select_related("user", "community")
+    )
+
+
+def get_bookmarked_posts(user: UserPublic, post_ids: set[int]) -> dict[int, bool]:
+    """Get which of the posts user bookmarked."""
+    return dict.fromkeys(
+        Bookmark.objects.filter(user=user, post_id__in=post_ids).values_list(
+            "post_id", flat=True
+        ),
+        True,
+    )
+
+
+def get_post_votes_values(user: UserPublic, post_ids: set[int]) -> dict[int, int]:
+    """Get values of user's votes for the posts."""
+    return dict(
+        PostVote.objects.filter(user=user, post_id__in=post_ids).values_list(
+            "post_id", "value"
+        )
+    )
+
+
+def is_post_visible(post: Post, viewer_filters: ViewerFilters) -> bool:
+    """Check if post isn't hidden by viewer's blocked authors and ignored tags."""
+    if post.user_id in viewer_filters.blocked_user_ids:
+        return False
+    return viewer_filters.ignored_tag_names.isdisjoint(post.tag_names)
+
+
+def defer_post_content(queryset: QuerySet[Post]) -> QuerySet[Post]:
+    """Skip loading post content, feeds show excerpt instead of it."""
+    return queryset.defer("content")
+
+
+def filter_posts_by_tags(
+    queryset: QuerySet[Post], tag_names: list[str], match_all: bool = False
+) -> QuerySet[Post]:
+    """Filter posts having any or all of the tags, using GIN index on tag names."""
+    if not tag_names:
+        return queryset
+    if match_all:
+        return queryset.filter(tag_names__contains=tag_names)
+    return queryset.filter(tag_names__overlap=tag_names)
 
 
 def get_post_editable_window_minutes() -> int:
@@ -63,7 +318,7 @@ def get_post_vote_value_for_author(author: UserPublic, post_vote: PostVote) -> f
 
 
 def can_edit_post(user: UserPublic, post: Post) -> bool:
-    if user and user != post.user:
+    if user and user.pk != post.user_id:
         return False
     if post.status != PostStatus.PUBLISHED or not post.published_at:
         return True
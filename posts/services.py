@@ -1,81 +1,445 @@
 import logging
-import operator
+from functools import partial
 
-from django.db import transaction
-from django.db.models import F
+import numpy as np
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import connection, transaction
+from django.db.models import Case, FloatField, OuterRef, Q, Value, When
+from django.db.models.functions import Extract
+from django.db.models.lookups import LessThan
 from django.utils import timezone
 
-from posts.choices import PostStatus, Vote
+from common.cache import bump_cache_version
+from common.counters import counter_buffer, is_counters_write_behind_enabled
+from posts.choices import PostStatus, TopPostsWindow, Vote
+from posts.events import publish_post_event_on_commit
 from posts.exceptions import PostDeleteException, PostPublishException
-from posts.models import Post, PostVote
-from posts.selectors import get_post_vote_value_for_author
-from users.models import UserPublic
+from posts.models import (
+    Bookmark,
+    PendingFanOut,
+    Post,
+    PostVote,
+    Tag,
+    TimelineEntry,
+    TopPost,
+)
+from posts.selectors import (
+    POSTS_FEEDS_CACHE_VERSION_KEY,
+    get_decayed_comments_velocity,
+    get_hot_posts_gravity,
+    get_hot_posts_window_start,
+    get_post_cache_version_key,
+    get_post_top_posts_windows,
+    get_post_vote_value_for_author,
+    get_timeline_fanout_batch_size,
+    get_timeline_fanout_max_followers,
+    get_timeline_retention_start,
+    get_top_posts_leaderboard_size,
+    get_top_posts_window_start,
+)
+from users.choices import TagStatus, UserRelationStatus
+from users.models import UserCommunity, UserPublic, UserRelation, UserTag
+from votes.engine import VoteChange, VoteRequest, toggle_votes
 
 logger = logging.getLogger(__name__)
 
 
-def update_author_rating_on_post_vote(post_vote: PostVote, vote_cancelled: bool = False):
-    """Update author rating when it's post gets vote."""
-    operation = {
-        True: operator.sub,
-        False: operator.add,
-    }[vote_cancelled]
+def buffer_counters_on_post_vote(post_vote: PostVote, vote_cancelled: bool = False):
+    """Buffer post, author and voter counters changes to be flushed later."""
+    sign = -1 if vote_cancelled else 1
+    votes_count_field = (
+        "votes_up_count" if post_vote.value == Vote.UPVOTE else "votes_down_count"
+    )
+    post: Post = post_vote.post
+    counter_buffer.add_on_commit(
+        Post, post.pk, rating=sign * post_vote.value, **{votes_count_field: sign}
+    )
+    counter_buffer.add_on_commit(
+        UserPublic,
+        post.user_id,
+        rating=sign * get_post_vote_value_for_author(post.user, post_vote),
+    )
+    counter_buffer.add_on_commit(
+        UserPublic, post_vote.user_id, **{votes_count_field: sign}
+    )
 
-    author = post_vote.post.user
-    author.rating = operation(
-        F("rating"), get_post_vote_value_for_author(author, post_vote)
+
+@transaction.atomic
+def record_votes_for_posts(
+    actor: UserPublic, votes: list[tuple[Post, Vote]]
+) -> dict[int, VoteChange | None]:
+    """Record actor's votes for several posts at once, see ``record_vote_for_post``."""
+    write_behind = is_counters_write_behind_enabled()
+    vote_requests = [
+        VoteRequest(
+            post,
+            vote,
+            author_rating_per_vote=get_post_vote_value_for_author(
+                post.user, PostVote(post=post, user=actor, value=Vote.UPVOTE)
+            ),
+        )
+        for post, vote in votes
+    ]
+    changes = toggle_votes(
+        PostVote, actor, vote_requests, update_counters=not write_behind
     )
-    author.save(update_fields=["rating"])
-
-
-def update_voter_votes_count_on_post_vote(
-    post_vote: PostVote, vote_cancelled: bool = False
-):
-    """Update votes counts for voter."""
-    voter: UserPublic = post_vote.user
-    operation = {
-        True: operator.sub,
-        False: operator.add,
-    }[vote_cancelled]
-    if post_vote.value == Vote.UPVOTE:
-        voter.votes_up_count = operation(F("votes_up_count"), 1)
-    else:
-        voter.votes_down_count = operation(F("votes_down_count"), 1)
-    voter.save()
-
-
-def update_post_rating_on_vote(post_vote: PostVote, vote_cancelled: bool = False):
-    """Update post rating when it gets vote."""
-    operation = {
-        True: operator.sub,
-        False: operator.add,
-    }[vote_cancelled]
+    ratings = {}
+    for post, _ in votes:
+        if not (change := changes.get(post.pk)):
+            continue
+        if write_behind:
+            buffer_counters_on_post_vote(
+                PostVote(post=post, user=actor, value=change.value),
+                vote_cancelled=change.cancelled,
+            )
+            # Counters are snapshot from the database without buffered deltas, so
+            # leaderboards lag behind the same way until the next rebuild
+            sign = -1 if change.cancelled else 1
+            ratings[post] = post.rating + sign * change.value
+        else:
+            ratings[post] = post.rating
+    update_top_posts(ratings)
+    for post in ratings:
+        transaction.on_commit(partial(invalidate_post_cache, post))
+        publish_post_event_on_commit(
+            post.pk,
+            "post_rating",
+            {"uuid": post.uuid, **changes[post.pk].get_counters_delta()},
+        )
+    return changes
 
-    post: Post = post_vote.post
-    post.rating = operation(F("rating"), post_vote.value)
-    if post_vote.value == Vote.UPVOTE:
-        post.votes_up_count = operation(F("votes_up_count"), 1)
-    else:
-        post.votes_down_count = operation(F("votes_down_count"), 1)
-    post.save()
+
+def record_vote_for_post(post: Post, actor: UserPublic, vote: Vote) -> VoteChange | None:
+    """Record vote for a post and trigger updates of post and post's author.
+
+    Post counters are updated in place, so post doesn't need to be refreshed.
+    """
+    return record_votes_for_posts(actor, [(post, vote)]).get(post.pk)
+
+
+def update_top_posts(ratings: dict[Post, int]):
+    """Put posts with their new ratings into top posts leaderboards they belong to.
+
+    Post is upserted into the leaderboard only if it's already there or its rating
+    beats the last of ``TOP_POSTS_LEADERBOARD_SIZE`` entries, so votes for posts far
+    from the top don't grow leaderboards. All posts and windows are written with
+    one ``INSERT ... SELECT FROM (VALUES ...)`` statement.
+    """
+    rows = [
+        (window, post.pk, rating, post.published_at)
+        for post, rating in ratings.items()
+        for window in get_post_top_posts_windows(post)
+    ]
+    if not rows:
+        return
+
+    opts = TopPost._meta
+    qn = connection.ops.quote_name
+    fields = [
+        opts.get_field(name) for name in ("window", "post", "rating", "published_at")
+    ]
+    window, post, rating, published_at = (qn(field.column) for field in fields)
+    row_placeholder = ", ".join(
+        f"%s::{field.cast_db_type(connection)}" for field in fields
+    )
+    sql = f"""
+        INSERT INTO {qn(opts.db_table)} ({window}, {post}, {rating}, {published_at})
+        SELECT v.{window}, v.{post}, v.{rating}, v.{published_at}
+        FROM (VALUES {", ".join([f"({row_placeholder})"] * len(rows))})
+            AS v ({window}, {post}, {rating}, {published_at})
+        WHERE EXISTS (
+            SELECT 1 FROM {qn(opts.db_table)} AS t
+            WHERE t.{window} = v.{window} AND t.{post} = v.{post}
+        ) OR ((v.{rating}, v.{post}) > (
+            SELECT t.{rating}, t.{post} FROM {qn(opts.db_table)} AS t
+            WHERE t.{window} = v.{window}
+            ORDER BY t.{rating} DESC, t.{post} DESC
+            OFFSET %s LIMIT 1
+        )) IS NOT FALSE
+        ON CONFLICT ({window}, {post}) DO UPDATE SET {rating} = EXCLUDED.{rating}
+    """
+    params = [value for row in rows for value in row]
+    params.append(get_top_posts_leaderboard_size() - 1)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
 
 
 @transaction.atomic
-def record_vote_for_post(post: Post, actor: UserPublic, vote: Vote):
-    """Record vote for a post and trigger updates of post and post's author."""
-    post_vote = PostVote.objects.filter(post=post, user=actor).first()
-    vote_cancelled = False
-    if post_vote:
-        # Здесь если при наличии голоса, пользователь проголосовал еще раз,
-        # отменяем рейтинг и удаляем PostVote
-        vote_cancelled = True
-        post_vote.delete()
-    else:
-        post_vote = PostVote.objects.create(post=post, user=actor, value=vote)
-
-    update_post_rating_on_vote(post_vote, vote_cancelled)
-    update_author_rating_on_post_vote(post_vote, vote_cancelled)
-    update_voter_votes_count_on_post_vote(post_vote, vote_cancelled)
+def rebuild_top_posts(window: TopPostsWindow) -> int:
+    """Rebuild top posts leaderboard from scratch, return number of its entries.
+
+    Leaderboard keeps only top posts which are still within the window, incremental
+    updates on votes add new posts to it in between rebuilds. Entries are upserted,
+    so votes recorded meanwhile don't conflict with the rebuild, and ones which got
+    into the top since it was read are kept.
+    """
+    size = get_top_posts_leaderboard_size()
+    posts = Post.objects.filter(status=PostStatus.PUBLISHED)
+    if window_start := get_top_posts_window_start(window):
+        posts = posts.filter(published_at__gte=window_start)
+    top = list(
+        posts.order_by("-rating", "-pk").values_list("pk", "rating", "published_at")[
+            :size
+        ]
+    )
+
+    TopPost.objects.bulk_create(
+        [
+            TopPost(window=window, post_id=pk, rating=rating, published_at=published_at)
+            for pk, rating, published_at in top
+        ],
+        update_conflicts=True,
+        unique_fields=("window", "post"),
+        update_fields=("rating", "published_at"),
+    )
+    fresh = Q(published_at__gte=window_start) if window_start else Q()
+    if len(top) == size:
+        last_pk, last_rating, _ = top[-1]
+        fresh &= Q(rating__gt=last_rating) | Q(rating=last_rating, post_id__gt=last_pk)
+    if fresh:
+        TopPost.objects.filter(window=window).exclude(
+            post_id__in=[pk for pk, _, _ in top]
+        ).exclude(fresh).delete()
+    return len(top)
+
+
+def calculate_hot_scores(
+    ratings: np.ndarray, ages_hours: np.ndarray, gravity: float
+) -> np.ndarray:
+    """Calculate time decayed scores of the posts, newer posts decay faster.
+
+    Score is the rating divided by post age in hours, powered by gravity, so the
+    post with the same rating goes down as it gets older.
+    """
+    return ratings / np.power(np.maximum(ages_hours, 0) + 2, gravity)
+
+
+def recalculate_hot_scores(chunk_size: int = 5000) -> int:
+    """Recalculate hot scores of recent posts, return number of updated posts.
+
+    All recent posts are loaded in a single pass into arrays and scored at once,
+    only posts whose score has changed are written back.
+    """
+    now = timezone.now()
+    window_start = get_hot_posts_window_start()
+    rows = (
+        Post.objects.filter(status=PostStatus.PUBLISHED, published_at__gte=window_start)
+        .annotate(
+            published_ts=Extract("published_at", "epoch", output_field=FloatField())
+        )
+        .values_list("pk", "rating", "published_ts", "hot_score")
+        .order_by()
+    )
+    posts = np.fromiter(
+        rows.iterator(chunk_size=chunk_size),
+        dtype=[
+            ("pk", np.int64),
+            ("rating", np.float64),
+            ("published_ts", np.float64),
+            ("hot_score", np.float64),
+        ],
+    )
+
+    ages_hours = (now.timestamp() - posts["published_ts"]) / 3600
+    scores = calculate_hot_scores(posts["rating"], ages_hours, get_hot_posts_gravity())
+    changed = ~np.isclose(scores, posts["hot_score"], rtol=1e-4, atol=1e-9)
+    updated = _set_hot_scores(posts["pk"][changed], scores[changed], chunk_size)
+
+    # Posts which left the window are not hot anymore
+    updated += (
+        Post.objects.filter(status=PostStatus.PUBLISHED, published_at__lt=window_start)
+        .exclude(hot_score=0)
+        .update(hot_score=0)
+    )
+    return updated
+
+
+def decay_comments_velocity(threshold: float = 0.01) -> int:
+    """Decay comments velocity of the posts to the current moment.
+
+    Velocity which dropped below the threshold is reset to zero, so such posts are
+    not touched by the next runs. Returns number of updated posts.
+    """
+    now = timezone.now()
+    decayed = get_decayed_comments_velocity(now)
+    return Post.objects.filter(
+        status=PostStatus.PUBLISHED, comments_velocity__gt=0
+    ).update(
+        comments_velocity=Case(
+            When(LessThan(decayed, threshold), then=Value(0.0)), default=decayed
+        ),
+        comments_velocity_updated_at=now,
+    )
+
+
+def _set_hot_scores(pks: np.ndarray, scores: np.ndarray, chunk_size: int) -> int:
+    qn = connection.ops.quote_name
+    opts = Post._meta
+    sql = (
+        f"UPDATE {qn(opts.db_table)} AS p SET {qn(opts.get_field('hot_score').column)}"
+        " = v.hot_score FROM unnest(%s::bigint[], %s::double precision[])"
+        " AS v (id, hot_score) WHERE p.id = v.id"
+    )
+    updated = 0
+    with connection.cursor() as cursor:
+        for start in range(0, len(pks), chunk_size):
+            cursor.execute(
+                sql,
+                [
+                    pks[start : start + chunk_size].tolist(),
+                    scores[start : start + chunk_size].tolist(),
+                ],
+            )
+            updated += cursor.rowcount
+    return updated
+
+
+def _get_post_subscribers_sources(post: Post) -> list[tuple[str, int]]:
+    """Return SQL selecting subscribers as ``s.user_id`` and its ``source_id``."""
+    qn = connection.ops.quote_name
+    sources = []
+    followers_count = (
+        UserPublic.objects.filter(pk=post.user_id)
+        .values_list("followers_count", flat=True)
+        .get()
+    )
+    if followers_count <= get_timeline_fanout_max_followers():
+        sources.append(
+            (
+                f"SELECT s.user_id FROM {qn(UserRelation._meta.db_table)} AS s "
+                "WHERE s.related_user_id = %(source_id)s AND s.status = %(followed)s "
+                "AND (s.active_until IS NULL OR s.active_until >= CURRENT_DATE)",
+                post.user_id,
+            )
+        )
+    if post.community_id:
+        sources.append(
+            (
+                f"SELECT s.user_id FROM {qn(UserCommunity._meta.db_table)} AS s "
+                "WHERE s.community_id = %(source_id)s",
+                post.community_id,
+            )
+        )
+    sources.extend(
+        (
+            f"SELECT s.user_id FROM {qn(UserTag._meta.db_table)} AS s "
+            "WHERE s.tag_id = %(source_id)s AND s.status = %(tag_subscribed)s",
+            tag_id,
+        )
+        for tag_id in post.tags.values_list("pk", flat=True)
+    )
+    return sources
+
+
+def fan_out_post(post: Post) -> int:
+    """Deliver published post to timelines of its subscribers.
+
+    Subscribers are followers of the author, unless author has too many of them,
+    and subscribers of post's community and tags. Users who blocked the author
+    don't get the post. Every source of subscribers is read in batches by range
+    scan of its index, each batch is a separate statement, so big communities and
+    tags don't hold one long transaction. Returns number of timelines post has been
+    added to.
+    """
+    qn = connection.ops.quote_name
+    relations_table = qn(UserRelation._meta.db_table)
+    active_relation_sql = "(r.active_until IS NULL OR r.active_until >= CURRENT_DATE)"
+    params = {
+        "post_id": post.pk,
+        "published_at": post.published_at,
+        "author_id": post.user_id,
+        "followed": UserRelationStatus.SUBSCRIBED,
+        "blocked": UserRelationStatus.BLOCKED,
+        "tag_subscribed": TagStatus.SUBSCRIBED,
+    }
+    added = 0
+    for subscribers_sql, source_id in _get_post_subscribers_sources(post):
+        sql = f"""
+            WITH batch AS (
+                {subscribers_sql} AND s.user_id > %(after)s
+                ORDER BY s.user_id LIMIT %(batch_size)s
+            ), added AS (
+                INSERT INTO {qn(TimelineEntry._meta.db_table)}
+                    (user_id, post_id, published_at)
+                SELECT batch.user_id, %(post_id)s::bigint, %(published_at)s::timestamptz
+                FROM batch
+                WHERE batch.user_id != %(author_id)s AND NOT EXISTS (
+                    SELECT 1 FROM {relations_table} AS r
+                    WHERE r.user_id = batch.user_id
+                        AND r.related_user_id = %(author_id)s
+                        AND r.status = %(blocked)s AND {active_relation_sql}
+                )
+                ON CONFLICT (user_id, post_id) DO NOTHING
+                RETURNING 1
+            )
+            SELECT (SELECT max(user_id) FROM batch), (SELECT count(*) FROM added)
+        """
+        after = 0
+        while after is not None:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    sql,
+                    {
+                        **params,
+                        "source_id": source_id,
+                        "after": after,
+                        "batch_size": get_timeline_fanout_batch_size(),
+                    },
+                )
+                after, batch_added = cursor.fetchone()
+            added += batch_added
+    return added
+
+
+def fan_out_pending_posts() -> int:
+    """Deliver posts waiting for fan-out to timelines of their subscribers.
+
+    Posts are delivered in order of publishing and forgotten only after delivery,
+    so posts left by failed run are delivered by the next one. Delivery of the same
+    post twice adds nothing, so concurrent runs are harmless. Posts deleted before
+    delivery are skipped. Returns number of delivered posts.
+    """
+    delivered = 0
+    for pending in PendingFanOut.objects.select_related("post").order_by("pk"):
+        if pending.post.status == PostStatus.PUBLISHED:
+            fan_out_post(pending.post)
+            delivered += 1
+        pending.delete()
+    return delivered
+
+
+def trim_timelines() -> int:
+    """Remove posts older than retention period from timelines."""
+    deleted, _ = TimelineEntry.objects.filter(
+        published_at__lt=get_timeline_retention_start()
+    ).delete()
+    return deleted
+
+
+def invalidate_posts_feeds_cache():
+    """Invalidate cached responses of posts feeds."""
+    bump_cache_version(POSTS_FEEDS_CACHE_VERSION_KEY)
+
+
+def invalidate_post_cache(post: Post):
+    """Invalidate cached responses with details of the post."""
+    bump_cache_version(get_post_cache_version_key(post.uuid))
+
+
+def bookmark_post(post: Post, actor: UserPublic):
+    """Bookmark the post, does nothing if it's already bookmarked."""
+    Bookmark.objects.bulk_create([Bookmark(user=actor, post=post)], ignore_conflicts=True)
+
+
+def unbookmark_post(post: Post, actor: UserPublic):
+    """Remove the post from bookmarks, does nothing if it isn't bookmarked."""
+    Bookmark.objects.filter(user=actor, post=post).delete()
+
+
+def sync_posts_tag_names(post_ids: list[int]) -> int:
+    """Copy names of posts' tags into their ``tag_names``, return number of posts."""
+    tag_names = Tag.objects.filter(post=OuterRef("pk")).order_by("name").values("name")
+    return Post.objects.filter(pk__in=post_ids).update(tag_names=ArraySubquery(tag_names))
 
 
 def publish_post(post: Post, actor: UserPublic) -> Post:
@@ -97,6 +461,10 @@ def publish_post(post: Post, actor: UserPublic) -> Post:
         post.status = PostStatus.PUBLISHED
         post.published_at = timezone.now()
         post.save()
+        # fan-out takes a while for big communities and tags, so it's done by
+        # ``fan_out_posts`` worker and response doesn't depend on number of readers
+        PendingFanOut.objects.create(post=post)
+        transaction.on_commit(invalidate_posts_feeds_cache)
 
     return post
 
@@ -118,3 +486,7 @@ def delete_post(post: Post, actor: UserPublic):
     logger.info("Post %s deleted by %s", post, actor)
     post.status = PostStatus.DELETED
     post.save()
+    TopPost.objects.filter(post=post).delete()
+    TimelineEntry.objects.filter(post=post).delete()
+    transaction.on_commit(invalidate_posts_feeds_cache)
+    transaction.on_commit(partial(invalidate_post_cache, post))
@@ -0,0 +1,55 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from posts.models import Post, Tag
+from posts.services import sync_posts_tag_names
+from users.models import UserTag
+from users.services import invalidate_viewer_filters
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def sync_tag_names_on_tags_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep denormalized tag names of posts in sync with their tags."""
+    if reverse and action == "pre_clear":
+        # posts of the tag are unknown once it's cleared, so they are kept till then
+        instance._cleared_post_ids = list(instance.post_set.values_list("pk", flat=True))
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        post_ids = [instance.pk]
+    elif action == "post_clear":
+        post_ids = instance.__dict__.pop("_cleared_post_ids", [])
+    else:
+        post_ids = list(pk_set)
+    sync_posts_tag_names(post_ids)
+    if not reverse:
+        instance.refresh_from_db(fields=["tag_names"])
+
+
+@receiver(post_save, sender=Tag)
+def sync_tag_names_on_tag_rename(sender, instance, created, update_fields=None, **kwargs):
+    """Put new name of the tag into tag names of its posts."""
+    if created or (update_fields is not None and "name" not in update_fields):
+        return
+    sync_posts_tag_names(list(instance.post_set.values_list("pk", flat=True)))
+    invalidate_viewer_filters(*_get_tag_user_ids(instance))
+
+
+@receiver(pre_delete, sender=Tag)
+def remember_posts_of_deleted_tag(sender, instance, **kwargs):
+    """Keep posts and users of the tag, its links to them are gone once it's deleted."""
+    instance._deleted_post_ids = list(instance.post_set.values_list("pk", flat=True))
+    instance._deleted_user_ids = _get_tag_user_ids(instance)
+
+
+@receiver(post_delete, sender=Tag)
+def sync_tag_names_on_tag_delete(sender, instance, **kwargs):
+    """Remove name of deleted tag from tag names of its posts."""
+    sync_posts_tag_names(instance.__dict__.pop("_deleted_post_ids", []))
+    invalidate_viewer_filters(*instance.__dict__.pop("_deleted_user_ids", []))
+
+
+def _get_tag_user_ids(tag: Tag) -> list[int]:
+    # viewer filters of these users keep tag names, see users.selectors
+    return list(UserTag.objects.filter(tag=tag).values_list("user_id", flat=True))
@@ -19,3 +19,10 @@ class PostVoteFactory(DjangoModelFactory):
 
     class Meta:
         model = "posts.PostVote"
+
+
+class TagFactory(DjangoModelFactory):
+    name = factory.Sequence(lambda n: f"tag{n}")
+
+    class Meta:
+        model = "posts.Tag"
@@ -0,0 +1,63 @@
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from posts.choices import PostStatus, Vote
+from posts.services import publish_post, record_vote_for_post
+from posts.tests.factories import PostFactory
+from users.tests.factories import UserPublicFactory
+
+
+@pytest.mark.django_db
+class TestAnonymousCache:
+    def setup(self):
+        self.post = PostFactory(status=PostStatus.PUBLISHED)
+
+    def test_anonymous_feed_page_is_cached(
+        self, anon_api_client, django_assert_num_queries
+    ):
+        client = anon_api_client()
+        first_response = client.get(reverse("v1:posts:posts-list"))
+
+        with django_assert_num_queries(0):
+            cached_response = client.get(reverse("v1:posts:posts-list"))
+
+        assert cached_response.status_code == status.HTTP_200_OK
+        assert cached_response.content == first_response.content
+        assert "Authorization" in cached_response["Vary"]
+
+    def test_authenticated_requests_bypass_cache(
+        self, anon_api_client, authed_api_client
+    ):
+        anon_api_client().get(reverse("v1:posts:posts-list"))
+        PostFactory(status=PostStatus.PUBLISHED)
+
+        result = authed_api_client(UserPublicFactory()).get(
+            reverse("v1:posts:posts-list")
+        )
+
+        assert len(result.data["results"]) == 2
+
+    def test_publishing_invalidates_feeds(
+        self, anon_api_client, django_capture_on_commit_callbacks
+    ):
+        client = anon_api_client()
+        client.get(reverse("v1:posts:posts-list"))
+        draft = PostFactory()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            publish_post(draft, draft.user)
+
+        assert len(client.get(reverse("v1:posts:posts-list")).data["results"]) == 2
+
+    def test_vote_invalidates_post_detail(
+        self, anon_api_client, django_capture_on_commit_callbacks
+    ):
+        client = anon_api_client()
+        url = reverse("v1:posts:posts-detail", kwargs={"uuid": self.post.uuid})
+        client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            record_vote_for_post(self.post, UserPublicFactory(), Vote.UPVOTE)
+
+        assert client.get(url).json()["rating"] == 1
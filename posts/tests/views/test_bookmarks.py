@@ -0,0 +1,62 @@
+import uuid
+
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from posts.choices import PostStatus
+from posts.models import Bookmark
+from posts.services import delete_post
+from posts.tests.factories import PostFactory
+from users.tests.factories import UserPublicFactory
+
+
+@pytest.mark.django_db
+class TestBookmarks:
+    def setup(self):
+        self.user = UserPublicFactory()
+        self.posts = PostFactory.create_batch(3, status=PostStatus.PUBLISHED)
+
+    def test_bookmark_is_idempotent(self, authed_api_client):
+        client = authed_api_client(self.user)
+
+        for _ in range(2):
+            result = self._bookmark(client, self.posts[0])
+            assert result.status_code == status.HTTP_204_NO_CONTENT
+
+        assert Bookmark.objects.filter(user=self.user, post=self.posts[0]).count() == 1
+
+    def test_unbookmark_is_idempotent(self, authed_api_client):
+        client = authed_api_client(self.user)
+        self._bookmark(client, self.posts[0])
+
+        for _ in range(2):
+            result = self._bookmark(client, self.posts[0], method="delete")
+            assert result.status_code == status.HTTP_204_NO_CONTENT
+
+        assert not Bookmark.objects.filter(user=self.user).exists()
+
+    def test_bookmarks_feed(self, authed_api_client):
+        client = authed_api_client(self.user)
+        for post in (self.posts[1], self.posts[0], self.posts[2]):
+            self._bookmark(client, post)
+        self._bookmark(authed_api_client(UserPublicFactory()), self.posts[1])
+        client = authed_api_client(self.user)
+        delete_post(self.posts[2], self.posts[2].user)
+
+        result = client.get(reverse("v1:posts:posts-bookmarks"))
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        assert [uuid.UUID(post["uuid"]) for post in result.data["results"]] == [
+            self.posts[0].uuid,
+            self.posts[1].uuid,
+        ]
+        assert all(post["viewer"]["bookmarked"] for post in result.data["results"])
+
+    def test_cant_bookmark_as_anonymous(self, anon_api_client):
+        result = self._bookmark(anon_api_client(), self.posts[0])
+        assert result.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def _bookmark(self, client, post, method="post"):
+        url = reverse("v1:posts:posts-bookmark", kwargs={"uuid": post.uuid})
+        return getattr(client, method)(url)
@@ -0,0 +1,83 @@
+import datetime
+import uuid
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from posts.choices import PostStatus
+from posts.tests.factories import PostFactory
+from users.tests.factories import UserPublicFactory
+
+
+@pytest.mark.django_db
+class TestDiscussedPosts:
+    def setup(self):
+        self.commenter = UserPublicFactory()
+        self.busy_post = PostFactory(status=PostStatus.PUBLISHED)
+        self.quiet_post = PostFactory(status=PostStatus.PUBLISHED)
+        self.not_commented_post = PostFactory(status=PostStatus.PUBLISHED)
+
+    def test_comments_update_post_activity(self, authed_api_client, settings):
+        settings.COMMENTS_VELOCITY_HALF_LIFE_HOURS = 1
+        started_at = timezone.now()
+
+        with freeze_time(started_at):
+            self._comment(authed_api_client(self.commenter), self.busy_post)
+        with freeze_time(started_at + datetime.timedelta(hours=1)):
+            self._comment(authed_api_client(self.commenter), self.busy_post)
+
+        self.busy_post.refresh_from_db()
+        assert self.busy_post.comments_velocity == pytest.approx(1.5)
+        assert self.busy_post.last_comment_at == started_at + datetime.timedelta(hours=1)
+
+    def test_feeds(self, authed_api_client):
+        client = authed_api_client(self.commenter)
+        self._comment(client, self.busy_post)
+        self._comment(client, self.busy_post)
+        self._comment(client, self.quiet_post)
+
+        assert self._feed(client, "discussed") == [
+            self.busy_post.uuid,
+            self.quiet_post.uuid,
+            self.not_commented_post.uuid,
+        ]
+        assert self._feed(client, "active") == [
+            self.quiet_post.uuid,
+            self.busy_post.uuid,
+        ]
+
+    def test_velocity_decays_over_time(self, settings):
+        settings.COMMENTS_VELOCITY_HALF_LIFE_HOURS = 1
+        now = timezone.now()
+        self.busy_post.comments_velocity = 4
+        self.busy_post.comments_velocity_updated_at = now - datetime.timedelta(hours=2)
+        self.busy_post.save()
+        self.quiet_post.comments_velocity = 0.001
+        self.quiet_post.comments_velocity_updated_at = now
+        self.quiet_post.save()
+
+        out = StringIO()
+        call_command("decay_comments_velocity", stdout=out)
+
+        assert "Decayed comments velocity of 2 posts" in out.getvalue()
+        self.busy_post.refresh_from_db()
+        self.quiet_post.refresh_from_db()
+        assert self.busy_post.comments_velocity == pytest.approx(1, rel=1e-3)
+        assert self.quiet_post.comments_velocity == 0
+
+    def _comment(self, client, post):
+        result = client.post(
+            reverse("v1:comments:comments-list"),
+            data={"post": post.uuid, "content": "test comment"},
+        )
+        assert result.status_code == status.HTTP_201_CREATED, result.content.decode()
+
+    def _feed(self, client, name):
+        result = client.get(reverse(f"v1:posts:posts-{name}"))
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        return [uuid.UUID(post["uuid"]) for post in result.data["results"]]
@@ -0,0 +1,162 @@
+import io
+import uuid
+
+import pytest
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from common.api.pagination import KeysetPagination
+from communities.tests.factories import CommunityFactory
+from posts.models import PendingFanOut, TimelineEntry
+from posts.services import delete_post, fan_out_pending_posts, publish_post
+from posts.tests.factories import PostFactory, TagFactory
+from users.choices import UserRelationStatus
+from users.tests.factories import (
+    UserCommunityFactory,
+    UserPublicFactory,
+    UserRelationFactory,
+    UserTagFactory,
+)
+
+
+@pytest.mark.django_db
+class TestHomeFeed:
+    @pytest.fixture(autouse=True)
+    def _capture_on_commit_callbacks(self, django_capture_on_commit_callbacks):
+        self.capture_on_commit_callbacks = django_capture_on_commit_callbacks
+
+    def setup(self):
+        self.reader = UserPublicFactory()
+        self.followed_author = UserPublicFactory()
+        UserRelationFactory(user=self.reader, related_user=self.followed_author)
+        self.community = CommunityFactory()
+        UserCommunityFactory(user=self.reader, community=self.community)
+        self.tag = TagFactory()
+        UserTagFactory(user=self.reader, tag=self.tag)
+
+    def test_subscriptions_are_delivered_to_timeline(self, authed_api_client):
+        by_followed_author = self._publish(PostFactory(user=self.followed_author))
+        in_community = self._publish(PostFactory(community=self.community))
+        with_tag = PostFactory()
+        with_tag.tags.add(self.tag)
+        self._publish(with_tag)
+        self._publish(PostFactory())
+
+        assert self._feed(authed_api_client(self.reader)) == [
+            with_tag.uuid,
+            in_community.uuid,
+            by_followed_author.uuid,
+        ]
+
+    def test_blocked_author_posts_are_not_delivered(self, authed_api_client):
+        blocked_author = UserPublicFactory()
+        UserRelationFactory(
+            user=self.reader,
+            related_user=blocked_author,
+            status=UserRelationStatus.BLOCKED,
+        )
+        self._publish(PostFactory(user=blocked_author, community=self.community))
+
+        assert self._feed(authed_api_client(self.reader)) == []
+
+    def test_popular_author_posts_are_merged_on_read(self, authed_api_client, settings):
+        settings.TIMELINE_FANOUT_MAX_FOLLOWERS = 1
+        UserRelationFactory(related_user=self.followed_author)
+        popular_author_post = self._publish(PostFactory(user=self.followed_author))
+        in_community = self._publish(PostFactory(community=self.community))
+
+        assert not TimelineEntry.objects.filter(post=popular_author_post).exists()
+        assert self._feed(authed_api_client(self.reader)) == [
+            in_community.uuid,
+            popular_author_post.uuid,
+        ]
+
+    def test_popular_author_post_in_timeline_is_shown_once(
+        self, authed_api_client, settings
+    ):
+        settings.TIMELINE_FANOUT_MAX_FOLLOWERS = 1
+        UserRelationFactory(related_user=self.followed_author)
+        in_community = self._publish(
+            PostFactory(user=self.followed_author, community=self.community)
+        )
+
+        assert self._feed(authed_api_client(self.reader)) == [in_community.uuid]
+
+    def test_merged_feed_is_paginated(self, authed_api_client, settings, monkeypatch):
+        monkeypatch.setattr(KeysetPagination, "page_size", 2)
+        settings.TIMELINE_FANOUT_MAX_FOLLOWERS = 1
+        UserRelationFactory(related_user=self.followed_author)
+        posts = [
+            self._publish(PostFactory(user=self.followed_author))
+            if i % 2
+            else self._publish(PostFactory(community=self.community))
+            for i in range(5)
+        ]
+        client = authed_api_client(self.reader)
+
+        uuids, url = [], reverse("v1:posts:posts-feed")
+        while url:
+            result = client.get(url)
+            assert result.status_code == status.HTTP_200_OK, result.content.decode()
+            uuids.extend(uuid.UUID(post["uuid"]) for post in result.data["results"])
+            url = result.data["next"]
+
+        assert uuids == [post.uuid for post in reversed(posts)]
+
+    def test_fan_out_is_done_in_batches(self, authed_api_client, settings):
+        settings.TIMELINE_FANOUT_BATCH_SIZE = 2
+        readers = [self.reader, *UserPublicFactory.create_batch(4)]
+        for reader in readers[1:]:
+            UserCommunityFactory(user=reader, community=self.community)
+
+        post = self._publish(PostFactory(community=self.community))
+
+        assert set(
+            TimelineEntry.objects.filter(post=post).values_list("user_id", flat=True)
+        ) == {reader.pk for reader in readers}
+
+    def test_post_is_delivered_by_worker(self, authed_api_client):
+        post = PostFactory(user=self.followed_author)
+
+        result = authed_api_client(post.user).post(
+            reverse("v1:posts:my-posts-publish", kwargs={"uuid": post.uuid})
+        )
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        assert not TimelineEntry.objects.filter(post=post).exists()
+        call_command("fan_out_posts", stdout=io.StringIO())
+        assert TimelineEntry.objects.filter(post=post, user=self.reader).exists()
+        assert not PendingFanOut.objects.exists()
+
+    def test_post_deleted_before_delivery_is_skipped(self):
+        post = PostFactory(user=self.followed_author)
+        publish_post(post, post.user)
+        delete_post(post, post.user)
+
+        assert fan_out_pending_posts() == 0
+        assert not TimelineEntry.objects.filter(post=post).exists()
+        assert not PendingFanOut.objects.exists()
+
+    def test_deleted_post_removed_from_timelines(self, authed_api_client):
+        post = self._publish(PostFactory(user=self.followed_author))
+
+        delete_post(post, self.followed_author)
+
+        assert not TimelineEntry.objects.filter(post=post).exists()
+        assert self._feed(authed_api_client(self.reader)) == []
+
+    def test_cant_read_feed_as_anonymous(self, anon_api_client):
+        result = anon_api_client().get(reverse("v1:posts:posts-feed"))
+        assert result.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def _publish(self, post):
+        with self.capture_on_commit_callbacks(execute=True):
+            publish_post(post, post.user)
+        fan_out_pending_posts()
+        return post
+
+    def _feed(self, client):
+        result = client.get(reverse("v1:posts:posts-feed"))
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        return [uuid.UUID(post["uuid"]) for post in result.data["results"]]
@@ -0,0 +1,64 @@
+import datetime
+import uuid
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from posts.choices import PostStatus
+from posts.tests.factories import PostFactory
+
+
+@pytest.mark.django_db
+class TestPopularPosts:
+    def setup(self):
+        self.now = now = timezone.now()
+        self.fresh_post = PostFactory(
+            status=PostStatus.PUBLISHED, published_at=now, rating=10
+        )
+        self.day_old_post = PostFactory(
+            status=PostStatus.PUBLISHED,
+            published_at=now - datetime.timedelta(days=1),
+            rating=50,
+        )
+        self.old_post = PostFactory(
+            status=PostStatus.PUBLISHED,
+            published_at=now - datetime.timedelta(days=30),
+            rating=1000,
+            hot_score=5,
+        )
+
+    def test_posts_ordered_by_hot_score(self, anon_api_client):
+        # ages of the posts are exact, as they are scored at the moment of creation
+        with freeze_time(self.now):
+            assert "Updated hot scores of 3 posts" in self._recalculate()
+
+        self.fresh_post.refresh_from_db()
+        self.day_old_post.refresh_from_db()
+        self.old_post.refresh_from_db()
+        assert self.fresh_post.hot_score == pytest.approx(10 / 2**1.8)
+        assert self.day_old_post.hot_score == pytest.approx(50 / 26**1.8)
+        assert self.old_post.hot_score == 0
+        result = anon_api_client().get(reverse("v1:posts:posts-popular"))
+        assert result.status_code == status.HTTP_200_OK
+        assert [uuid.UUID(post["uuid"]) for post in result.data["results"]] == [
+            self.fresh_post.uuid,
+            self.day_old_post.uuid,
+            self.old_post.uuid,
+        ]
+
+    def test_only_changed_scores_are_updated(self):
+        self._recalculate()
+        self.day_old_post.rating = 100
+        self.day_old_post.save()
+
+        assert "Updated hot scores of 1 posts" in self._recalculate()
+
+    def _recalculate(self):
+        out = StringIO()
+        call_command("recalculate_hot_scores", stdout=out)
+        return out.getvalue()
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import DataError
+from django.test import AsyncClient
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from comments.tests.factories import CommentFactory
+from common.pubsub import LocalPubSub
+from posts.choices import PostStatus, Vote
+from posts.tests.factories import PostFactory
+from users.tests.factories import UserPublicFactory
+
+# event loop wakes itself up through socket pair
+pytestmark = pytest.mark.enable_socket
+
+
+@pytest.mark.django_db
+class TestPostEvents:
+    @pytest.fixture(autouse=True)
+    def local_pubsub(self, settings):
+        # notifications of Postgres are sent on commit, and test transaction never ends
+        settings.PUBSUB_BACKEND = "local"
+
+    def setup(self):
+        self.post = PostFactory(status=PostStatus.PUBLISHED)
+        self.user = UserPublicFactory()
+
+    def test_new_comment_is_streamed(
+        self, authed_api_client, django_capture_on_commit_callbacks
+    ):
+        parent = CommentFactory(post=self.post, user=self.user)
+
+        def post_comment():
+            with django_capture_on_commit_callbacks(execute=True):
+                return authed_api_client(self.user).post(
+                    reverse("v1:comments:comments-list"),
+                    data={"post": self.post.uuid, "parent": parent.uuid, "content": "hi"},
+                )
+
+        result, [event] = self._stream_events(post_comment)
+
+        assert result.status_code == status.HTTP_201_CREATED
+        assert event["event"] == "comment"
+        assert event["data"]["uuid"] == str(result.data["uuid"])
+        assert event["data"] == {
+            "uuid": str(result.data["uuid"]),
+            "parent": str(parent.uuid),
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_long_comment_is_published_with_postgres_pubsub(
+        self, authed_api_client, settings, caplog
+    ):
+        settings.PUBSUB_BACKEND = "postgres"
+
+        result = authed_api_client(self.user).post(
+            reverse("v1:comments:comments-list"),
+            data={"post": self.post.uuid, "content": "привет " * 250},
+        )
+
+        assert result.status_code == status.HTTP_201_CREATED, result.content.decode()
+        assert not [record for record in caplog.records if record.levelname == "ERROR"]
+
+    def test_failed_publish_doesnt_fail_request(
+        self, authed_api_client, django_capture_on_commit_callbacks, monkeypatch
+    ):
+        def fail(*args):
+            raise DataError("payload string too long")
+
+        monkeypatch.setattr(LocalPubSub, "publish", fail)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            result = authed_api_client(self.user).post(
+                reverse("v1:comments:comments-list"),
+                data={"post": self.post.uuid, "content": "hi"},
+            )
+
+        assert result.status_code == status.HTTP_201_CREATED, result.content.decode()
+
+    def test_rating_deltas_are_streamed(
+        self, authed_api_client, django_capture_on_commit_callbacks
+    ):
+        comment = CommentFactory(post=self.post, user=self.user)
+        client = authed_api_client(UserPublicFactory())
+
+        def vote():
+            with django_capture_on_commit_callbacks(execute=True):
+                return [
+                    client.post(
+                        reverse("v1:posts:posts-vote", kwargs={"uuid": self.post.uuid}),
+                        data={"value": Vote.DOWNVOTE},
+                    ).status_code,
+                    client.post(
+                        reverse(
+                            "v1:comments:comments-vote", kwargs={"uuid": comment.uuid}
+                        ),
+                        data={"value": Vote.UPVOTE},
+                    ).status_code,
+                ]
+
+        statuses, events = self._stream_events(vote, count=2)
+
+        assert statuses == [status.HTTP_201_CREATED, status.HTTP_201_CREATED]
+
+        assert events == [
+            {
+                "event": "post_rating",
+                "data": {
+                    "uuid": str(self.post.uuid),
+                    "rating": -1,
+                    "votes_up_count": 0,
+                    "votes_down_count": 1,
+                },
+            },
+            {
+                "event": "comment_rating",
+                "data": {
+                    "uuid": str(comment.uuid),
+                    "rating": 1,
+                    "votes_up_count": 1,
+                    "votes_down_count": 0,
+                },
+            },
+        ]
+
+    def test_heartbeat_and_end_of_stream(self, settings):
+        settings.POST_EVENTS_HEARTBEAT_SECONDS = 0.01
+        settings.POST_EVENTS_STREAM_SECONDS = 0.05
+
+        async def read_stream():
+            response = await AsyncClient().get(self._get_url(self.post.uuid))
+            return response, [
+                chunk.decode() async for chunk in response.streaming_content
+            ]
+
+        response, chunks = async_to_sync(read_stream)()
+
+        assert response["Content-Type"] == "text/event-stream"
+        assert chunks[0] == f"retry: {settings.POST_EVENTS_RETRY_MILLISECONDS}\n\n"
+        assert set(chunks[1:]) == {": heartbeat\n\n"}
+
+    @pytest.mark.parametrize("post_status", [PostStatus.DRAFT, PostStatus.DELETED, None])
+    def test_only_published_posts_are_streamed(self, post_status):
+        post_uuid = PostFactory(status=post_status).uuid if post_status else uuid.uuid4()
+
+        async def get_stream():
+            return await AsyncClient().get(self._get_url(post_uuid))
+
+        assert async_to_sync(get_stream)().status_code == status.HTTP_404_NOT_FOUND
+
+    def test_stream_is_refused_by_wsgi_server(self, anon_api_client):
+        result = anon_api_client().get(self._get_url(self.post.uuid))
+
+        assert result.status_code == status.HTTP_501_NOT_IMPLEMENTED
+
+    def _stream_events(self, action, count=1):
+        async def read_events():
+            response = await AsyncClient().get(self._get_url(self.post.uuid))
+            chunks = aiter(response.streaming_content)
+            assert (await anext(chunks)).startswith(b"retry:")
+            result = await sync_to_async(action)()
+            events = []
+            while len(events) < count:
+                chunk = (await asyncio.wait_for(anext(chunks), 5)).decode()
+                if chunk.startswith("event:"):
+                    event, data = chunk.strip().split("\n")
+                    events.append(
+                        {
+                            "event": event.removeprefix("event: "),
+                            "data": json.loads(data.removeprefix("data: ")),
+                        }
+                    )
+            await chunks.aclose()
+            return result, events
+
+        return async_to_sync(read_events)()
+
+    def _get_url(self, post_uuid):
+        return reverse("v1:posts:posts-events", kwargs={"uuid": post_uuid})
@@ -0,0 +1,63 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from funcy import first
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from posts.choices import PostStatus
+from posts.models import Post
+from posts.tests.factories import PostFactory
+
+
+@pytest.mark.django_db
+class TestPostListProjection:
+    def setup(self):
+        self.content = [
+            {"type": "header", "content": "Header"},
+            {"type": "image", "content": "https://example.com/cover.png"},
+            {"type": "paragraph", "content": "Some <b>bold</b> " + "word " * 400},
+            {"type": "image", "content": "https://example.com/other.png"},
+        ]
+        self.post = PostFactory(content=self.content, status=PostStatus.PUBLISHED)
+
+    def test_preview_is_derived_from_content(self):
+        assert self.post.excerpt.startswith("Header Some bold word word")
+        assert len(self.post.excerpt) == 300
+        assert self.post.cover_image == "https://example.com/cover.png"
+        assert self.post.reading_time_minutes == 3
+
+        self.post.content = [{"type": "paragraph", "content": "Short"}]
+        self.post.save()
+        self.post.refresh_from_db()
+        assert (self.post.excerpt, self.post.cover_image) == ("Short", "")
+        assert self.post.reading_time_minutes == 1
+
+    def test_preview_is_saved_with_content_only(self):
+        self.post.content = [{"type": "paragraph", "content": "Short"}]
+        self.post.save(update_fields=["content"])
+
+        self.post.refresh_from_db()
+        assert (self.post.excerpt, self.post.cover_image) == ("Short", "")
+        assert self.post.reading_time_minutes == 1
+
+    def test_feed_returns_preview_without_content(self, anon_api_client):
+        with CaptureQueriesContext(connection) as queries:
+            result = anon_api_client().get(reverse("v1:posts:posts-list"))
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        post = first(result.data["results"])
+        assert "content" not in post
+        assert post["excerpt"] == self.post.excerpt
+        assert post["cover_image"] == self.post.cover_image
+        assert post["reading_time_minutes"] == 3
+        content_column = Post._meta.get_field("content").column
+        assert not any(f'."{content_column}"' in query["sql"] for query in queries)
+
+    def test_detail_returns_full_content(self, anon_api_client):
+        result = anon_api_client().get(
+            reverse("v1:posts:posts-detail", kwargs={"uuid": self.post.uuid})
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert result.data["content"] == self.content
@@ -0,0 +1,94 @@
+import pytest
+from django.utils.http import urlencode
+from funcy import first
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from comments.tests.factories import CommentFactory, CommentVoteFactory
+from posts.choices import PostStatus, Vote
+from posts.tests.factories import PostFactory, PostVoteFactory
+from users.choices import UserRelationStatus
+from users.tests.factories import UserNoteFactory, UserPublicFactory, UserRelationFactory
+
+
+@pytest.mark.django_db
+class TestPostViewerContext:
+    def setup(self):
+        self.viewer = UserPublicFactory()
+        self.followed_author = UserPublicFactory()
+        UserRelationFactory(
+            user=self.viewer,
+            related_user=self.followed_author,
+            status=UserRelationStatus.SUBSCRIBED,
+        )
+        UserNoteFactory(author=self.viewer, user_about=self.followed_author)
+        self.post = PostFactory(user=self.followed_author, status=PostStatus.PUBLISHED)
+        PostVoteFactory(post=self.post, user=self.viewer, value=Vote.DOWNVOTE)
+
+    def test_viewer_context_in_posts_list(self, authed_api_client):
+        other_post = PostFactory(status=PostStatus.PUBLISHED)
+
+        result = authed_api_client(self.viewer).get(reverse("v1:posts:posts-list"))
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        viewer_by_uuid = {post["uuid"]: post["viewer"] for post in result.data["results"]}
+        assert viewer_by_uuid[str(self.post.uuid)] == {
+            "vote": Vote.DOWNVOTE,
+            "bookmarked": False,
+            "author_relation": UserRelationStatus.SUBSCRIBED,
+            "has_author_note": True,
+        }
+        assert viewer_by_uuid[str(other_post.uuid)] == {
+            "vote": None,
+            "bookmarked": False,
+            "author_relation": None,
+            "has_author_note": False,
+        }
+
+    def test_viewer_context_in_post_detail(self, authed_api_client):
+        result = authed_api_client(self.viewer).get(
+            reverse("v1:posts:posts-detail", kwargs={"uuid": self.post.uuid})
+        )
+        assert result.data["viewer"]["vote"] == Vote.DOWNVOTE
+
+    def test_viewer_context_queries_dont_depend_on_page_size(
+        self, authed_api_client, django_assert_num_queries
+    ):
+        client = authed_api_client(self.viewer)
+        # warm up cached viewer filters
+        client.get(reverse("v1:posts:posts-list"))
+        # user, posts and four viewer context queries
+        with django_assert_num_queries(6):
+            client.get(reverse("v1:posts:posts-list"))
+
+        PostFactory.create_batch(10, status=PostStatus.PUBLISHED)
+        with django_assert_num_queries(6):
+            client.get(reverse("v1:posts:posts-list"))
+
+    def test_anonymous_viewer_context_is_empty(self, anon_api_client):
+        result = anon_api_client().get(reverse("v1:posts:posts-list"))
+        assert first(result.data["results"])["viewer"] == {
+            "vote": None,
+            "bookmarked": False,
+            "author_relation": None,
+            "has_author_note": False,
+        }
+
+    def test_viewer_context_in_comments_tree(self, authed_api_client):
+        root = CommentFactory(post=self.post)
+        child = CommentFactory(post=self.post, parent=root, user=self.followed_author)
+        CommentVoteFactory(comment=child, user=self.viewer, value=Vote.UPVOTE)
+
+        url = reverse("v1:comments:comments-list")
+        result = authed_api_client(self.viewer).get(
+            f"{url}?{urlencode({'post': self.post.uuid})}"
+        )
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        root_data = first(result.data["results"])
+        assert root_data["viewer"]["vote"] is None
+        assert first(root_data["children"])["viewer"] == {
+            "vote": Vote.UPVOTE,
+            "author_relation": UserRelationStatus.SUBSCRIBED,
+            "has_author_note": True,
+        }
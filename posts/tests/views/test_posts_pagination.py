@@ -0,0 +1,75 @@
+import uuid
+
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from common.api.pagination import KeysetPagination
+from posts.choices import PostStatus, TopPostsWindow
+from posts.models import Post
+from posts.services import rebuild_top_posts
+from posts.tests.factories import PostFactory
+
+
+@pytest.mark.django_db
+class TestPostsPagination:
+    def setup(self):
+        self.posts = PostFactory.create_batch(5, status=PostStatus.PUBLISHED)
+        # the same creation time for all posts, so the order is defined by id only
+        Post.objects.update(created_at=self.posts[0].created_at)
+
+    @pytest.fixture(autouse=True)
+    def small_pages(self, monkeypatch):
+        monkeypatch.setattr(KeysetPagination, "page_size", 2)
+
+    def test_walk_through_pages(self, anon_api_client):
+        pages = self._walk(anon_api_client(), reverse("v1:posts:posts-list"))
+
+        assert pages == [
+            [self.posts[4].uuid, self.posts[3].uuid],
+            [self.posts[2].uuid, self.posts[1].uuid],
+            [self.posts[0].uuid],
+        ]
+
+    def test_walk_through_ranked_feed(self, anon_api_client):
+        for post, rating in zip(self.posts, [3, 5, 5, 1, 5], strict=True):
+            post.rating = rating
+            post.save()
+        rebuild_top_posts(TopPostsWindow.ALL)
+
+        pages = self._walk(
+            anon_api_client(), reverse("v1:posts:posts-top") + "?window=all"
+        )
+
+        assert pages == [
+            [self.posts[4].uuid, self.posts[2].uuid],
+            [self.posts[1].uuid, self.posts[0].uuid],
+            [self.posts[3].uuid],
+        ]
+
+    def test_next_page_costs_the_same(
+        self, anon_api_client, django_assert_max_num_queries
+    ):
+        client = anon_api_client()
+        first_page = client.get(reverse("v1:posts:posts-list"))
+
+        # single query for the page of posts, no count query
+        with django_assert_max_num_queries(1):
+            result = client.get(first_page.data["next"])
+        assert result.status_code == status.HTTP_200_OK
+
+    def test_invalid_cursor(self, anon_api_client):
+        result = anon_api_client().get(
+            reverse("v1:posts:posts-list"), data={"cursor": "not-a-cursor"}
+        )
+        assert result.status_code == status.HTTP_404_NOT_FOUND
+
+    def _walk(self, client, url):
+        pages = []
+        while url:
+            result = client.get(url)
+            assert result.status_code == status.HTTP_200_OK, result.content.decode()
+            assert result.data["has_more"] == bool(result.data["next"])
+            pages.append([uuid.UUID(post["uuid"]) for post in result.data["results"]])
+            url = result.data["next"]
+        return pages
@@ -97,6 +97,17 @@ class TestRecordVoteForPost:
         assert self.voter.votes_up_count == self.voter_original_votes_up_count
         assert self.voter.votes_down_count == self.voter_original_votes_down_count
 
+    def test_vote_recorded_with_constant_number_of_queries(
+        self, authed_api_client, django_assert_max_num_queries
+    ):
+        client = authed_api_client(self.voter)
+        # user, post, single statement to record the vote, top posts
+        # update, plus savepoint queries, because test is already running inside
+        # transaction
+        with django_assert_max_num_queries(6):
+            result = self._vote_for_post(client, self.post, Vote.UPVOTE)
+        assert result.status_code == status.HTTP_201_CREATED
+
     def test_cant_vote_as_anonymous(self, anon_api_client):
         result = self._vote_for_post(anon_api_client(), self.post, Vote.UPVOTE)
         assert result.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import urlencode
+from funcy import first
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from posts.choices import PostStatus
+from posts.models import Post, PostVote
+from posts.tests.factories import PostFactory
+from users.models import UserPublic
+from users.tests.factories import UserPublicFactory
+
+
+@pytest.mark.django_db
+class TestPostSparseFieldsets:
+    def setup(self):
+        self.post = PostFactory(status=PostStatus.PUBLISHED, rating=3)
+
+    def test_only_asked_fields_are_loaded(self, anon_api_client):
+        with CaptureQueriesContext(connection) as queries:
+            result = self._get_posts(anon_api_client(), fields="uuid,title,rating")
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        assert first(result.data["results"]) == {
+            "uuid": str(self.post.uuid),
+            "title": self.post.title,
+            "rating": 3,
+        }
+        [query] = queries
+        assert f'"{Post._meta.db_table}"."excerpt"' not in query["sql"]
+        assert UserPublic._meta.db_table not in query["sql"]
+
+    def test_author_is_loaded_with_post(self, anon_api_client):
+        with CaptureQueriesContext(connection) as queries:
+            result = self._get_posts(anon_api_client(), fields="uuid,author")
+
+        assert first(result.data["results"])["author"] == {
+            "username": self.post.user.username,
+            "avatar": self.post.user.avatar,
+        }
+        assert len(queries) == 1
+
+    def test_excluded_fields_are_left_out(self, authed_api_client):
+        client = authed_api_client(UserPublicFactory())
+
+        with CaptureQueriesContext(connection) as queries:
+            result = self._get_posts(client, exclude="viewer,can_edit")
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        post = first(result.data["results"])
+        assert {"viewer", "can_edit", "excerpt"} & post.keys() == {"excerpt"}
+        # viewer's votes aren't loaded
+        assert not any(PostVote._meta.db_table in query["sql"] for query in queries)
+
+    def test_unknown_field(self, anon_api_client):
+        result = self._get_posts(anon_api_client(), fields="uuid,password")
+
+        assert result.status_code == status.HTTP_400_BAD_REQUEST
+        assert "password" in str(result.data["fields"])
+
+    def test_detail(self, anon_api_client):
+        url = reverse("v1:posts:posts-detail", kwargs={"uuid": self.post.uuid})
+
+        result = anon_api_client().get(f"{url}?fields=slug,can_edit")
+
+        assert result.data == {"slug": self.post.slug, "can_edit": False}
+
+    def _get_posts(self, client, **params):
+        return client.get(f"{reverse('v1:posts:posts-list')}?{urlencode(params)}")
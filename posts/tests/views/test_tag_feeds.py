@@ -0,0 +1,78 @@
+import uuid
+
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from posts.choices import PostStatus
+from posts.models import Post
+from posts.tests.factories import PostFactory, TagFactory
+
+
+@pytest.mark.django_db
+class TestTagFeeds:
+    def setup(self):
+        self.python, self.django, self.go = TagFactory.create_batch(3)
+        self.python_post = self._create_post(self.python)
+        self.django_post = self._create_post(self.python, self.django)
+        self.go_post = self._create_post(self.go)
+
+    def test_posts_with_any_tag(self, anon_api_client):
+        result = anon_api_client().get(
+            reverse("v1:posts:posts-list"), {"tag": f"{self.django.name},{self.go.name}"}
+        )
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        assert self._uuids(result) == [self.go_post.uuid, self.django_post.uuid]
+
+    def test_posts_with_all_tags(self, anon_api_client):
+        result = anon_api_client().get(
+            reverse("v1:posts:posts-list"),
+            {"tag_all": f"{self.python.name},{self.django.name}"},
+        )
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        assert self._uuids(result) == [self.django_post.uuid]
+
+    def test_tag_names_follow_tags(self):
+        self.django_post.tags.remove(self.python)
+        assert self.django_post.tag_names == [self.django.name]
+
+        self.python.post_set.add(self.go_post)
+        self.go_post.refresh_from_db()
+        assert self.go_post.tag_names == sorted([self.go.name, self.python.name])
+
+        self.python.post_set.clear()
+        assert Post.objects.get(pk=self.python_post.pk).tag_names == []
+        assert Post.objects.get(pk=self.go_post.pk).tag_names == [self.go.name]
+
+    def test_tag_names_follow_renamed_and_deleted_tags(self):
+        self.python.name = "python3"
+        self.python.save()
+        self.django_post.refresh_from_db()
+        assert self.django_post.tag_names == sorted(["python3", self.django.name])
+
+        self.django.delete()
+        self.django_post.refresh_from_db()
+        assert self.django_post.tag_names == ["python3"]
+
+    def test_created_post_has_tag_names(self, authed_api_client):
+        post = PostFactory()
+        client = authed_api_client(post.user)
+
+        result = client.post(
+            reverse("v1:posts:my-posts-list"),
+            {"title": "title", "content": "[]", "tags": ["b", "a"]},
+        )
+
+        assert result.status_code == status.HTTP_201_CREATED, result.content.decode()
+        post = Post.objects.get(uuid=result.data["uuid"])
+        assert post.tag_names == ["a", "b"]
+
+    def _create_post(self, *tags):
+        post = PostFactory(status=PostStatus.PUBLISHED)
+        post.tags.set(tags)
+        return post
+
+    def _uuids(self, result):
+        return [uuid.UUID(post["uuid"]) for post in result.data["results"]]
@@ -0,0 +1,145 @@
+import datetime
+import uuid
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from posts.choices import PostStatus, TopPostsWindow, Vote
+from posts.models import TopPost
+from posts.services import delete_post, rebuild_top_posts, update_top_posts
+from posts.tests.factories import PostFactory
+from users.tests.factories import UserPublicFactory
+
+
+@pytest.mark.django_db
+class TestTopPosts:
+    def setup(self):
+        now = timezone.now()
+        self.fresh_post = PostFactory(
+            status=PostStatus.PUBLISHED, published_at=now, rating=3
+        )
+        self.week_old_post = PostFactory(
+            status=PostStatus.PUBLISHED,
+            published_at=now - datetime.timedelta(days=3),
+            rating=10,
+        )
+        self.old_post = PostFactory(
+            status=PostStatus.PUBLISHED,
+            published_at=now - datetime.timedelta(days=60),
+            rating=20,
+        )
+        PostFactory(status=PostStatus.DRAFT, rating=100)
+
+    def test_votes_update_leaderboards(self, authed_api_client):
+        client = authed_api_client(UserPublicFactory())
+
+        for post in (self.fresh_post, self.week_old_post, self.old_post):
+            client.post(
+                reverse("v1:posts:posts-vote", kwargs={"uuid": post.uuid}),
+                data={"value": Vote.UPVOTE},
+            )
+
+        assert self._top_uuids(client, TopPostsWindow.DAY) == [self.fresh_post.uuid]
+        assert self._top_uuids(client, TopPostsWindow.WEEK) == [
+            self.week_old_post.uuid,
+            self.fresh_post.uuid,
+        ]
+        assert self._top_uuids(client, TopPostsWindow.ALL) == [
+            self.old_post.uuid,
+            self.week_old_post.uuid,
+            self.fresh_post.uuid,
+        ]
+        assert (
+            TopPost.objects.get(window=TopPostsWindow.ALL, post=self.fresh_post).rating
+            == 4
+        )
+
+    def test_rebuild_command(self, anon_api_client, settings):
+        settings.TOP_POSTS_LEADERBOARD_SIZE = 2
+        client = anon_api_client()
+
+        out = StringIO()
+        call_command("rebuild_top_posts", stdout=out)
+
+        assert "Rebuilt month leaderboard with 2 posts" in out.getvalue()
+        assert self._top_uuids(client, TopPostsWindow.MONTH) == [
+            self.week_old_post.uuid,
+            self.fresh_post.uuid,
+        ]
+        assert self._top_uuids(client, TopPostsWindow.ALL) == [
+            self.old_post.uuid,
+            self.week_old_post.uuid,
+        ]
+
+    def test_votes_for_posts_out_of_top_dont_grow_leaderboard(self, settings):
+        settings.TOP_POSTS_LEADERBOARD_SIZE = 2
+        rebuild_top_posts(TopPostsWindow.ALL)
+
+        update_top_posts({self.fresh_post: 4})
+        assert not TopPost.objects.filter(
+            window=TopPostsWindow.ALL, post=self.fresh_post
+        ).exists()
+
+        update_top_posts({self.fresh_post: 11, self.old_post: 1})
+        assert dict(
+            TopPost.objects.filter(window=TopPostsWindow.ALL).values_list(
+                "post", "rating"
+            )
+        ) == {self.old_post.pk: 1, self.week_old_post.pk: 10, self.fresh_post.pk: 11}
+
+    def test_rebuild_upserts_entries_and_keeps_fresh_ones(self, settings):
+        settings.TOP_POSTS_LEADERBOARD_SIZE = 2
+        rebuild_top_posts(TopPostsWindow.ALL)
+        TopPost.objects.filter(post=self.old_post).update(rating=0)
+        voted_since_rebuild = PostFactory(
+            status=PostStatus.PUBLISHED, published_at=timezone.now(), rating=0
+        )
+        TopPost.objects.create(
+            window=TopPostsWindow.ALL,
+            post=voted_since_rebuild,
+            rating=50,
+            published_at=voted_since_rebuild.published_at,
+        )
+
+        assert rebuild_top_posts(TopPostsWindow.ALL) == 2
+
+        assert dict(
+            TopPost.objects.filter(window=TopPostsWindow.ALL).values_list(
+                "post", "rating"
+            )
+        ) == {self.old_post.pk: 20, self.week_old_post.pk: 10, voted_since_rebuild.pk: 50}
+
+    def test_deleted_post_removed_from_leaderboards(self, anon_api_client):
+        call_command("rebuild_top_posts", stdout=StringIO())
+
+        delete_post(self.week_old_post, self.week_old_post.user)
+
+        assert not TopPost.objects.filter(post=self.week_old_post).exists()
+        assert self._top_uuids(anon_api_client(), TopPostsWindow.WEEK) == [
+            self.fresh_post.uuid
+        ]
+
+    def test_day_window_by_default(self, anon_api_client):
+        call_command("rebuild_top_posts", stdout=StringIO())
+
+        result = anon_api_client().get(reverse("v1:posts:posts-top"))
+
+        assert result.status_code == status.HTTP_200_OK
+        assert [post["uuid"] for post in result.data["results"]] == [
+            str(self.fresh_post.uuid)
+        ]
+
+    def test_unknown_window(self, anon_api_client):
+        result = anon_api_client().get(
+            reverse("v1:posts:posts-top"), data={"window": "year"}
+        )
+        assert result.status_code == status.HTTP_400_BAD_REQUEST
+
+    def _top_uuids(self, client, window):
+        result = client.get(reverse("v1:posts:posts-top"), data={"window": window})
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        return [uuid.UUID(post["uuid"]) for post in result.data["results"]]
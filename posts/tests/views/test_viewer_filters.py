@@ -0,0 +1,125 @@
+import uuid
+
+import pytest
+from django.utils.http import urlencode
+from funcy import first
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from comments.tests.factories import CommentFactory
+from common.api.pagination import KeysetPagination
+from posts.choices import PostStatus
+from posts.models import Post
+from posts.tests.factories import PostFactory, TagFactory
+from users.choices import TagStatus, UserRelationStatus
+from users.tests.factories import UserPublicFactory, UserRelationFactory, UserTagFactory
+
+
+@pytest.mark.django_db
+class TestViewerFilters:
+    def setup(self):
+        self.viewer = UserPublicFactory()
+        self.blocked_author = UserPublicFactory()
+        self.block = UserRelationFactory(
+            user=self.viewer,
+            related_user=self.blocked_author,
+            status=UserRelationStatus.BLOCKED,
+        )
+        self.ignored_tag = TagFactory()
+        UserTagFactory(user=self.viewer, tag=self.ignored_tag, status=TagStatus.IGNORED)
+
+    @pytest.fixture(autouse=True)
+    def small_pages(self, monkeypatch):
+        monkeypatch.setattr(KeysetPagination, "page_size", 2)
+
+    def test_hidden_posts_dont_make_pages_short(self, authed_api_client):
+        visible_posts = self._create_posts(
+            ["visible", "blocked", "visible", "ignored", "visible", "blocked"]
+        )
+
+        pages = self._walk(authed_api_client(self.viewer))
+
+        assert pages == [
+            [visible_posts[2].uuid, visible_posts[1].uuid],
+            [visible_posts[0].uuid],
+        ]
+
+    def test_sparse_visible_posts(self, authed_api_client, monkeypatch):
+        monkeypatch.setattr(KeysetPagination, "max_fetches", 1)
+        visible_posts = self._create_posts(["visible"] + ["blocked"] * 6)
+
+        pages = self._walk(authed_api_client(self.viewer))
+
+        assert [post for page in pages for post in page] == [visible_posts[0].uuid]
+
+    def test_filters_invalidated_on_unblock(self, authed_api_client):
+        self._create_posts(["blocked"])
+        client = authed_api_client(self.viewer)
+        assert self._walk(client) == [[]]
+
+        self.block.delete()
+
+        assert len(first(self._walk(client))) == 1
+
+    def test_filters_invalidated_on_ignored_tag_rename(self, authed_api_client):
+        self._create_posts(["ignored"])
+        client = authed_api_client(self.viewer)
+        assert self._walk(client) == [[]]
+
+        self.ignored_tag.name = "renamed"
+        self.ignored_tag.save()
+
+        assert self._walk(client) == [[]]
+
+    def test_filters_invalidated_on_ignored_tag_delete(self, authed_api_client):
+        self._create_posts(["ignored"])
+        client = authed_api_client(self.viewer)
+        assert self._walk(client) == [[]]
+
+        self.ignored_tag.delete()
+
+        assert len(first(self._walk(client))) == 1
+
+    def test_blocked_authors_comments_hidden(self, authed_api_client):
+        post = PostFactory(status=PostStatus.PUBLISHED)
+        root = CommentFactory(post=post)
+        CommentFactory(post=post, parent=root, user=self.blocked_author)
+        visible_child = CommentFactory(post=post, parent=root)
+        CommentFactory(post=post, user=self.blocked_author)
+
+        url = reverse("v1:comments:comments-list")
+        result = authed_api_client(self.viewer).get(
+            f"{url}?{urlencode({'post': post.uuid})}"
+        )
+
+        assert result.status_code == status.HTTP_200_OK, result.content.decode()
+        comments = result.data["results"]
+        assert [comment["uuid"] for comment in comments] == [str(root.uuid)]
+        assert [child["uuid"] for child in first(comments)["children"]] == [
+            str(visible_child.uuid)
+        ]
+
+    def _create_posts(self, kinds):
+        visible_posts = []
+        for kind in kinds:
+            post = PostFactory(
+                status=PostStatus.PUBLISHED,
+                user=self.blocked_author if kind == "blocked" else UserPublicFactory(),
+            )
+            if kind == "ignored":
+                post.tags.add(self.ignored_tag)
+            if kind == "visible":
+                visible_posts.append(post)
+        # the same creation time for all posts, so the order is defined by id only
+        Post.objects.update(created_at=post.created_at)
+        return visible_posts
+
+    def _walk(self, client):
+        pages = []
+        url = reverse("v1:posts:posts-list")
+        while url:
+            result = client.get(url)
+            assert result.status_code == status.HTTP_200_OK, result.content.decode()
+            pages.append([uuid.UUID(post["uuid"]) for post in result.data["results"]])
+            url = result.data["next"]
+        return pages
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from common.api.fieldsets import SparseFieldsetSerializerMixin
+from common.api.viewer_context import get_viewer_context
 from users.models import UserPublic
 
 
@@ -16,8 +18,10 @@ class UserPublicCreateSerializer(serializers.ModelSerializer):
         )
 
 
-class UserPublicFullSerializer(serializers.ModelSerializer):
-    """Serializer to represent whole user info."""
+class UserPublicFullSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
+    """Serializer to represent whole user info, or only fields asked by the client."""
 
     class Meta:
         model = UserPublic
@@ -53,3 +57,26 @@ class UserPublicMinimalSerializer(serializers.ModelSerializer):
             "username",
             "avatar",
         )
+
+
+class AuthorViewerContextMixin:
+    """Mixin for serializers of user's content to show viewer's relation to author.
+
+    Serializer is expected to load relations and notes into viewer context under
+    ``<viewer_context_prefix>_author_relations`` and ``..._author_notes`` names.
+    """
+
+    viewer_context_prefix: str
+
+    def get_author_viewer_context(self, obj) -> dict:
+        """Get viewer's relation to the author of the instance."""
+        viewer_context = get_viewer_context(self.context)
+        prefix = self.viewer_context_prefix
+        return {
+            "author_relation": viewer_context.get(
+                f"{prefix}_author_relations", obj.user_id
+            ),
+            "has_author_note": viewer_context.get(
+                f"{prefix}_author_notes", obj.user_id, False
+            ),
+        }
@@ -6,6 +6,7 @@ from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
 from common.api import parameters
+from common.api.fieldsets import SparseFieldsetViewMixin
 from users.api.permissions import Authenticator, LoadtestWorker, OwnUser
 from users.api.serializers import UserPublicCreateSerializer, UserPublicFullSerializer
 from users.models import UserPublic
@@ -13,6 +14,7 @@ from users.services import activate_user_account, deactivate_user_account
 
 
 class UserViewSet(
+    SparseFieldsetViewMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
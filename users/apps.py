@@ -5,3 +5,6 @@ class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "users"
     verbose_name = "Профили пользователей"
+
+    def ready(self):
+        from users import signals  # noqa: F401
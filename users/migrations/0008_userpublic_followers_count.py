@@ -0,0 +1,28 @@
+# Generated by Django 4.2.4 on 2026-10-18 11:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0007_alter_userpublic_email"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userpublic",
+            name="followers_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE users_userpublic SET followers_count = (
+                SELECT count(*) FROM users_userrelation AS r
+                WHERE r.related_user_id = users_userpublic.id
+                    AND r.status = 'F'
+                    AND (r.active_until IS NULL OR r.active_until >= CURRENT_DATE)
+            )
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.4 on 2026-10-18 11:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0008_userpublic_followers_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="usercommunity",
+            index=models.Index(
+                fields=["community", "user"], name="user_community_subscribers_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userrelation",
+            index=models.Index(
+                fields=["related_user", "status", "user"],
+                name="user_relation_followers_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="usertag",
+            index=models.Index(
+                fields=["tag", "status", "user"], name="user_tag_subscribers_idx"
+            ),
+        ),
+    ]
@@ -28,6 +28,7 @@ class UserPublic(AbstractBaseUser, PermissionsMixin):
     comments_count = models.PositiveIntegerField(default=0)
     votes_up_count = models.PositiveIntegerField(default=0)
     votes_down_count = models.PositiveIntegerField(default=0)
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
     is_staff = models.BooleanField(default=False)
     is_active = models.BooleanField(default=False)
     user_relation = models.ManyToManyField(
@@ -63,6 +64,14 @@ class UserTag(Timestamped):
     user = models.ForeignKey("users.UserPublic", on_delete=models.CASCADE)
     status = models.CharField(choices=TagStatus.choices, default=TagStatus.SUBSCRIBED)
 
+    class Meta:
+        indexes = [
+            # subscribers of the tag are read in batches on fan-out of its posts
+            models.Index(
+                fields=("tag", "status", "user"), name="user_tag_subscribers_idx"
+            ),
+        ]
+
 
 class UserCommunity(Timestamped):
     """Communities user subscribed to or joined."""
@@ -73,6 +82,14 @@ class UserCommunity(Timestamped):
         choices=UserCommunityStatus.choices, default=UserCommunityStatus.SUBSCRIBED
     )
 
+    class Meta:
+        indexes = [
+            # subscribers of the community are read in batches on fan-out of its posts
+            models.Index(
+                fields=("community", "user"), name="user_community_subscribers_idx"
+            ),
+        ]
+
 
 class UserRelation(Timestamped):
     """Model to keep user relations, including subscriptions and ignored."""
@@ -88,6 +105,15 @@ class UserRelation(Timestamped):
     )
     active_until = models.DateField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # followers of the author are read in batches on fan-out of their posts
+            models.Index(
+                fields=("related_user", "status", "user"),
+                name="user_relation_followers_idx",
+            ),
+        ]
+
 
 class UserNote(Timestamped):
     """Model to keep user notes about particular user."""
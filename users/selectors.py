@@ -0,0 +1,124 @@
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, QuerySet
+from django.db.models.functions import Now, TruncDate
+from django.utils import timezone
+
+from common.reconciliation import CounterSource
+from users.choices import TagStatus, UserRelationStatus
+from users.models import UserNote, UserPublic, UserRelation, UserTag
+
+# Rows ``UserPublic.followers_count`` is calculated from, it's kept in sync on
+# changes of relations, but subscriptions expiring by ``active_until`` are only
+# taken off by reconciliation
+USER_COUNTER_SOURCES = [
+    CounterSource(
+        UserRelation.objects.all(),
+        "related_user",
+        {
+            "followers_count": Count(
+                "pk",
+                filter=Q(status=UserRelationStatus.SUBSCRIBED)
+                & (Q(active_until__isnull=True) | Q(active_until__gte=TruncDate(Now()))),
+            ),
+        },
+    ),
+]
+
+
+class ViewerFilters(NamedTuple):
+    """Authors and tags which viewer doesn't want to see."""
+
+    blocked_user_ids: frozenset[int] = frozenset()
+    ignored_tag_names: frozenset[str] = frozenset()
+
+
+def fetch_active_relations() -> QuerySet[UserRelation]:
+    """Fetch relations which haven't expired yet."""
+    return UserRelation.objects.filter(
+        Q(active_until__isnull=True) | Q(active_until__gte=timezone.now().date())
+    )
+
+
+def get_user_relations_statuses(
+    user: UserPublic, related_user_ids: Iterable[int] | QuerySet
+) -> dict[int, str]:
+    """Get status of active relations of the user with other users."""
+    return dict(
+        fetch_active_relations()
+        .filter(user=user, related_user_id__in=related_user_ids)
+        .values_list("related_user_id", "status")
+    )
+
+
+def is_active_subscription(relation: UserRelation) -> bool:
+    """Check if the relation is subscription which hasn't expired yet."""
+    return relation.status == UserRelationStatus.SUBSCRIBED and (
+        relation.active_until is None or relation.active_until >= timezone.now().date()
+    )
+
+
+def get_followed_popular_users_ids(user: UserPublic, min_followers: int) -> list[int]:
+    """Get ids of users followed by the user, who have at least given followers.
+
+    Reads stored followers counts of followed users only, so it doesn't depend on
+    how many followers they have.
+    """
+    followed_ids = (
+        fetch_active_relations()
+        .filter(user=user, status=UserRelationStatus.SUBSCRIBED)
+        .values("related_user")
+    )
+    return list(
+        UserPublic.objects.filter(
+            pk__in=followed_ids, followers_count__gte=min_followers
+        ).values_list("pk", flat=True)
+    )
+
+
+def get_users_with_notes(
+    author: UserPublic, user_ids: Iterable[int] | QuerySet
+) -> dict[int, bool]:
+    """Get which of the users author wrote notes about."""
+    return dict.fromkeys(
+        UserNote.objects.filter(author=author, user_about_id__in=user_ids).values_list(
+            "user_about_id", flat=True
+        ),
+        True,
+    )
+
+
+def get_viewer_filters_cache_key(user_id: int) -> str:
+    return f"users:viewer-filters:{user_id}"
+
+
+def get_viewer_filters(user: UserPublic | None) -> ViewerFilters:
+    """Get authors blocked and tags ignored by the viewer.
+
+    Filters are cached and invalidated when user's tags or relations change, so
+    reads don't need to join them.
+    """
+    if not user or not user.is_authenticated:
+        return ViewerFilters()
+
+    cache_key = get_viewer_filters_cache_key(user.pk)
+    if (cached := cache.get(cache_key)) is not None:
+        return ViewerFilters(*cached)
+
+    viewer_filters = ViewerFilters(
+        blocked_user_ids=frozenset(
+            fetch_active_relations()
+            .filter(user=user, status=UserRelationStatus.BLOCKED)
+            .values_list("related_user_id", flat=True)
+        ),
+        ignored_tag_names=frozenset(
+            UserTag.objects.filter(user=user, status=TagStatus.IGNORED).values_list(
+                "tag__name", flat=True
+            )
+        ),
+    )
+    cache.set(cache_key, tuple(viewer_filters), settings.VIEWER_FILTERS_CACHE_SECONDS)
+    return viewer_filters
@@ -1,6 +1,10 @@
 import logging
 
+from django.core.cache import cache
+from django.db.models import F
+
 from users.models import UserPublic
+from users.selectors import get_viewer_filters_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -26,3 +30,15 @@ def deactivate_user_account(user: UserPublic) -> UserPublic:
     user.is_active = False
     user.save()
     return user
+
+
+def update_followers_count(user_id: int, delta: int):
+    """Add delta to the stored number of user's followers."""
+    UserPublic.objects.filter(pk=user_id).update(
+        followers_count=F("followers_count") + delta
+    )
+
+
+def invalidate_viewer_filters(*user_ids: int):
+    """Drop cached viewer filters of the users, so they are loaded again."""
+    cache.delete_many([get_viewer_filters_cache_key(user_id) for user_id in user_ids])
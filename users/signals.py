@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from users.choices import UserRelationStatus
+from users.models import UserRelation, UserTag
+from users.selectors import fetch_active_relations, is_active_subscription
+from users.services import invalidate_viewer_filters, update_followers_count
+
+
+@receiver([post_save, post_delete], sender=UserRelation)
+@receiver([post_save, post_delete], sender=UserTag)
+def invalidate_viewer_filters_on_change(sender, instance, **kwargs):
+    """Drop cached viewer filters when user's relations or tags change."""
+    invalidate_viewer_filters(instance.user_id)
+
+
+@receiver(pre_save, sender=UserRelation)
+def remember_followed_user(sender, instance, **kwargs):
+    """Remember whom the relation subscribed to before the change, if anyone."""
+    instance._followed_user_id = (
+        fetch_active_relations()
+        .filter(pk=instance.pk, status=UserRelationStatus.SUBSCRIBED)
+        .values_list("related_user_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=UserRelation)
+def update_followers_count_on_save(sender, instance, **kwargs):
+    """Move the follower between counts of users when subscription changes."""
+    followed_user_id = getattr(instance, "_followed_user_id", None)
+    if is_active_subscription(instance):
+        if followed_user_id == instance.related_user_id:
+            return
+        update_followers_count(instance.related_user_id, 1)
+    if followed_user_id:
+        update_followers_count(followed_user_id, -1)
+
+
+@receiver(post_delete, sender=UserRelation)
+def update_followers_count_on_delete(sender, instance, **kwargs):
+    """Take the follower off when subscription is removed."""
+    if is_active_subscription(instance):
+        update_followers_count(instance.related_user_id, -1)
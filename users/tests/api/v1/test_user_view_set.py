@@ -290,6 +290,17 @@ class TestUsersViewSet:
         assert f"{other_user.date_of_birth:%Y-%m-%d}" == initial_date_of_birth
         assert other_user.bio == initial_bio
 
+    def test_only_asked_fields_are_returned(self, anon_api_client):
+        user = UserPublicFactory(rating=2)
+        url = reverse(
+            "v1:users:users-detail", kwargs={"external_user_uid": user.external_user_uid}
+        )
+
+        result = anon_api_client().get(f"{url}?fields=username,rating")
+
+        assert result.status_code == status.HTTP_200_OK
+        assert result.data == {"username": user.username, "rating": 2}
+
     def _create_user(self, client, data, headers=None):
         return client.post(reverse("v1:users:users-list"), data=data, headers=headers)
 
@@ -10,3 +10,36 @@ class UserPublicFactory(DjangoModelFactory):
 
     class Meta:
         model = "users.UserPublic"
+
+
+class UserRelationFactory(DjangoModelFactory):
+    user = factory.SubFactory(UserPublicFactory)
+    related_user = factory.SubFactory(UserPublicFactory)
+
+    class Meta:
+        model = "users.UserRelation"
+
+
+class UserNoteFactory(DjangoModelFactory):
+    author = factory.SubFactory(UserPublicFactory)
+    user_about = factory.SubFactory(UserPublicFactory)
+    note = factory.Faker("text")
+
+    class Meta:
+        model = "users.UserNote"
+
+
+class UserTagFactory(DjangoModelFactory):
+    user = factory.SubFactory(UserPublicFactory)
+    tag = factory.SubFactory("posts.tests.factories.TagFactory")
+
+    class Meta:
+        model = "users.UserTag"
+
+
+class UserCommunityFactory(DjangoModelFactory):
+    user = factory.SubFactory(UserPublicFactory)
+    community = factory.SubFactory("communities.tests.factories.CommunityFactory")
+
+    class Meta:
+        model = "users.UserCommunity"
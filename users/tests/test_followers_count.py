@@ -0,0 +1,72 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from users.choices import UserRelationStatus
+from users.selectors import get_followed_popular_users_ids
+from users.tests.factories import UserPublicFactory, UserRelationFactory
+
+
+@pytest.mark.django_db
+class TestFollowersCount:
+    def setup(self):
+        self.author = UserPublicFactory()
+        self.reader = UserPublicFactory()
+
+    def test_follow_and_unfollow(self):
+        relation = UserRelationFactory(user=self.reader, related_user=self.author)
+        UserRelationFactory(related_user=self.author)
+        assert self._followers_count() == 2
+
+        relation.delete()
+
+        assert self._followers_count() == 1
+
+    def test_status_change(self):
+        relation = UserRelationFactory(user=self.reader, related_user=self.author)
+
+        relation.status = UserRelationStatus.BLOCKED
+        relation.save()
+        assert self._followers_count() == 0
+        relation.delete()
+        assert self._followers_count() == 0
+
+        UserRelationFactory(
+            user=self.reader,
+            related_user=self.author,
+            status=UserRelationStatus.BLOCKED,
+        )
+        assert self._followers_count() == 0
+
+    def test_resave_doesnt_count_twice(self):
+        relation = UserRelationFactory(user=self.reader, related_user=self.author)
+
+        relation.save()
+
+        assert self._followers_count() == 1
+
+    def test_expired_subscription_isnt_counted(self):
+        yesterday = timezone.now().date() - datetime.timedelta(days=1)
+        relation = UserRelationFactory(
+            user=self.reader, related_user=self.author, active_until=yesterday
+        )
+        assert self._followers_count() == 0
+
+        relation.active_until = None
+        relation.save()
+        assert self._followers_count() == 1
+
+    def test_followed_popular_users(self, django_assert_num_queries):
+        UserRelationFactory(user=self.reader, related_user=self.author)
+        UserRelationFactory(related_user=self.author)
+        other_author = UserPublicFactory()
+        UserRelationFactory(user=self.reader, related_user=other_author)
+        UserRelationFactory(related_user=UserPublicFactory())
+
+        with django_assert_num_queries(1):
+            assert get_followed_popular_users_ids(self.reader, 2) == [self.author.pk]
+
+    def _followers_count(self):
+        self.author.refresh_from_db(fields=["followers_count"])
+        return self.author.followers_count
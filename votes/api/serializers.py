@@ -0,0 +1,50 @@
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from comments.api.serializers import CommentRatingOnlySerializer
+from posts.api.serializers import PostRatingOnlySerializer
+from posts.choices import Vote
+from votes.choices import VoteBatchItemStatus, VoteTargetType
+from votes.services import VoteBatchItemResult
+
+
+class VoteBatchItemSerializer(serializers.Serializer):
+    """Serializer validating a single vote submitted within the batch."""
+
+    target_type = serializers.ChoiceField(choices=VoteTargetType.choices)
+    uuid = serializers.UUIDField()
+    value = serializers.ChoiceField(choices=Vote.choices)
+
+
+class VoteBatchSerializer(serializers.Serializer):
+    """Serializer validating votes batch, each target can be voted once per batch."""
+
+    votes = VoteBatchItemSerializer(
+        many=True, allow_empty=False, max_length=settings.VOTES_BATCH_MAX_SIZE
+    )
+
+    def validate_votes(self, votes):
+        """Make sure every target appears only once in the batch."""
+        targets = {(vote["target_type"], vote["uuid"]) for vote in votes}
+        if len(targets) != len(votes):
+            raise ValidationError("Нельзя голосовать за один объект дважды в пакете!")
+        return votes
+
+
+class VoteBatchItemResultSerializer(serializers.Serializer):
+    """Serializer to represent outcome of a single vote from the batch."""
+
+    target_type = serializers.ChoiceField(choices=VoteTargetType.choices)
+    uuid = serializers.UUIDField()
+    status = serializers.ChoiceField(choices=VoteBatchItemStatus.choices)
+    rating = serializers.SerializerMethodField()
+
+    def get_rating(self, obj: VoteBatchItemResult) -> dict | None:
+        if obj.target is None:
+            return None
+        serializer_class = {
+            VoteTargetType.POST: PostRatingOnlySerializer,
+            VoteTargetType.COMMENT: CommentRatingOnlySerializer,
+        }[obj.target_type]
+        return serializer_class(obj.target).data
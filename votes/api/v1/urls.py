@@ -0,0 +1,10 @@
+from rest_framework.routers import SimpleRouter
+
+from votes.api.v1 import views
+
+app_name = "votes"
+
+router = SimpleRouter()
+router.register("", views.VoteViewSet, basename="votes")
+
+urlpatterns = router.urls
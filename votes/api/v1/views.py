@@ -0,0 +1,32 @@
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from common.counters import counter_buffer
+from posts.api.permissions import PostVoter
+from votes.api.serializers import VoteBatchItemResultSerializer, VoteBatchSerializer
+from votes.services import record_votes_batch
+
+
+class VoteViewSet(GenericViewSet):
+    """Viewset to cast votes for posts and comments."""
+
+    serializer_class = VoteBatchSerializer
+    permission_classes = (IsAuthenticated & PostVoter,)
+    pagination_class = None
+
+    @action(methods=["POST"], detail=False)
+    def batch(self, request, *args, **kwargs):
+        """Record many votes for posts and comments in one request."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = record_votes_batch(request.user, serializer.validated_data["votes"])
+        for result in results:
+            if result.target is not None:
+                counter_buffer.apply_pending(result.target)
+        return Response(
+            VoteBatchItemResultSerializer(results, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
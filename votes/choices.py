@@ -0,0 +1,18 @@
+from django.db import models
+
+
+class VoteTargetType(models.TextChoices):
+    POST = "post", "Post"
+    COMMENT = "comment", "Comment"
+
+
+class VoteBatchItemStatus(models.TextChoices):
+    CAST = "cast", "Cast"
+    CANCELLED = "cancelled", "Cancelled"
+    UNCHANGED = "unchanged", "Unchanged"
+    NOT_FOUND = "not_found", "Not found"
+
+
+class VoteEventAction(models.IntegerChoices):
+    CAST = 1, "Cast"
+    CANCEL = -1, "Cancel"
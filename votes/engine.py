@@ -0,0 +1,224 @@
+from typing import NamedTuple
+
+from django.db import connection, models
+
+from users.models import UserPublic
+from votes.models import VoteEvent
+
+COUNTER_FIELDS = ("rating", "votes_up_count", "votes_down_count")
+
+
+class VoteChange(NamedTuple):
+    """Vote which has been cast or cancelled by ``toggle_votes``."""
+
+    value: int
+    cancelled: bool
+
+    def get_counters_delta(self) -> dict[str, int]:
+        """Return how the vote changed rating and votes counters of its target."""
+        sign = -1 if self.cancelled else 1
+        return {
+            "rating": sign * self.value,
+            "votes_up_count": sign if self.value > 0 else 0,
+            "votes_down_count": sign if self.value < 0 else 0,
+        }
+
+
+class VoteRequest(NamedTuple):
+    """Vote to be toggled for the single target."""
+
+    target: models.Model
+    value: int
+    author_rating_per_vote: float
+
+
+def _build_toggle_votes_sql(
+    vote_model: type[models.Model],
+    target_field_name: str,
+    input_sql: str,
+    update_counters: bool,
+) -> str:
+    qn = connection.ops.quote_name
+    vote_opts = vote_model._meta
+    vote_table = qn(vote_opts.db_table)
+    target_field = vote_opts.get_field(target_field_name)
+    target_opts = target_field.related_model._meta
+    target_column = qn(target_field.column)
+    voter_column = qn(vote_opts.get_field("user").column)
+    target_table = qn(target_opts.db_table)
+    target_author_column = qn(target_opts.get_field("user").column)
+    users_table = qn(UserPublic._meta.db_table)
+    events_table = qn(VoteEvent._meta.db_table)
+
+    # Voting again for the same target cancels the vote, no matter of its value.
+    # ON CONFLICT covers concurrent duplicate votes: the second one becomes no-op
+    # instead of failing on the unique constraint. Every change is also appended to
+    # the vote events log.
+    toggle_sql = f"""
+        input (target_id, value, author_rating_per_vote) AS (VALUES {input_sql}),
+        cancelled AS (
+            DELETE FROM {vote_table} AS v USING input
+            WHERE v.{target_column} = input.target_id
+                AND v.{voter_column} = %(voter_id)s
+            RETURNING v.{target_column} AS target_id, v.value, -1 AS sign
+        ),
+        new_vote AS (
+            INSERT INTO {vote_table} (
+                created_at, updated_at, {target_column}, {voter_column}, value
+            )
+            SELECT now(), now(), input.target_id, %(voter_id)s, input.value
+            FROM input
+            WHERE NOT EXISTS (
+                SELECT 1 FROM cancelled WHERE cancelled.target_id = input.target_id
+            )
+            ON CONFLICT ({voter_column}, {target_column}) DO NOTHING
+            RETURNING {target_column} AS target_id, value, 1 AS sign
+        ),
+        delta AS (
+            SELECT target_id, value, sign FROM cancelled
+            UNION ALL
+            SELECT target_id, value, sign FROM new_vote
+        ),
+        events AS (
+            INSERT INTO {events_table} (
+                created_at, action, target_type, target_id, target_author_id,
+                voter_id, value
+            )
+            SELECT now(), delta.sign, %(target_type)s, delta.target_id,
+                t.{target_author_column}, %(voter_id)s, delta.value
+            FROM delta
+            JOIN {target_table} AS t ON t.id = delta.target_id
+        )
+    """
+    if not update_counters:
+        return f"""
+            WITH {toggle_sql}
+            SELECT input.target_id, delta.value, delta.sign, t.rating,
+                t.votes_up_count, t.votes_down_count
+            FROM input
+            JOIN {target_table} AS t ON t.id = input.target_id
+            LEFT JOIN delta ON delta.target_id = input.target_id
+        """
+
+    # Authors and voter can be the same user, and the same row can't be updated twice
+    # within one statement, so all user counters are summed up and updated at once.
+    return f"""
+        WITH {toggle_sql},
+        target AS (
+            UPDATE {target_table} AS t SET
+                rating = t.rating + delta.sign * delta.value,
+                votes_up_count = t.votes_up_count
+                    + CASE WHEN delta.value > 0 THEN delta.sign ELSE 0 END,
+                votes_down_count = t.votes_down_count
+                    + CASE WHEN delta.value < 0 THEN delta.sign ELSE 0 END
+            FROM delta
+            WHERE t.id = delta.target_id
+            RETURNING t.id, t.{target_author_column} AS author_id, t.rating,
+                t.votes_up_count, t.votes_down_count
+        ),
+        user_delta AS (
+            SELECT target.author_id AS user_id,
+                delta.sign * delta.value * input.author_rating_per_vote AS rating,
+                0 AS votes_up_count,
+                0 AS votes_down_count
+            FROM delta
+            JOIN target ON target.id = delta.target_id
+            JOIN input ON input.target_id = delta.target_id
+            UNION ALL
+            SELECT %(voter_id)s, 0,
+                CASE WHEN delta.value > 0 THEN delta.sign ELSE 0 END,
+                CASE WHEN delta.value < 0 THEN delta.sign ELSE 0 END
+            FROM delta
+        ),
+        users AS (
+            UPDATE {users_table} AS u SET
+                rating = u.rating + d.rating,
+                votes_up_count = u.votes_up_count + d.votes_up_count,
+                votes_down_count = u.votes_down_count + d.votes_down_count
+            FROM (
+                SELECT user_id, SUM(rating) AS rating,
+                    SUM(votes_up_count) AS votes_up_count,
+                    SUM(votes_down_count) AS votes_down_count
+                FROM user_delta
+                GROUP BY user_id
+            ) AS d
+            WHERE u.id = d.user_id
+            RETURNING u.id
+        )
+        SELECT input.target_id, delta.value, delta.sign, target.rating,
+            target.votes_up_count, target.votes_down_count
+        FROM input
+        LEFT JOIN delta ON delta.target_id = input.target_id
+        LEFT JOIN target ON target.id = input.target_id
+    """
+
+
+def toggle_votes(
+    vote_model: type[models.Model],
+    actor: UserPublic,
+    votes: list[VoteRequest],
+    update_counters: bool = True,
+) -> dict[int, VoteChange | None]:
+    """Cast or cancel actor's votes and update related counters in one SQL statement.
+
+    Counters of the targets are set to the values returned by database, so there is
+    no need to refresh them afterwards. When ``update_counters`` is off, only vote
+    rows are changed and counters are left to the caller.
+
+    Returns
+    -------
+    dict[int, VoteChange | None]
+        Vote which has been cast or cancelled per target primary key, ``None`` if
+        concurrent request with the same vote won the race and nothing has changed.
+    """
+    if not votes:
+        return {}
+
+    targets = {vote.target.pk: vote.target for vote in votes}
+    if len(targets) != len(votes):
+        raise ValueError("Every target can be voted only once per call")
+
+    target_field_name = type(votes[0].target)._meta.model_name
+    params = {"voter_id": actor.pk, "target_type": target_field_name}
+    rows_sql = []
+    for i, vote in enumerate(votes):
+        rows_sql.append(
+            f"(%(target_id_{i})s::bigint, %(value_{i})s::smallint,"
+            f" %(author_rating_per_vote_{i})s::double precision)"
+        )
+        params[f"target_id_{i}"] = vote.target.pk
+        params[f"value_{i}"] = vote.value
+        params[f"author_rating_per_vote_{i}"] = vote.author_rating_per_vote
+
+    sql = _build_toggle_votes_sql(
+        vote_model, target_field_name, ", ".join(rows_sql), update_counters
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    changes = {}
+    stale_targets = []
+    for target_id, vote_value, sign, *counters in rows:
+        changes[target_id] = (
+            VoteChange(value=vote_value, cancelled=sign < 0) if vote_value else None
+        )
+        if counters[0] is None:
+            stale_targets.append(targets[target_id])
+            continue
+        for field_name, counter in zip(COUNTER_FIELDS, counters, strict=True):
+            setattr(targets[target_id], field_name, counter)
+
+    _refresh_counters(stale_targets)
+    return changes
+
+
+def _refresh_counters(targets: list[models.Model]):
+    if not targets:
+        return
+    model = type(targets[0])
+    fresh = model.objects.only(*COUNTER_FIELDS).in_bulk([target.pk for target in targets])
+    for target in targets:
+        if fresh_target := fresh.get(target.pk):
+            for field_name in COUNTER_FIELDS:
+                setattr(target, field_name, getattr(fresh_target, field_name))
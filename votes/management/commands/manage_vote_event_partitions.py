@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.utils import timezone
+
+from common.commands import PeriodicCommand
+from votes.selectors import is_vote_events_table_partitioned
+from votes.services import create_vote_event_partitions, drop_vote_event_partitions
+
+
+class Command(PeriodicCommand):
+    help = (
+        "Create daily partitions of vote events table ahead of time and drop "
+        "partitions older than retention period."
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--days-ahead",
+            type=int,
+            default=settings.VOTE_EVENTS_PARTITIONS_DAYS_AHEAD,
+        )
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=settings.VOTE_EVENTS_RETENTION_DAYS,
+            help="Keep partitions for that many days, 0 to keep forever.",
+        )
+
+    def handle_once(self, *args, days_ahead, retention_days, **options):
+        if not is_vote_events_table_partitioned():
+            self.stderr.write("Vote events table is not partitioned, nothing to do")
+            return
+
+        today = timezone.now().date()
+        for name in create_vote_event_partitions(today, days_ahead):
+            self.stdout.write(f"Created {name}")
+        if retention_days:
+            for name in drop_vote_event_partitions(today, retention_days):
+                self.stdout.write(f"Dropped {name}")
@@ -0,0 +1,96 @@
+import time
+
+from django.core.management.base import CommandError
+
+from comments.models import Comment
+from comments.selectors import COMMENT_COUNTER_SOURCES
+from common.commands import PeriodicCommand
+from common.counters import apply_counter_deltas, is_counters_write_behind_enabled
+from common.reconciliation import get_counter_fix_deltas, iter_counter_mismatches
+from communities.models import Community
+from communities.selectors import COMMUNITY_COUNTER_SOURCES
+from posts.models import Post
+from posts.selectors import POST_COUNTER_SOURCES
+from users.models import UserPublic
+from users.selectors import USER_COUNTER_SOURCES
+
+RECONCILED_MODELS = {
+    "post": (Post, POST_COUNTER_SOURCES),
+    "comment": (Comment, COMMENT_COUNTER_SOURCES),
+    "community": (Community, COMMUNITY_COUNTER_SOURCES),
+    "user": (UserPublic, USER_COUNTER_SOURCES),
+}
+
+
+class Command(PeriodicCommand):
+    help = (
+        "Recompute denormalized counters of posts, comments, communities and users "
+        "from votes, comments, subscriptions and relations tables, report mismatches "
+        "and optionally fix them."
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--model",
+            choices=RECONCILED_MODELS,
+            action="append",
+            help="Model to reconcile, all of them by default.",
+        )
+        parser.add_argument("--fix", action="store_true", help="Fix mismatched counters.")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--start-after",
+            type=int,
+            default=0,
+            help="Primary key to resume scan from.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to sleep between chunks, to limit load on the database.",
+        )
+
+    def handle(self, *args, **options):
+        """Refuse to fix counters which may have deltas buffered by other processes."""
+        if options["fix"] and is_counters_write_behind_enabled():
+            raise CommandError(
+                "Counters are written behind, so they lag behind votes until buffered "
+                "deltas are flushed and fixing them would count those deltas twice. "
+                "Run without --fix, mismatches of recently changed rows are expected."
+            )
+        super().handle(*args, **options)
+
+    def handle_once(self, *args, **options):
+        for model_name in options["model"] or RECONCILED_MODELS:
+            self._reconcile(model_name, **options)
+
+    def _reconcile(self, model_name, *, fix, chunk_size, start_after, pause, **options):
+        model, counter_sources = RECONCILED_MODELS[model_name]
+        mismatched = fixed = 0
+        last_pk = start_after
+        for scanned_pk, mismatches in iter_counter_mismatches(
+            model, counter_sources, chunk_size=chunk_size, start_after=start_after
+        ):
+            last_pk = scanned_pk
+            for mismatch in mismatches:
+                self.stdout.write(
+                    f"{model_name} {mismatch.pk} {mismatch.field_name}: "
+                    f"stored {mismatch.stored}, actual {mismatch.actual}"
+                )
+            mismatched += len(mismatches)
+            if fix and mismatches:
+                fixed += apply_counter_deltas(model, get_counter_fix_deltas(mismatches))
+            if pause:
+                time.sleep(pause)
+
+        self.stdout.write(
+            f"{model_name}: scanned up to pk {last_pk}, {mismatched} mismatched "
+            f"counters, {fixed} rows fixed"
+        )
+        if mismatched and is_counters_write_behind_enabled():
+            self.stdout.write(
+                "Counters are written behind, mismatches of recently changed rows are "
+                "expected until buffered deltas are flushed."
+            )
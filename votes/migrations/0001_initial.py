@@ -0,0 +1,89 @@
+# Generated by Django 4.2.4 on 2026-10-18 08:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+CREATE_PARTITIONED_TABLE_SQL = """
+CREATE TABLE votes_voteevent (
+    id bigserial NOT NULL,
+    created_at timestamp with time zone NOT NULL,
+    action smallint NOT NULL,
+    target_type varchar(7) NOT NULL,
+    target_id bigint NOT NULL,
+    target_author_id bigint NOT NULL,
+    voter_id bigint NOT NULL,
+    value smallint NOT NULL,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE TABLE votes_voteevent_default PARTITION OF votes_voteevent DEFAULT;
+CREATE INDEX voteevent_created_at_idx ON votes_voteevent (created_at, id);
+CREATE INDEX voteevent_target_idx ON votes_voteevent (target_type, target_id, created_at);
+CREATE INDEX voteevent_voter_idx ON votes_voteevent (voter_id, created_at);
+"""
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="VoteEvent",
+                    fields=[
+                        ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                        (
+                            "created_at",
+                            models.DateTimeField(default=django.utils.timezone.now),
+                        ),
+                        (
+                            "action",
+                            models.SmallIntegerField(
+                                choices=[(1, "Cast"), (-1, "Cancel")]
+                            ),
+                        ),
+                        (
+                            "target_type",
+                            models.CharField(
+                                choices=[("post", "Post"), ("comment", "Comment")],
+                                max_length=7,
+                            ),
+                        ),
+                        ("target_id", models.BigIntegerField()),
+                        ("target_author_id", models.BigIntegerField()),
+                        ("voter_id", models.BigIntegerField()),
+                        (
+                            "value",
+                            models.SmallIntegerField(
+                                choices=[(1, "Upvote"), (-1, "Downvote")]
+                            ),
+                        ),
+                    ],
+                    options={
+                        "indexes": [
+                            models.Index(
+                                fields=["created_at", "id"],
+                                name="voteevent_created_at_idx",
+                            ),
+                            models.Index(
+                                fields=["target_type", "target_id", "created_at"],
+                                name="voteevent_target_idx",
+                            ),
+                            models.Index(
+                                fields=["voter_id", "created_at"],
+                                name="voteevent_voter_idx",
+                            ),
+                        ],
+                    },
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql=CREATE_PARTITIONED_TABLE_SQL,
+                    reverse_sql="DROP TABLE votes_voteevent",
+                ),
+            ],
+        ),
+    ]
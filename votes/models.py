@@ -0,0 +1,39 @@
+from django.db import models
+from django.utils import timezone
+
+from posts.choices import Vote
+from votes.choices import VoteEventAction, VoteTargetType
+
+
+class VoteEvent(models.Model):
+    """Append-only log of cast and cancelled votes for posts and comments.
+
+    In the database table is range partitioned by ``created_at``, one partition per
+    day, see ``manage_vote_event_partitions`` command. There are no foreign keys, so
+    events outlive deleted users, posts and comments.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    action = models.SmallIntegerField(choices=VoteEventAction.choices)
+    target_type = models.CharField(max_length=7, choices=VoteTargetType.choices)
+    target_id = models.BigIntegerField()
+    target_author_id = models.BigIntegerField()
+    voter_id = models.BigIntegerField()
+    value = models.SmallIntegerField(choices=Vote.choices)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=("created_at", "id"), name="voteevent_created_at_idx"),
+            models.Index(
+                fields=("target_type", "target_id", "created_at"),
+                name="voteevent_target_idx",
+            ),
+            models.Index(fields=("voter_id", "created_at"), name="voteevent_voter_idx"),
+        ]
+
+    def __str__(self):
+        return (
+            f"<{self.pk}: {self.voter_id} {self.get_action_display()} {self.value} "
+            f"for {self.target_type} {self.target_id}>"
+        )
@@ -0,0 +1,93 @@
+import datetime
+from collections.abc import Iterator
+from uuid import UUID
+
+from django.db import connection, models
+from django.db.models import Q
+
+from comments.models import Comment
+from posts.choices import PostStatus
+from posts.models import Post
+from votes.choices import VoteTargetType
+from votes.models import VoteEvent
+
+VOTE_EVENT_PARTITION_PREFIX = f"{VoteEvent._meta.db_table}_p"
+
+
+def fetch_vote_targets(
+    uuids_by_type: dict[VoteTargetType, set[UUID]]
+) -> dict[tuple[VoteTargetType, UUID], models.Model]:
+    """Fetch posts and comments user can vote for, keyed by target type and uuid."""
+    querysets = {
+        VoteTargetType.POST: Post.objects.filter(status=PostStatus.PUBLISHED),
+        VoteTargetType.COMMENT: Comment.objects.all(),
+    }
+    targets = {}
+    for target_type, uuids in uuids_by_type.items():
+        if not uuids:
+            continue
+        for target in (
+            querysets[target_type].filter(uuid__in=uuids).select_related("user")
+        ):
+            targets[(target_type, target.uuid)] = target
+    return targets
+
+
+def iter_vote_events(
+    since: datetime.datetime,
+    until: datetime.datetime,
+    target_type: VoteTargetType | None = None,
+    chunk_size: int = 5000,
+) -> Iterator[list[VoteEvent]]:
+    """Stream vote events from the time window in chunks, ordered by time.
+
+    Every chunk is a separate keyset-paginated query, touching only partitions of
+    the requested days, so no long running query or server side cursor is needed.
+    """
+    queryset = VoteEvent.objects.filter(created_at__gte=since, created_at__lt=until)
+    if target_type:
+        queryset = queryset.filter(target_type=target_type)
+    queryset = queryset.order_by("created_at", "id")
+
+    chunk_qs = queryset
+    while chunk := list(chunk_qs[:chunk_size]):
+        yield chunk
+        last_event = chunk[-1]
+        chunk_qs = queryset.filter(created_at__gte=last_event.created_at).filter(
+            Q(created_at__gt=last_event.created_at) | Q(id__gt=last_event.id)
+        )
+
+
+def is_vote_events_table_partitioned() -> bool:
+    """Check if vote events table is partitioned, it's plain table in tests."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass",
+            [VoteEvent._meta.db_table],
+        )
+        return cursor.fetchone() is not None
+
+
+def get_vote_event_partitions() -> dict[datetime.date, str]:
+    """Get names of daily vote events partitions by date, default one is skipped."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            """,
+            [VoteEvent._meta.db_table],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+
+    partitions = {}
+    for name in names:
+        if not name.startswith(VOTE_EVENT_PARTITION_PREFIX):
+            continue
+        day = datetime.datetime.strptime(
+            name.removeprefix(VOTE_EVENT_PARTITION_PREFIX), "%Y%m%d"
+        ).date()
+        partitions[day] = name
+    return partitions
@@ -0,0 +1,122 @@
+import datetime
+import logging
+from collections import defaultdict
+from typing import NamedTuple
+from uuid import UUID
+
+from django.db import DatabaseError, connection, models, transaction
+
+from comments.services import record_votes_for_comments
+from posts.services import record_votes_for_posts
+from users.models import UserPublic
+from votes.choices import VoteBatchItemStatus, VoteTargetType
+from votes.engine import VoteChange
+from votes.models import VoteEvent
+from votes.selectors import (
+    VOTE_EVENT_PARTITION_PREFIX,
+    fetch_vote_targets,
+    get_vote_event_partitions,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class VoteBatchItemResult(NamedTuple):
+    """Outcome of a single vote from the batch."""
+
+    target_type: VoteTargetType
+    uuid: UUID
+    status: VoteBatchItemStatus
+    target: models.Model | None
+
+
+def _get_item_status(change: VoteChange | None) -> VoteBatchItemStatus:
+    if change is None:
+        return VoteBatchItemStatus.UNCHANGED
+    if change.cancelled:
+        return VoteBatchItemStatus.CANCELLED
+    return VoteBatchItemStatus.CAST
+
+
+@transaction.atomic
+def record_votes_batch(actor: UserPublic, items: list[dict]) -> list[VoteBatchItemResult]:
+    """Record many votes for posts and comments within a single transaction.
+
+    Every item is a dict with ``target_type``, ``uuid`` and ``value`` keys, every
+    target must appear only once. Votes for targets which can't be found are skipped.
+    """
+    uuids_by_type = defaultdict(set)
+    for item in items:
+        uuids_by_type[item["target_type"]].add(item["uuid"])
+    targets = fetch_vote_targets(uuids_by_type)
+
+    votes_by_type = defaultdict(list)
+    for item in items:
+        if target := targets.get((item["target_type"], item["uuid"])):
+            votes_by_type[item["target_type"]].append((target, item["value"]))
+
+    changes = {
+        VoteTargetType.POST: record_votes_for_posts(
+            actor, votes_by_type[VoteTargetType.POST]
+        ),
+        VoteTargetType.COMMENT: record_votes_for_comments(
+            actor, votes_by_type[VoteTargetType.COMMENT]
+        ),
+    }
+
+    results = []
+    for item in items:
+        target_type, uuid = item["target_type"], item["uuid"]
+        target = targets.get((target_type, uuid))
+        status = (
+            _get_item_status(changes[target_type].get(target.pk))
+            if target
+            else VoteBatchItemStatus.NOT_FOUND
+        )
+        results.append(VoteBatchItemResult(target_type, uuid, status, target))
+    return results
+
+
+def create_vote_event_partitions(today: datetime.date, days_ahead: int) -> list[str]:
+    """Create daily vote events partitions from today for given number of days ahead.
+
+    Returns names of created partitions. Partition can't be created for the day
+    which already has events in default partition, such day is skipped.
+    """
+    qn = connection.ops.quote_name
+    existing = get_vote_event_partitions()
+    created = []
+    for offset in range(days_ahead + 1):
+        day = today + datetime.timedelta(days=offset)
+        if day in existing:
+            continue
+        name = f"{VOTE_EVENT_PARTITION_PREFIX}{day:%Y%m%d}"
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE TABLE {qn(name)} PARTITION OF "
+                    f"{qn(VoteEvent._meta.db_table)} "
+                    "FOR VALUES FROM (%s) TO (%s)",
+                    [day.isoformat(), (day + datetime.timedelta(days=1)).isoformat()],
+                )
+        except DatabaseError:
+            logger.exception("Failed to create vote events partition %s", name)
+            continue
+        logger.info("Created vote events partition %s", name)
+        created.append(name)
+    return created
+
+
+def drop_vote_event_partitions(today: datetime.date, retention_days: int) -> list[str]:
+    """Drop daily vote events partitions older than retention period."""
+    qn = connection.ops.quote_name
+    oldest_kept_day = today - datetime.timedelta(days=retention_days)
+    dropped = []
+    for day, name in sorted(get_vote_event_partitions().items()):
+        if day >= oldest_kept_day:
+            break
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE {qn(name)}")
+        logger.info("Dropped vote events partition %s", name)
+        dropped.append(name)
+    return dropped
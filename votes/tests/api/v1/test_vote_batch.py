@@ -0,0 +1,113 @@
+import uuid
+
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from comments.models import CommentVote
+from comments.tests.factories import CommentFactory
+from posts.choices import PostStatus, Vote
+from posts.models import PostVote
+from posts.tests.factories import PostFactory, PostVoteFactory
+from users.tests.factories import UserPublicFactory
+from votes.choices import VoteBatchItemStatus, VoteTargetType
+
+
+@pytest.mark.django_db
+class TestVoteBatch:
+    def setup(self):
+        self.voter = UserPublicFactory()
+        self.author = UserPublicFactory(rating=10)
+        self.posts = PostFactory.create_batch(
+            3, user=self.author, status=PostStatus.PUBLISHED, rating=5
+        )
+        self.comment = CommentFactory(user=self.author, post=self.posts[0])
+
+    def test_can_vote_for_posts_and_comments_at_once(self, authed_api_client):
+        PostVoteFactory(post=self.posts[2], user=self.voter, value=Vote.UPVOTE)
+        self.posts[2].votes_up_count = 1
+        self.posts[2].save()
+        self.voter.votes_up_count = 1
+        self.voter.save()
+        votes = [
+            self._item(VoteTargetType.POST, self.posts[0].uuid, Vote.UPVOTE),
+            self._item(VoteTargetType.POST, self.posts[1].uuid, Vote.DOWNVOTE),
+            self._item(VoteTargetType.POST, self.posts[2].uuid, Vote.DOWNVOTE),
+            self._item(VoteTargetType.COMMENT, self.comment.uuid, Vote.UPVOTE),
+        ]
+
+        result = self._vote(authed_api_client(self.voter), votes)
+
+        assert result.status_code == status.HTTP_201_CREATED, result.content.decode()
+        assert [item["status"] for item in result.data] == [
+            VoteBatchItemStatus.CAST,
+            VoteBatchItemStatus.CAST,
+            VoteBatchItemStatus.CANCELLED,
+            VoteBatchItemStatus.CAST,
+        ]
+        assert [item["rating"]["rating"] for item in result.data] == [6, 4, 4, 1]
+        assert set(
+            PostVote.objects.filter(user=self.voter).values_list("post_id", "value")
+        ) == {(self.posts[0].pk, Vote.UPVOTE), (self.posts[1].pk, Vote.DOWNVOTE)}
+        assert CommentVote.objects.filter(user=self.voter).count() == 1
+
+        self.author.refresh_from_db()
+        self.voter.refresh_from_db()
+        # +1 -1 -1 for posts, +0.5 for comment
+        assert self.author.rating == 9.5
+        assert self.voter.votes_up_count == 2
+        assert self.voter.votes_down_count == 1
+
+    def test_not_found_targets_are_reported(self, authed_api_client):
+        draft = PostFactory(status=PostStatus.DRAFT)
+        votes = [
+            self._item(VoteTargetType.POST, draft.uuid, Vote.UPVOTE),
+            self._item(VoteTargetType.COMMENT, uuid.uuid4(), Vote.UPVOTE),
+        ]
+
+        result = self._vote(authed_api_client(self.voter), votes)
+
+        assert result.status_code == status.HTTP_201_CREATED, result.content.decode()
+        assert [item["status"] for item in result.data] == [
+            VoteBatchItemStatus.NOT_FOUND,
+            VoteBatchItemStatus.NOT_FOUND,
+        ]
+        assert not PostVote.objects.exists()
+
+    def test_cant_vote_for_same_target_twice(self, authed_api_client):
+        item = self._item(VoteTargetType.POST, self.posts[0].uuid, Vote.UPVOTE)
+        result = self._vote(authed_api_client(self.voter), [item, item])
+        assert result.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_cant_send_too_many_votes(self, authed_api_client, settings):
+        votes = [
+            self._item(VoteTargetType.POST, uuid.uuid4(), Vote.UPVOTE)
+            for _ in range(settings.VOTES_BATCH_MAX_SIZE + 1)
+        ]
+        result = self._vote(authed_api_client(self.voter), votes)
+        assert result.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_cant_vote_as_anonymous(self, anon_api_client):
+        item = self._item(VoteTargetType.POST, self.posts[0].uuid, Vote.UPVOTE)
+        result = self._vote(anon_api_client(), [item])
+        assert result.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_votes_recorded_with_constant_number_of_queries(
+        self, authed_api_client, django_assert_max_num_queries
+    ):
+        posts = PostFactory.create_batch(20, status=PostStatus.PUBLISHED)
+        votes = [
+            self._item(VoteTargetType.POST, post.uuid, Vote.UPVOTE) for post in posts
+        ]
+        client = authed_api_client(self.voter)
+        with django_assert_max_num_queries(10):
+            result = self._vote(client, votes)
+        assert result.status_code == status.HTTP_201_CREATED
+
+    def _item(self, target_type, target_uuid, value):
+        return {"target_type": target_type, "uuid": str(target_uuid), "value": value}
+
+    def _vote(self, client, votes):
+        return client.post(
+            reverse("v1:votes:votes-batch"), data={"votes": votes}, format="json"
+        )
@@ -0,0 +1,93 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from comments.tests.factories import CommentFactory, CommentVoteFactory
+from posts.choices import Vote
+from posts.tests.factories import PostFactory, PostVoteFactory
+from users.models import UserRelation
+from users.tests.factories import UserPublicFactory, UserRelationFactory
+
+
+@pytest.mark.django_db
+class TestReconcileCounters:
+    def setup(self):
+        self.post = PostFactory(votes_up_count=5, rating=5, comments_count=0)
+        PostVoteFactory(post=self.post, value=Vote.UPVOTE)
+        PostVoteFactory(post=self.post, value=Vote.DOWNVOTE)
+        self.comment = CommentFactory(post=self.post)
+        CommentVoteFactory(comment=self.comment, value=Vote.UPVOTE)
+        self.consistent_post = PostFactory()
+
+    def test_reports_mismatches_without_fixing(self):
+        output = self._reconcile()
+
+        assert f"post {self.post.pk} votes_up_count: stored 5, actual 1" in output
+        assert f"post {self.post.pk} rating: stored 5, actual 0" in output
+        assert f"post {self.post.pk} comments_count: stored 0, actual 1" in output
+        assert f"comment {self.comment.pk} rating: stored 0, actual 1" in output
+        assert f"post {self.consistent_post.pk}" not in output
+        self.post.refresh_from_db()
+        assert self.post.rating == 5
+
+    def test_fixes_mismatches(self):
+        self._reconcile("--fix", "--chunk-size", "1")
+
+        self.post.refresh_from_db()
+        self.comment.refresh_from_db()
+        assert (
+            self.post.votes_up_count,
+            self.post.votes_down_count,
+            self.post.rating,
+            self.post.comments_count,
+        ) == (1, 1, 0, 1)
+        assert (self.comment.votes_up_count, self.comment.rating) == (1, 1)
+        assert "0 mismatched" in self._reconcile()
+
+    def test_fixes_followers_count_of_expired_subscriptions(self):
+        author = UserPublicFactory()
+        relation = UserRelationFactory(related_user=author)
+        UserRelation.objects.filter(pk=relation.pk).update(
+            active_until=timezone.now().date() - datetime.timedelta(days=1)
+        )
+
+        self._reconcile("--model", "user", "--fix")
+
+        author.refresh_from_db()
+        assert author.followers_count == 0
+
+    def _reconcile(self, *args):
+        out = StringIO()
+        call_command("reconcile_counters", *args, stdout=out)
+        return out.getvalue()
+
+    def test_scans_chunk_with_single_statement(self, django_assert_num_queries):
+        # one statement per chunk and one more finding there are no rows left
+        with django_assert_num_queries(3):
+            call_command(
+                "reconcile_counters",
+                "--model",
+                "post",
+                "--chunk-size",
+                "1",
+                stdout=StringIO(),
+            )
+
+    def test_resumes_after_given_pk(self):
+        output = self._reconcile("--model", "post", "--start-after", str(self.post.pk))
+
+        assert f"post {self.post.pk}" not in output
+        assert "0 mismatched" in output
+
+    def test_refuses_to_fix_written_behind_counters(self, settings):
+        settings.COUNTERS_WRITE_BEHIND = True
+
+        with pytest.raises(CommandError, match="written behind"):
+            self._reconcile("--fix")
+
+        self.post.refresh_from_db()
+        assert self.post.rating == 5
+        assert "mismatches of recently changed rows are expected" in self._reconcile()
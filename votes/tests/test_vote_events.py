@@ -0,0 +1,102 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from comments.services import record_vote_for_comment
+from comments.tests.factories import CommentFactory
+from posts.choices import PostStatus, Vote
+from posts.services import record_vote_for_post
+from posts.tests.factories import PostFactory
+from users.tests.factories import UserPublicFactory
+from votes.choices import VoteEventAction, VoteTargetType
+from votes.models import VoteEvent
+from votes.selectors import iter_vote_events
+
+
+@pytest.mark.django_db
+class TestVoteEvents:
+    def setup(self):
+        self.voter = UserPublicFactory()
+        self.author = UserPublicFactory()
+        self.post = PostFactory(user=self.author, status=PostStatus.PUBLISHED)
+        self.comment = CommentFactory(user=self.author, post=self.post)
+
+    def test_every_vote_change_is_logged(self):
+        record_vote_for_post(self.post, self.voter, Vote.UPVOTE)
+        record_vote_for_post(self.post, self.voter, Vote.UPVOTE)
+        record_vote_for_comment(self.comment, self.voter, Vote.DOWNVOTE)
+
+        events = list(
+            VoteEvent.objects.order_by("id").values_list(
+                "action",
+                "target_type",
+                "target_id",
+                "target_author_id",
+                "voter_id",
+                "value",
+            )
+        )
+        assert events == [
+            (
+                VoteEventAction.CAST,
+                VoteTargetType.POST,
+                self.post.pk,
+                self.author.pk,
+                self.voter.pk,
+                Vote.UPVOTE,
+            ),
+            (
+                VoteEventAction.CANCEL,
+                VoteTargetType.POST,
+                self.post.pk,
+                self.author.pk,
+                self.voter.pk,
+                Vote.UPVOTE,
+            ),
+            (
+                VoteEventAction.CAST,
+                VoteTargetType.COMMENT,
+                self.comment.pk,
+                self.author.pk,
+                self.voter.pk,
+                Vote.DOWNVOTE,
+            ),
+        ]
+
+    def test_events_are_streamed_in_chunks_within_window(self):
+        now = timezone.now()
+        in_window = [
+            self._event(now - datetime.timedelta(hours=2)),
+            self._event(now - datetime.timedelta(hours=1)),
+            self._event(now - datetime.timedelta(hours=1)),
+            self._event(now),
+        ]
+        self._event(now - datetime.timedelta(days=2))
+        self._event(now + datetime.timedelta(hours=1))
+        self._event(now, target_type=VoteTargetType.COMMENT)
+
+        chunks = list(
+            iter_vote_events(
+                now - datetime.timedelta(days=1),
+                now + datetime.timedelta(minutes=1),
+                target_type=VoteTargetType.POST,
+                chunk_size=3,
+            )
+        )
+
+        assert [len(chunk) for chunk in chunks] == [3, 1]
+        assert [event.pk for chunk in chunks for event in chunk] == [
+            event.pk for event in in_window
+        ]
+
+    def _event(self, created_at, target_type=VoteTargetType.POST):
+        return VoteEvent.objects.create(
+            created_at=created_at,
+            action=VoteEventAction.CAST,
+            target_type=target_type,
+            target_id=self.post.pk,
+            target_author_id=self.author.pk,
+            voter_id=self.voter.pk,
+            value=Vote.UPVOTE,
+        )